@@ -0,0 +1,73 @@
+"""Загрузка .doc с внедренными OLE-объектами: профиль text против параметров Aspose
+по умолчанию (full).
+Каждый профиль запускается в отдельном процессе, чтобы пиковая память (RSS) не смешивалась.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_doc_load.py --pages 100 --objects-per-page 4
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from parsers.parser_doc import DOCProcessor
+started = time.perf_counter()
+processor = DOCProcessor({path!r}, fields=["text", "tables", "metadata"], load_profile={profile!r}, engine="aspose")
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "text": len(processor.text_content)}}))
+"""
+
+
+def write_ole_doc(path: str, pages: int, objects_per_page: int) -> None:
+    """.doc с текстом и внедренными OLE-объектами (пакеты с несжимаемыми данными) на каждой странице"""
+    import aspose.words as aw
+
+    doc = aw.Document()
+    builder = aw.DocumentBuilder(doc)
+    for number in range(pages):
+        builder.writeln(f"Страница {number}: текст перед объектами")
+        for _ in range(objects_per_page):
+            builder.insert_ole_object(io.BytesIO(os.urandom(1024 * 1024)), "Package", True, None)
+            builder.writeln()
+        builder.insert_break(aw.BreakType.PAGE_BREAK)
+    doc.save(path, aw.SaveFormat.DOC)
+
+
+def measure(path: str, profile: str) -> dict:
+    code = CHILD.format(root=str(ROOT), path=path, profile=profile)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Память и время загрузки .doc с OLE-объектами")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--objects-per-page", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "objects.doc")
+        write_ole_doc(path, args.pages, args.objects_per_page)
+        print(f"Документ: {args.pages} страниц, {os.path.getsize(path) / 1024 / 1024:.1f} МБ")
+        results = {profile: measure(path, profile) for profile in ("full", "text")}
+        assert results["full"]["text"] == results["text"]["text"]
+        for profile, result in results.items():
+            print(f"{profile:<5} {result['seconds']:.3f} с, пиковая память {result['rss_mb']:.0f} МБ")
+        full, text = results["full"], results["text"]
+        print(f"Экономия: {full['seconds'] - text['seconds']:.3f} с, {full['rss_mb'] - text['rss_mb']:.0f} МБ")
+
+
+if __name__ == "__main__":
+    main()
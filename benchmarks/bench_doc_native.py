@@ -0,0 +1,58 @@
+"""Чтение .doc: встроенный разборщик OLE2 против Aspose.Words (с импортом библиотеки).
+Каждый способ запускается в отдельном процессе, чтобы время импорта и память не смешивались.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_doc_native.py --pages 300
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_doc_text import write_doc
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+from parsers.parser_doc import DOCProcessor
+processor = DOCProcessor({path!r}, fields=["text", "tables", "metadata"], engine={engine!r})
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "text": len(processor.text_content), "tables": len(processor.tables)}}))
+"""
+
+
+def measure(path: str, engine: str) -> dict:
+    code = CHILD.format(root=str(ROOT), path=path, engine=engine)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время и память чтения .doc")
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.doc")
+        write_doc(path, args.pages)
+        print(f"Документ: {args.pages} страниц, {os.path.getsize(path) / 1024 / 1024:.1f} МБ")
+        results = {engine: measure(path, engine) for engine in ("aspose", "native")}
+        assert results["aspose"]["tables"] == results["native"]["tables"]
+        for engine, result in results.items():
+            print(f"{engine:<7} {result['seconds']:.3f} с, пиковая память {result['rss_mb']:.0f} МБ, "
+                  f"{result['text']} символов текста")
+        aspose, native = results["aspose"], results["native"]
+        print(f"Встроенный разборщик быстрее в {aspose['seconds'] / native['seconds']:.1f} раза")
+
+
+if __name__ == "__main__":
+    main()
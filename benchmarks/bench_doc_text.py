@@ -0,0 +1,70 @@
+"""Извлечение текста .doc: прежний обход всех узлов с get_text() против текстового экспорта.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_doc_text.py --pages 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import aspose.words as aw
+
+from benchmarks.samples import lorem_page
+from parsers.parser_doc import DOCProcessor
+
+
+def write_doc(path: str, pages: int) -> None:
+    """.doc из pages страниц: абзацы текста и небольшая таблица на каждой странице"""
+    doc = aw.Document()
+    builder = aw.DocumentBuilder(doc)
+    for number in range(pages):
+        for line in lorem_page(number, lines=30).splitlines():
+            builder.writeln(line)
+        builder.start_table()
+        for row in range(3):
+            for column in range(3):
+                builder.insert_cell()
+                builder.write(f"Page {number} cell {row}.{column}")
+            builder.end_row()
+        builder.end_table()
+        builder.insert_break(aw.BreakType.PAGE_BREAK)
+    doc.save(path, aw.SaveFormat.DOC)
+
+
+def legacy_extract(doc: aw.Document) -> str:
+    """Прежняя схема: текст каждого узла на всех уровнях вложенности"""
+    return "\n".join(node.get_text().strip() for node in doc.get_child_nodes(aw.NodeType.ANY, True))
+
+
+def timed(func, *args) -> tuple:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время извлечения текста .doc")
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.doc")
+        write_doc(path, args.pages)
+        processor = DOCProcessor(path, fields=(), engine="aspose")
+        legacy, legacy_seconds = timed(legacy_extract, processor.doc)
+        text, seconds = timed(processor._extract_text)
+        print(f"Документ: {args.pages} страниц, {os.path.getsize(path) / 1024 / 1024:.1f} МБ")
+        print(f"{'обход всех узлов':<20} {legacy_seconds:.3f} с, {len(legacy) / 1024 / 1024:.1f} МБ текста")
+        print(f"{'текстовый экспорт':<20} {seconds:.3f} с, {len(text) / 1024 / 1024:.1f} МБ текста "
+              f"({legacy_seconds / seconds:.1f}x быстрее)")
+
+
+if __name__ == "__main__":
+    main()
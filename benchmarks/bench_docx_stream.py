@@ -0,0 +1,114 @@
+"""Текст и таблицы DOCX: обход объектной модели python-docx (paragraphs, row.cells)
+против потокового разбора word/document.xml. Каждый способ запускается в отдельном
+процессе, чтобы пиковая память (RSS) не смешивалась.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_docx_stream.py --tables 200 --rows 500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.samples import lorem_page
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+if {method!r} == "python-docx":
+    from docx import Document
+    doc = Document({path!r})
+    paragraphs = [paragraph.text for paragraph in doc.paragraphs]
+    tables = [[[cell.text.strip() for cell in row.cells] for row in table.rows] for table in doc.tables]
+else:
+    from parsers.docx_stream import read_body
+    paragraphs, tables = read_body({path!r})
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "paragraphs": len(paragraphs), "cells": sum(len(row) for table in tables for row in table)}}))
+"""
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+
+def paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r></w:p>"
+
+
+def write_docx(path: str, tables: int, rows: int, columns: int = 5) -> None:
+    """DOCX из tables страниц текста, после каждой - таблица rows x columns"""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", RELS)
+        with archive.open("word/document.xml", "w", force_zip64=True) as document:
+            document.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                           b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                           b"<w:body>")
+            for number in range(tables):
+                text = "".join(paragraph(line) for line in lorem_page(number, lines=20).splitlines())
+                cells = "".join(
+                    "<w:tr>" + "".join(
+                        f"<w:tc><w:tcPr><w:tcW w:w=\"1800\" w:type=\"dxa\"/></w:tcPr>{paragraph(f'{number}:{row}.{column}')}</w:tc>"
+                        for column in range(columns)
+                    ) + "</w:tr>"
+                    for row in range(rows)
+                )
+                document.write((text + f"<w:tbl><w:tblGrid>{'<w:gridCol/>' * columns}</w:tblGrid>{cells}</w:tbl>")
+                               .encode("utf-8"))
+            document.write(b"<w:sectPr/></w:body></w:document>")
+
+
+def measure(path: str, method: str) -> dict:
+    code = CHILD.format(root=str(ROOT), path=path, method=method)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время и память извлечения текста и таблиц DOCX")
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tables.docx")
+        write_docx(path, args.tables, args.rows)
+        with zipfile.ZipFile(path) as archive:
+            size = archive.getinfo("word/document.xml").file_size
+        print(f"Документ: {args.tables} таблиц по {args.rows} строк, document.xml - {size / 1024 / 1024:.0f} МБ")
+        results = {method: measure(path, method) for method in ("python-docx", "stream")}
+        assert results["python-docx"]["cells"] == results["stream"]["cells"]
+        for method, result in results.items():
+            print(f"{method:<12} {result['seconds']:.2f} с, пиковая память {result['rss_mb']:.0f} МБ")
+        legacy, stream = results["python-docx"], results["stream"]
+        print(f"Потоковый разбор быстрее в {legacy['seconds'] / stream['seconds']:.1f} раза, "
+              f"память меньше на {legacy['rss_mb'] - stream['rss_mb']:.0f} МБ")
+
+
+if __name__ == "__main__":
+    main()
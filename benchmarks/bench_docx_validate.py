@@ -0,0 +1,72 @@
+"""Проверка DOCX при создании обработчика: прежняя схема (загрузка python-docx,
+сериализация тела и повторный разбор ElementTree) против потоковой проверки частей пакета.
+Каждый способ запускается в отдельном процессе, чтобы пиковая память (RSS) не смешивалась.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_docx_validate.py --tables 100 --rows 300
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_docx_stream import write_docx
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+if {method!r} == "stream":
+    from parsers.docx_stream import check_package
+    check_package({path!r})
+else:
+    import xml.etree.ElementTree as ET
+    from docx import Document
+    doc = Document({path!r})
+    if {method!r} == "legacy":
+        ET.fromstring(doc._element.xml)
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+METHODS = {
+    "legacy": "python-docx + сериализация и повторный разбор",
+    "load": "только загрузка python-docx",
+    "stream": "потоковая проверка частей",
+}
+
+
+def measure(path: str, method: str) -> dict:
+    code = CHILD.format(root=str(ROOT), path=path, method=method)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время и память проверки DOCX")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tables.docx")
+        write_docx(path, args.tables, args.rows)
+        print(f"Документ: {args.tables} таблиц по {args.rows} строк, {os.path.getsize(path) / 1024 / 1024:.1f} МБ")
+        results = {method: measure(path, method) for method in METHODS}
+        for method, result in results.items():
+            print(f"{METHODS[method]:<48} {result['seconds']:.2f} с, пиковая память {result['rss_mb']:.0f} МБ")
+        legacy, load, stream = results["legacy"], results["load"], results["stream"]
+        print(f"Сериализация и повторный разбор: +{legacy['seconds'] - load['seconds']:.2f} с, "
+              f"+{legacy['rss_mb'] - load['rss_mb']:.0f} МБ к загрузке")
+        print(f"Потоковая проверка экономит {legacy['seconds'] - stream['seconds']:.2f} с и "
+              f"{legacy['rss_mb'] - stream['rss_mb']:.0f} МБ")
+
+
+if __name__ == "__main__":
+    main()
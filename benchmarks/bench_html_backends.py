@@ -0,0 +1,55 @@
+"""Полное время обработки HTML (разбор + извлечение полей) для разных способов разбора.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_html_backends.py --size-mb 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.bench_html_extract import legacy_extract
+from benchmarks.samples import html_page
+from parsers.html_walker import PageCollector, available_backends, parse_with_target, soup_features, walk_soup
+
+
+def extract(content: bytes, backend: str) -> dict:
+    if backend == "lxml-target":
+        return parse_with_target(content, PageCollector())
+    return walk_soup(BeautifulSoup(content, soup_features(backend)), PageCollector())
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время обработки HTML разными парсерами")
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = html_page(int(args.size_mb * 1024 * 1024)).encode("utf-8")
+    reference = legacy_extract(BeautifulSoup(content, "html.parser"))
+    baseline = best_of(lambda: legacy_extract(BeautifulSoup(content, "html.parser")), args.repeat)
+    print(f"Страница: {len(content) / 1024 / 1024:.1f} МБ")
+    print(f"{'html.parser + find_all':<24} {baseline:.3f} с")
+    for backend in reversed(available_backends()):
+        assert extract(content, backend) == reference
+        seconds = best_of(lambda: extract(content, backend), args.repeat)
+        print(f"{backend + ' + один обход':<24} {seconds:.3f} с ({baseline / seconds:.2f}x быстрее)")
+
+
+if __name__ == "__main__":
+    main()
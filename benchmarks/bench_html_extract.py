@@ -0,0 +1,77 @@
+"""Извлечение полей HTML: пять поисков по дереву (find_all) против одного обхода.
+
+Время разбора страницы в BeautifulSoup не учитывается - сравнивается только
+извлечение полей из готового дерева. Запуск из корня репозитория:
+
+    python benchmarks/bench_html_extract.py --size-mb 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.samples import html_page
+from parsers.html_walker import PageCollector, walk_soup
+
+
+def legacy_extract(soup: BeautifulSoup) -> dict:
+    """Прежняя схема: get_text и отдельный find_all для каждого поля,
+    повторный обход поддерева каждой таблицы для th, tr и td"""
+    tables = []
+    for table in soup.find_all("table"):
+        tables.append({
+            "headers": [th.text.strip() for th in table.find_all("th")],
+            "rows": [[td.text.strip() for td in row.find_all("td")] for row in table.find_all("tr")],
+        })
+    meta_tags = {}
+    for meta in soup.find_all("meta"):
+        name = meta.get("name") or meta.get("property")
+        content = meta.get("content")
+        if name and content:
+            meta_tags[name] = content
+    return {
+        "text": soup.get_text(separator="\n", strip=True),
+        "images": [{"src": img.get("src", ""), "alt": img.get("alt", "No alt text")} for img in soup.find_all("img")],
+        "tables": tables,
+        "metadata": meta_tags,
+        "links": [{"text": a.text.strip(), "url": a.get("href", "")} for a in soup.find_all("a", href=True)],
+    }
+
+
+def single_pass_extract(soup: BeautifulSoup) -> dict:
+    return walk_soup(soup, PageCollector())
+
+
+def best_of(func, soup: BeautifulSoup, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(soup)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время извлечения полей HTML")
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html = html_page(int(args.size_mb * 1024 * 1024))
+    soup = BeautifulSoup(html, "html.parser")
+    assert legacy_extract(soup) == single_pass_extract(soup)
+    legacy = best_of(legacy_extract, soup, args.repeat)
+    single = best_of(single_pass_extract, soup, args.repeat)
+
+    print(f"Страница: {len(html) / 1024 / 1024:.1f} МБ")
+    print(f"find_all по полям: {legacy:.3f} с")
+    print(f"Один обход:        {single:.3f} с ({legacy / single:.2f}x быстрее)")
+
+
+if __name__ == "__main__":
+    main()
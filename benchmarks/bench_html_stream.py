@@ -0,0 +1,66 @@
+"""Загрузка и разбор HTML: сначала загрузка, потом разбор - против разбора по частям
+во время загрузки. Страница отдается локальным сервером с ограниченной скоростью.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_html_stream.py --size-mb 5 --rate-mb 10
+"""
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.samples import html_page
+from parsers.fetch import CHUNK_SIZE
+from parsers.parser_html import WebPageProcessor
+
+
+def make_handler(content: bytes, rate: float) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            for start in range(0, len(content), CHUNK_SIZE):
+                self.wfile.write(content[start:start + CHUNK_SIZE])
+                time.sleep(CHUNK_SIZE / rate)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Разбор HTML по мере загрузки")
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--rate-mb", type=float, default=10.0, help="Скорость отдачи страницы, МБ/с")
+    args = parser.parse_args()
+
+    content = html_page(int(args.size_mb * 1024 * 1024)).encode("utf-8")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(content, args.rate_mb * 1024 * 1024))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"Страница: {len(content) / 1024 / 1024:.1f} МБ, отдача {args.rate_mb:.0f} МБ/с")
+    results = {}
+    for name, incremental in (("загрузка, затем разбор", False), ("разбор по частям", True)):
+        started = time.perf_counter()
+        processor = WebPageProcessor(url, backend="lxml-target", incremental=incremental, max_page_bytes=0)
+        seconds = time.perf_counter() - started
+        results[name] = processor.extract()
+        print(f"{name:<24} {seconds:.3f} с")
+    assert len({repr(result) for result in results.values()}) == 1
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Замер времени запуска CLI: ленивый реестр обработчиков против загрузки всех сразу.
+
+Каждый замер выполняется в отдельном интерпретаторе, чтобы кэш модулей не влиял
+на результат. Запуск из корня репозитория:
+
+    python benchmarks/bench_import_time.py --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("aspose.words", "pandas", "tabula", "pdf2image", "pytesseract", "bs4", "docx", "PyPDF2", "requests")
+
+LAZY_SNIPPET = """
+import json, sys, time
+started = time.perf_counter()
+import main
+main.registry.get_entry({ext!r}).load()
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+EAGER_SNIPPET = """
+import json, sys, time
+started = time.perf_counter()
+import main
+main.registry.warm_up()
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_snippet(snippet: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(snippet: str, repeat: int) -> tuple:
+    runs = [run_snippet(snippet) for _ in range(repeat)]
+    return statistics.median(run["seconds"] for run in runs), runs[-1]["modules"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время импорта обработчиков при запуске main.py")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    eager_seconds, eager_modules = measure(EAGER_SNIPPET.format(heavy=HEAVY_MODULES), args.repeat)
+    print(f"{'режим':<16}{'медиана, с':>12}  загруженные библиотеки")
+    print(f"{'все обработчики':<16}{eager_seconds:>12.3f}  {', '.join(eager_modules)}")
+    for ext in main_extensions():
+        seconds, modules = measure(LAZY_SNIPPET.format(ext=ext, heavy=HEAVY_MODULES), args.repeat)
+        print(f"{ext:<16}{seconds:>12.3f}  {', '.join(modules)}")
+
+
+def main_extensions() -> list:
+    sys.path.insert(0, str(ROOT))
+    from parsers.registry import supported_extensions
+    return list(supported_extensions())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Извлечение текста PDF: прежние два прохода PyPDF2 против одного прохода.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_pdf_text.py --pages 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import PyPDF2
+
+from benchmarks.samples import lorem_page, write_text_pdf
+from parsers.parser_pdf import PDFProcessor
+
+
+def legacy_extract(path: str) -> str:
+    """Прежняя схема: валидация и извлечение открывают файл и читают все страницы дважды"""
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for page in reader.pages:
+            page.extract_text()
+    text = ""
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for page in reader.pages:
+            text += page.extract_text() or ""
+    return text.strip()
+
+
+def single_pass_extract(path: str) -> str:
+    return PDFProcessor(path, fields=["text"]).text_content
+
+
+def best_of(func, path: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(path)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время извлечения текста PDF")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.pdf")
+        write_text_pdf(path, [lorem_page(i) for i in range(args.pages)])
+        assert legacy_extract(path) == single_pass_extract(path)
+        legacy = best_of(legacy_extract, path, args.repeat)
+        single = best_of(single_pass_extract, path, args.repeat)
+
+    print(f"Страниц: {args.pages}")
+    print(f"Два прохода:  {legacy:.3f} с")
+    print(f"Один проход:  {single:.3f} с ({legacy / single:.2f}x быстрее)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Задержка извлечения таблиц на документ: отдельный JVM на каждый вызов
+и общий JVM процесса (jpype).
+
+Требуется Java; для режима общего JVM - пакет JPype1. Запуск из корня репозитория:
+
+    python benchmarks/bench_tabula.py --docs 20 --pdf test_files/test_file.pdf
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from parsers.tables import TableExtractor, jvm_backend_available
+
+
+def per_document(extractor: TableExtractor, paths: list) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        extractor.read(path)
+    return (time.perf_counter() - started) / len(paths)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Задержка Tabula на документ")
+    parser.add_argument("--pdf", default=str(ROOT / "test_files" / "test_file.pdf"))
+    parser.add_argument("--docs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.docs):
+            path = os.path.join(tmp, f"doc_{i}.pdf")
+            shutil.copyfile(args.pdf, path)
+            paths.append(path)
+
+        print(f"Документов: {args.docs}")
+        # Общий JVM замеряется первым: вызов с force_subprocess переключает
+        # tabula-py на запуск отдельного процесса до конца работы интерпретатора
+        if jvm_backend_available():
+            persistent_extractor = TableExtractor(persistent=True)
+            started = time.perf_counter()
+            persistent_extractor.warm_up()
+            print(f"Старт общего JVM:            {time.perf_counter() - started:.3f} с (однократно)")
+            print(f"Общий JVM процесса:          {per_document(persistent_extractor, paths):.3f} с/док")
+        else:
+            print("JPype1 не установлен: режим общего JVM пропущен")
+
+        subprocess_extractor = TableExtractor(persistent=False)
+        print(f"JVM на каждый документ:     {per_document(subprocess_extractor, paths):.3f} с/док")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Генераторы синтетических документов для бенчмарков."""
+from typing import List
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, page_texts: List[str]) -> None:
+    """PDF с текстовым слоем: одна строка текста на страницу (пустая строка - страница без текста)"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in page_texts:
+        lines = [
+            f"BT /F1 10 Tf 40 {760 - 14 * i} Td ({_escape_pdf_text(line)}) Tj ET"
+            for i, line in enumerate(text.splitlines()[:50])
+        ]
+        stream = "\n".join(lines).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def lorem_page(number: int, lines: int = 40) -> str:
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+    return "\n".join(
+        f"Page {number} line {i}: " + " ".join(words[(i + j) % len(words)] for j in range(10))
+        for i in range(lines)
+    )
+
+
+def html_page(size_bytes: int) -> str:
+    """Синтетическая HTML-страница примерно заданного размера: текст, ссылки,
+    изображения, meta-теги и таблицы (в том числе вложенные)"""
+    head = "".join(f'<meta name="key{i}" content="value {i}">' for i in range(20))
+    parts = [f"<html><head><title>Synthetic page</title>{head}<style>p {{ margin: 0 }}</style></head><body>"]
+    size = len(parts[0])
+    block = 0
+    while size < size_bytes:
+        chunk = (
+            f"<div class=\"block\"><h2>Section {block}</h2>"
+            f"<p>{lorem_page(block, lines=3)} <a href=\"/page/{block}\">link {block}</a> "
+            f"<b>bold</b> <img src=\"/img/{block}.png\" alt=\"image {block}\"></p>"
+            f"<table><tr><th>Name</th><th>Value</th></tr>"
+            + "".join(f"<tr><td>row {row}</td><td><a href=\"#r{row}\">{row * block}</a></td></tr>" for row in range(5))
+            + (f"<tr><td><table><tr><td>nested {block}</td></tr></table></td></tr>" if block % 10 == 0 else "")
+            + "</table><!-- comment --><script>var x = 1;</script></div>"
+        )
+        parts.append(chunk)
+        size += len(chunk)
+        block += 1
+    parts.append("</body></html>")
+    return "".join(parts)
@@ -1,40 +1,86 @@
 import argparse
+import contextlib
+import glob
+import inspect
+import io
+import json
+import os
+import signal
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from urllib.parse import urlparse
-from requests.exceptions import RequestException
 from typing import Union
-from typing import Union, Optional
+from typing import Union, Optional, Dict, Iterable, Iterator, List, Any, IO, Sequence, TYPE_CHECKING
 import sys
 
-from parsers.parser_html import WebPageProcessor 
-from parsers.parser_pdf import PDFProcessor  
-from parsers.parser_djvu import DJVUProcessor 
-from parsers.parser_doc import DOCProcessor  
-from parsers.parser_docx import DOCXProcessor 
+from parsers import registry
+from parsers.base import parse_fields, parse_pages
+from parsers.cache import ResultCache
+from parsers.output import OUTPUT_FORMATS, RecordWriter
+from parsers.registry import ProcessorEntry
+
+if TYPE_CHECKING:
+    from parsers.parser_html import WebPageProcessor
+    from parsers.parser_pdf import PDFProcessor
+    from parsers.parser_djvu import DJVUProcessor
+    from parsers.parser_doc import DOCProcessor
+    from parsers.parser_docx import DOCXProcessor
+
+MANIFEST_EXTENSIONS = (".txt", ".lst", ".list", ".jsonl", ".json")
+DEFAULT_CACHE_MAX_BYTES = 1024 ** 3
 
 class FileProcessor:
-    def __init__(self, input_path: str) -> None:
+    def __init__(
+        self,
+        input_path: str,
+        fields: Optional[Sequence[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        cache: Optional[ResultCache] = None,
+        output_format: str = "text"
+    ) -> None:
         self.input_path = input_path
+        self.fields = fields
+        self.options = options or {}
+        self.cache = cache
+        self.from_cache = False
+        self.output_format = output_format
+        self._cache_key: Optional[str] = None
         self.processor: Optional[
             Union[
-                WebPageProcessor, 
-                PDFProcessor, 
-                DJVUProcessor, 
-                DOCProcessor, 
-                DOCXProcessor
+                "WebPageProcessor", 
+                "PDFProcessor", 
+                "DJVUProcessor", 
+                "DOCProcessor", 
+                "DOCXProcessor"
             ]
         ] = None
         self.is_url: bool = False
+        self.entry: Optional[ProcessorEntry] = None
         
-        try:
-            self.is_url = self._is_valid_url(input_path)
-            self.processor = self._get_processor()
-        except (FileNotFoundError, ValueError) as e:
-            print(f"Ошибка инициализации: {str(e)}")
-            sys.exit(1)
-        except Exception as e:
-            print(f"Непредвиденная ошибка: {str(e)}")
-            sys.exit(1)
+        with self._diagnostics():
+            try:
+                self.is_url = self._is_valid_url(input_path)
+                self.entry = self._get_entry()
+                self.processor = self._get_processor()
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Ошибка инициализации: {str(e)}")
+                sys.exit(1)
+            except Exception as e:
+                print(f"Непредвиденная ошибка: {str(e)}")
+                sys.exit(1)
+
+    def _diagnostics(self) -> contextlib.AbstractContextManager:
+        """В режимах JSON/JSONL сообщения обработчиков уходят в stderr,
+        чтобы не смешиваться с записями в stdout"""
+        if self.output_format == "text":
+            return contextlib.nullcontext()
+        return contextlib.redirect_stdout(sys.stderr)
+
+    def _processor_fields(self) -> Optional[Sequence[str]]:
+        """Поля, извлекаемые при создании обработчика; в режимах JSON/JSONL
+        поля извлекаются при выводе, по мере записи"""
+        return self.fields if self.output_format == "text" else ()
 
     def _is_valid_url(self, path: str) -> bool:
         """Проверка существования URL"""
@@ -48,32 +94,33 @@ class FileProcessor:
             print(f"Непредвиденная ошибка проверки URL: {str(e)}")
             return False
 
+    def _get_entry(self) -> ProcessorEntry:
+        """Выбор формата входа по реестру обработчиков"""
+        if self.is_url:
+            return registry.get_entry(registry.URL_FORMAT)
+            
+        file_path = Path(self.input_path)
+        if not file_path.exists():
+            print(f"Файл {file_path} не найден")
+            raise FileNotFoundError(f"Файл {file_path} не найден")
+            
+        ext = file_path.suffix.lower()
+        entry = registry.get_entry(ext)
+        if entry is None:
+            print(f"Неподдерживаемый формат: {ext}")
+            raise ValueError(f"Неподдерживаемый формат: {ext}")
+        return entry
+
     def _get_processor(self) -> Union[
-        WebPageProcessor, PDFProcessor, DJVUProcessor, DOCProcessor, DOCXProcessor
+        "WebPageProcessor", "PDFProcessor", "DJVUProcessor", "DOCProcessor", "DOCXProcessor"
     ]:
-        """Выбор обработчика в зависимости от формата входа"""
+        """Создание обработчика; библиотеки формата загружаются только здесь"""
         try:
-            if self.is_url:
-                return WebPageProcessor(self.input_path)
-                
-            file_path = Path(self.input_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"Файл {file_path} не найден")
-                
-            ext = file_path.suffix.lower()
-            match ext:
-                case '.html':
-                    return WebPageProcessor(self.input_path)
-                case '.pdf':
-                    return PDFProcessor(self.input_path)
-                case '.djvu':
-                    return DJVUProcessor(self.input_path)
-                case '.doc':
-                    return DOCProcessor(self.input_path)
-                case '.docx':
-                    return DOCXProcessor(self.input_path)
-                case _:
-                    raise ValueError(f"Неподдерживаемый формат: {ext}")
+            processor_cls = self.entry.load()
+            options = self._processor_options(processor_cls)
+            if self.cache is None or self.is_url:
+                return processor_cls(self.input_path, fields=self._processor_fields(), **options)
+            return self._get_cached_processor(processor_cls, options)
                     
         except PermissionError:
             print(f"Ошибка доступа: недостаточно прав для {self.input_path}")
@@ -85,32 +132,609 @@ class FileProcessor:
             print(f"Ошибка создания процессора: {str(e)}")
             raise
 
-    def process(self) -> None:
+    def _get_cached_processor(self, processor_cls: type, options: Dict[str, Any]) -> Any:
+        """Результат из кэша по содержимому файла; при промахе документ
+        обрабатывается и результат сохраняется"""
+        fields = [name for name in processor_cls.FIELDS if self.fields is None or name in self.fields]
+        key = self.cache.key(self.input_path, processor_cls, options)
+        state = self.cache.load(key, fields)
+        if state is not None:
+            processor = processor_cls.from_cache_state(self.input_path, state)
+            processor.extracted_fields &= set(fields)
+            self.from_cache = True
+            return processor
+        processor = processor_cls(self.input_path, fields=self._processor_fields(), **options)
+        self._cache_key = key
+        if self.output_format == "text":
+            self._save_result(processor)
+        return processor
+
+    def _save_result(self, processor: Any) -> None:
+        """Сохранение результата в кэш (только для документов, прочитанных без ошибок)"""
+        if self._cache_key is not None and not self.from_cache and processor.is_cacheable():
+            self.cache.save(self._cache_key, processor.cache_state())
+
+    def _processor_options(self, processor_cls: type) -> Dict[str, Any]:
+        """Параметры, которые принимает конструктор выбранного обработчика"""
+        accepted = inspect.signature(processor_cls.__init__).parameters
+        return {
+            name: value for name, value in self.options.items()
+            if name in accepted and value is not None
+        }
+
+    def process(self) -> bool:
         """Собственно парсинг"""
-        if not self.processor:
-            print("Ошибка: процессор не инициализирован")
-            return
-            
+        # Записи JSON/JSONL пишутся в stdout, сообщения об ошибках - в stderr
+        stdout = sys.stdout
+        with self._diagnostics():
+            if not self.processor:
+                print("Ошибка: процессор не инициализирован")
+                return False
+
+            network_errors = self.entry.errors("NETWORK_ERRORS")
+            format_errors = self.entry.errors("FORMAT_ERRORS")
+            try:
+                if self.output_format == "text":
+                    print(f"\nОбработка: {self.input_path}")
+                    self.processor.print_results()
+                else:
+                    self._write_records(stdout)
+                return True
+
+            except network_errors as e:
+                print(f"Сетевая ошибка при обработке: {str(e)}")
+            except format_errors as e:
+                print(f"Ошибка формата документа: {str(e)}")
+            except Exception as e:
+                print(f"Непредвиденная ошибка обработки: {str(e)}")
+            return False
+
+    def _write_records(self, stream: IO[str]) -> None:
+        """Потоковый вывод записей JSON/JSONL по мере извлечения полей"""
+        writer = RecordWriter(stream, self.output_format)
+        header = {
+            "source": self.input_path,
+            "processor": type(self.processor).__name__,
+            "valid": self.processor.is_cacheable(),
+            "cached": self.from_cache,
+        }
+        writer.write_document(header, self.processor.iter_records(self.fields))
+        self._save_result(self.processor)
+
+
+def iter_batch_inputs(source: str) -> Iterator[str]:
+    """Перечисление документов пакета: каталог, манифест или glob-шаблон"""
+    path = Path(source)
+    if path.is_dir():
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if registry.get_entry(Path(name).suffix) is not None:
+                    yield os.path.join(root, name)
+    elif path.is_file() and path.suffix.lower() in MANIFEST_EXTENSIONS:
+        yield from _iter_manifest(path)
+    elif path.is_file():
+        yield source
+    else:
+        for match in sorted(glob.iglob(source, recursive=True)):
+            if os.path.isfile(match):
+                yield match
+
+
+def _iter_manifest(path: Path) -> Iterator[str]:
+    """Чтение манифеста: путь или URL в строке либо JSON-объект на строку"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Пропущена некорректная строка манифеста: {e}")
+                    continue
+                line = entry.get("path") or entry.get("input_path") or entry.get("url") or ""
+                if not line:
+                    print("Пропущена строка манифеста без пути")
+                    continue
+            yield line
+
+
+_worker_cache: Optional[ResultCache] = None
+
+
+def _init_batch_worker(cache_dir: Optional[str] = None, cache_max_bytes: Optional[int] = None) -> None:
+    """Прогрев воркера: обработчики загружаются один раз и переиспользуются
+    для всех документов воркера"""
+    global _worker_cache
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if cache_dir:
+        _worker_cache = ResultCache(cache_dir, cache_max_bytes or DEFAULT_CACHE_MAX_BYTES)
+    # JVM для Tabula здесь не запускается: он стартует при первом чтении таблиц
+    # и остается общим для всех документов воркера
+    with contextlib.redirect_stdout(io.StringIO()):
+        registry.warm_up()
+
+
+def _process_batch_item(
+    input_path: str,
+    fields: Optional[Sequence[str]] = None,
+    options: Optional[Dict[str, Any]] = None,
+    output_format: str = "text"
+) -> Dict[str, Any]:
+    """Обработка одного документа пакета в воркере"""
+    started = time.perf_counter()
+    buffer = io.StringIO()
+    diagnostics = io.StringIO()
+    ok = False
+    cached = False
+    error = ""
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(diagnostics):
         try:
-            print(f"\nОбработка: {self.input_path}")
-            self.processor.print_results()
-            
-        except RequestException as e:
-            print(f"Сетевая ошибка при обработке: {str(e)}")
-        except (PDFProcessor.exceptions.PdfReadError, 
-                DOCXProcessor.exceptions.InvalidFileFormatError) as e:
-            print(f"Ошибка формата документа: {str(e)}")
+            processor = FileProcessor(input_path, fields, options, _worker_cache, output_format)
+            cached = processor.from_cache
+            ok = processor.process() and getattr(processor.processor, "is_valid", True)
+        except SystemExit:
+            ok = False
         except Exception as e:
-            print(f"Непредвиденная ошибка обработки: {str(e)}")
+            error = str(e)
+    output = buffer.getvalue()
+    if not ok and not error:
+        messages = output if output_format == "text" else diagnostics.getvalue()
+        lines = [line for line in messages.splitlines() if line.strip()]
+        error = lines[0] if lines else "Неизвестная ошибка"
+    try:
+        size = os.path.getsize(input_path)
+    except OSError:
+        size = 0
+    return {
+        "input_path": input_path,
+        "ok": ok,
+        "cached": cached,
+        "error": error,
+        "output": output,
+        "diagnostics": diagnostics.getvalue(),
+        "size": size,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+class BatchSummary:
+    def __init__(self) -> None:
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cached = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.elapsed = 0.0
+        self.by_format: Dict[str, int] = {}
+        self.failures: List[Dict[str, str]] = []
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Учет результата одного документа"""
+        self.total += 1
+        self.bytes += result.get("size", 0)
+        self.busy_seconds += result.get("seconds", 0.0)
+        self.cached += int(result.get("cached", False))
+        ext = Path(result["input_path"]).suffix.lower() or "url"
+        self.by_format[ext] = self.by_format.get(ext, 0) + 1
+        if result["ok"]:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            self.failures.append({"input_path": result["input_path"], "error": result["error"]})
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def print_results(self, max_failures: int = 20) -> None:
+        print("\nИтоги пакетной обработки:")
+        print(f"Документов: {self.total} (успешно: {self.succeeded}, с ошибками: {self.failed})")
+        if self.cached:
+            print(f"Из кэша результатов: {self.cached}")
+        print(f"Время: {self.elapsed:.2f} с, суммарно в воркерах: {self.busy_seconds:.2f} с")
+        print(f"Пропускная способность: {self.throughput:.2f} док/с, "
+              f"{self.bytes / 1024 / 1024 / self.elapsed if self.elapsed > 0 else 0.0:.2f} МБ/с")
+        for ext, count in sorted(self.by_format.items()):
+            print(f"{ext}: {count}")
+        if self.failures:
+            print("\nОшибки:")
+            for failure in self.failures[:max_failures]:
+                print(f"{failure['input_path']}: {failure['error']}")
+            if len(self.failures) > max_failures:
+                print(f"... и еще {len(self.failures) - max_failures}")
+
+
+class BatchProcessor:
+    def __init__(
+        self,
+        source: str,
+        workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        quiet: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        output_format: str = "text"
+    ) -> None:
+        self.source = source
+        self.fields = fields
+        self.options = options or {}
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.output_format = output_format
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_in_flight = max(1, max_in_flight or self.workers * 2)
+        self.quiet = quiet
+        self.summary = BatchSummary()
+
+    def run(self) -> BatchSummary:
+        """Обработка пакета на пуле процессов с ограничением числа задач в работе"""
+        started = time.perf_counter()
+        pending: Dict[Future, str] = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_batch_worker,
+                initargs=(self.cache_dir, self.cache_max_bytes)
+            ) as executor:
+                for input_path in iter_batch_inputs(self.source):
+                    if len(pending) >= self.max_in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        self._collect(done, pending)
+                    future = executor.submit(
+                        _process_batch_item, input_path, self.fields, self.options, self.output_format
+                    )
+                    pending[future] = input_path
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, pending)
+        finally:
+            self.summary.elapsed = time.perf_counter() - started
+        return self.summary
+
+    def _collect(self, done: Iterable[Future], pending: Dict[Future, str]) -> None:
+        """Вывод и учет завершившихся задач"""
+        for future in done:
+            input_path = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"input_path": input_path, "ok": False, "error": f"Сбой воркера: {e}", "output": ""}
+            if not self.quiet and result["output"]:
+                print(result["output"], end="")
+            if not self.quiet and result.get("diagnostics"):
+                print(result["diagnostics"], end="", file=sys.stderr)
+            self.summary.add(result)
+
+class UrlBatchProcessor:
+    def __init__(
+        self,
+        source: str,
+        fetch_workers: Optional[int] = None,
+        per_host_rate: Optional[float] = None,
+        retries: int = 3,
+        max_in_flight: Optional[int] = None,
+        quiet: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        output_format: str = "text"
+    ) -> None:
+        self.source = source
+        self.fetch_workers = max(1, fetch_workers or 16)
+        self.per_host_rate = per_host_rate
+        self.retries = retries
+        self.max_in_flight = max_in_flight
+        self.quiet = quiet
+        self.fields = fields
+        self.options = options or {}
+        self.output_format = output_format
+        self.summary = BatchSummary()
+
+    def run(self) -> BatchSummary:
+        """Загрузка страниц пулом потоков (соединения с хостами переиспользуются,
+        частота запросов к хосту ограничена) и разбор по мере загрузки"""
+        from parsers.fetch import DEFAULT_MAX_BYTES, Fetcher
+
+        max_bytes = self.options.get("max_page_bytes")
+        fetcher = Fetcher(
+            self.fetch_workers, self.per_host_rate, self.retries,
+            max_bytes=DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        started = time.perf_counter()
+        try:
+            urls = iter_batch_inputs(self.source)
+            for fetched in fetcher.fetch_many(urls, self.max_in_flight, self._conditional_headers()):
+                self.summary.add(self._process(fetched, fetcher))
+        finally:
+            self.summary.elapsed = time.perf_counter() - started
+        return self.summary
+
+    def _conditional_headers(self) -> Optional[Any]:
+        """Заголовки условного запроса из HTTP-кэша (If-None-Match / If-Modified-Since)"""
+        if not self.options.get("http_cache_dir"):
+            return None
+        from parsers.cache import get_result_cache
+        from parsers.parser_html import WebPageProcessor
+
+        http_cache = get_result_cache(self.options["http_cache_dir"], self.options.get("http_cache_max_bytes"))
+        # Те же поля, по которым обработчик ищет запись (см. FileProcessor._processor_fields)
+        fields = WebPageProcessor.http_cache_fields(self.fields if self.output_format == "text" else ())
+
+        def headers(url: str) -> Dict[str, str]:
+            _, entry = WebPageProcessor.http_cache_entry(http_cache, url, fields, self.options.get("backend"), count=False)
+            return WebPageProcessor.conditional_headers(entry)
+
+        return headers
+
+    def _process(self, fetched: Dict[str, Any], fetcher: Any) -> Dict[str, Any]:
+        """Разбор загруженной страницы; ошибки загрузки учитываются в сводке"""
+        from parsers.parser_html import network_error_message
+
+        url = fetched["url"]
+        result = {"input_path": url, "ok": False, "error": "", "size": 0, "seconds": fetched["seconds"]}
+        if fetched["error"] is not None:
+            result["error"] = network_error_message(url, fetched["error"])
+            if not self.quiet:
+                print(result["error"], file=sys.stdout if self.output_format == "text" else sys.stderr)
+            return result
+
+        started = time.perf_counter()
+        options = dict(self.options, response=fetched["response"], content=fetched["content"], fetcher=fetcher)
+        output = contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+        with output:
+            try:
+                processor = FileProcessor(url, self.fields, options, output_format=self.output_format)
+                result["ok"] = processor.process() and processor.processor.is_cacheable()
+            except SystemExit:
+                pass
+        if not result["ok"]:
+            result["error"] = "Ошибка обработки страницы"
+        result["size"] = len(fetched["content"])
+        result["seconds"] += time.perf_counter() - started
+        return result
+
+
+class CrawlProcessor:
+    def __init__(
+        self,
+        source: str,
+        max_depth: int = 2,
+        max_pages: int = 100,
+        same_host: bool = True,
+        fetch_workers: Optional[int] = None,
+        per_host_rate: Optional[float] = None,
+        retries: int = 3,
+        max_in_flight: Optional[int] = None,
+        quiet: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        output_format: str = "text"
+    ) -> None:
+        self.source = source
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.same_host = same_host
+        self.fetch_workers = max(1, fetch_workers or 16)
+        self.per_host_rate = per_host_rate
+        self.retries = retries
+        self.max_in_flight = max_in_flight
+        self.quiet = quiet
+        self.fields = fields
+        self.options = options or {}
+        self.output_format = output_format
+        self.summary = BatchSummary()
+
+    def _seeds(self) -> Iterator[str]:
+        """Начальные адреса: URL или файл со списком адресов"""
+        parsed = urlparse(self.source)
+        if parsed.scheme and parsed.netloc:
+            return iter([self.source])
+        return iter_batch_inputs(self.source)
+
+    def run(self) -> BatchSummary:
+        """Обход сайта; страницы выводятся по мере разбора"""
+        from parsers.crawler import DEFAULT_CRAWL_RATE, Crawler
+        from parsers.fetch import DEFAULT_MAX_BYTES, Fetcher
+
+        max_bytes = self.options.get("max_page_bytes")
+        fetcher = Fetcher(
+            self.fetch_workers, self.per_host_rate or DEFAULT_CRAWL_RATE, self.retries,
+            max_bytes=DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        started = time.perf_counter()
+        # В режимах JSON/JSONL сообщения начальных адресов и потоков загрузки
+        # уходят в stderr, записи страниц - в stdout
+        stdout = sys.stdout
+        diagnostics = (
+            contextlib.nullcontext() if self.output_format == "text" else contextlib.redirect_stdout(sys.stderr)
+        )
+        try:
+            with diagnostics:
+                crawler = Crawler(
+                    self._seeds(), fetcher, self.max_depth, self.max_pages, self.same_host, self.max_in_flight,
+                    self.fields, self.options.get("backend")
+                )
+                for page in crawler.crawl():
+                    self.summary.add(self._write(page, stdout))
+        finally:
+            self.summary.elapsed = time.perf_counter() - started
+        return self.summary
+
+    def _write(self, page: Dict[str, Any], stream: IO[str]) -> Dict[str, Any]:
+        """Вывод страницы (текст или записи JSONL) и результат для сводки"""
+        result = {
+            "input_path": page["url"], "ok": False, "error": page["error"],
+            "size": page["size"], "seconds": page["seconds"],
+        }
+        processor = page["processor"]
+        if processor is None:
+            if not self.quiet:
+                print(page["error"], file=sys.stdout if self.output_format == "text" else sys.stderr)
+            return result
+        result["ok"] = True
+        if self.quiet:
+            return result
+        if self.output_format == "text":
+            print(f"\nОбработка: {page['url']} (глубина {page['depth']})")
+            processor.print_results()
+        else:
+            header = {
+                "source": page["url"],
+                "processor": type(processor).__name__,
+                "valid": processor.is_cacheable(),
+                "cached": False,
+                "depth": page["depth"],
+            }
+            writer = RecordWriter(stream, self.output_format)
+            writer.write_document(header, processor.iter_records(self.fields))
+        return result
+
+
+def _fields_argument(value: str) -> Optional[Sequence[str]]:
+    try:
+        return parse_fields(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _pages_argument(value: str) -> str:
+    try:
+        parse_pages(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Синтаксический анализатори html страниц, документов форматов .pdf, .doc, .docx, .djvu")
     parser.add_argument("input_path", help="Путь к файлу или URL для парсинга")
+    parser.add_argument("--fields", type=_fields_argument, default=None,
+                        help="Извлекаемые поля через запятую: text,ocr,tables,images,metadata,links (по умолчанию - все)")
+    parser.add_argument("--pages", type=_pages_argument, default=None,
+                        help="Страницы PDF/DjVu для обработки, например 1-3,7,10- (нумерация с 1)")
+    parser.add_argument("--max-pages", type=int, default=None,
+                        help="Обработать не больше N первых (из выбранных) страниц PDF/DjVu")
+    parser.add_argument("--ocr-workers", type=int, default=None,
+                        help="Число потоков постраничного OCR (по умолчанию - 1)")
+    parser.add_argument("--ocr-window", type=int, default=None,
+                        help="Число подряд идущих страниц, растеризуемых за один вызов poppler (по умолчанию - 8)")
+    parser.add_argument("--ocr-max-pages-in-flight", type=int, default=None,
+                        help="Максимум растеризованных, но не распознанных страниц (ограничивает память)")
+    parser.add_argument("--html-backend", default=None, choices=("lxml-target", "lxml", "html.parser"),
+                        help="Способ разбора HTML (по умолчанию - самый быстрый из установленных)")
+    parser.add_argument("--doc-load-profile", default=None, choices=("text", "full"),
+                        help="Загрузка .doc через Aspose: text (по умолчанию) - без данных OLE-объектов и связанных "
+                             "изображений; full - параметры Aspose по умолчанию")
+    parser.add_argument("--doc-engine", default=None, choices=("auto", "native", "aspose"),
+                        help="Чтение .doc: auto (по умолчанию) - встроенный разборщик, Aspose - только для документов, "
+                             "которые он не читает; native - только встроенный; aspose - только Aspose")
+    parser.add_argument("--max-page-mb", type=float, default=None,
+                        help="Наибольший размер веб-страницы в МБ (по умолчанию 50, 0 - без ограничения); "
+                             "загрузка больших страниц прерывается")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Разбирать веб-страницу по частям во время загрузки (только для lxml-target; "
+                             "в режиме --urls страницы разбираются после загрузки)")
+    parser.add_argument("--ocr-cache-dir", default=None,
+                        help="Каталог кэша OCR по пикселям страниц: повторяющиеся страницы PDF/DjVu не распознаются заново")
+    parser.add_argument("--ocr-cache-max-mb", type=int, default=None,
+                        help="Максимальный размер кэша OCR в МБ (по умолчанию - 256)")
+    parser.add_argument("--http-cache-dir", default=None,
+                        help="Каталог HTTP-кэша страниц: при повторной загрузке отправляется условный запрос, "
+                             "и при ответе 304 используется сохраненный результат разбора")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Каталог кэша результатов по содержимому файлов (повторный запуск не разбирает документ заново)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_CACHE_MAX_BYTES // 1024 // 1024,
+                        help="Максимальный размер кэша результатов в МБ (по умолчанию - 1024)")
+    parser.add_argument("--format", dest="output_format", choices=OUTPUT_FORMATS, default="text",
+                        help="Формат вывода: text (по умолчанию), json или jsonl - записи по страницам, таблицам, "
+                             "ссылкам выводятся по мере извлечения")
+    parser.add_argument("--batch", action="store_true",
+                        help="Пакетный режим: input_path - каталог, glob-шаблон или манифест (.txt/.jsonl)")
+    parser.add_argument("--urls", action="store_true",
+                        help="Режим списка URL: input_path - файл со списком адресов; страницы загружаются параллельно")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Обход сайта: input_path - начальный URL или файл со списком адресов; "
+                             "переходы по ссылкам страниц, страницы выводятся по мере разбора")
+    parser.add_argument("--crawl-depth", type=int, default=2,
+                        help="Режим --crawl: глубина переходов по ссылкам от начальных адресов (по умолчанию - 2)")
+    parser.add_argument("--crawl-limit", type=int, default=100,
+                        help="Режим --crawl: максимум загружаемых страниц (по умолчанию - 100)")
+    parser.add_argument("--crawl-all-hosts", action="store_true",
+                        help="Режим --crawl: переходить и по ссылкам на другие сайты (по умолчанию - только хосты начальных адресов)")
+    parser.add_argument("--fetch-workers", type=int, default=None,
+                        help="Режимы --urls и --crawl: число потоков загрузки (по умолчанию - 16)")
+    parser.add_argument("--per-host-rate", type=float, default=None,
+                        help="Режимы --urls и --crawl: не больше N запросов в секунду к одному хосту "
+                             "(по умолчанию - без ограничения, для --crawl - 2)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Режимы --urls и --crawl: число повторов запроса при сетевых ошибках и ответах 429/5xx "
+                             "(по умолчанию - 3)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Число процессов для пакетного режима (по умолчанию - число ядер)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Максимум документов в работе одновременно (по умолчанию - 2 x workers)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Пакетный режим: выводить только итоговую сводку")
     args = parser.parse_args()
+    if (args.batch or args.urls or args.crawl) and args.output_format == "json":
+        parser.error("в пакетном режиме используйте --format jsonl")
+    if args.batch + args.urls + args.crawl > 1:
+        parser.error("--batch, --urls и --crawl нельзя использовать вместе")
+    cache_max_bytes = args.cache_max_mb * 1024 * 1024
+    options = {
+        "pages": args.pages,
+        "max_pages": args.max_pages,
+        "ocr_workers": args.ocr_workers,
+        "ocr_window": args.ocr_window,
+        "ocr_max_pages_in_flight": args.ocr_max_pages_in_flight,
+        "backend": args.html_backend,
+        "load_profile": args.doc_load_profile,
+        "engine": args.doc_engine,
+        "max_page_bytes": int(args.max_page_mb * 1024 * 1024) if args.max_page_mb is not None else None,
+        "incremental": args.incremental,
+        "http_cache_dir": args.http_cache_dir,
+        "http_cache_max_bytes": cache_max_bytes,
+        "ocr_cache_dir": args.ocr_cache_dir,
+        "ocr_cache_max_bytes": args.ocr_cache_max_mb * 1024 * 1024 if args.ocr_cache_max_mb else None,
+    }
 
     try:
-        processor = FileProcessor(args.input_path)
-        processor.process()
+        if args.crawl:
+            crawl = CrawlProcessor(args.input_path, args.crawl_depth, args.crawl_limit, not args.crawl_all_hosts,
+                                   args.fetch_workers, args.per_host_rate, args.retries, args.max_in_flight,
+                                   args.quiet, args.fields, options, args.output_format)
+            summary = crawl.run()
+            with contextlib.redirect_stdout(sys.stdout if args.output_format == "text" else sys.stderr):
+                summary.print_results()
+            sys.exit(1 if summary.failed else 0)
+        if args.urls:
+            batch = UrlBatchProcessor(args.input_path, args.fetch_workers, args.per_host_rate, args.retries,
+                                      args.max_in_flight, args.quiet, args.fields, options, args.output_format)
+            summary = batch.run()
+            with contextlib.redirect_stdout(sys.stdout if args.output_format == "text" else sys.stderr):
+                summary.print_results()
+            sys.exit(1 if summary.failed else 0)
+        if args.batch:
+            batch = BatchProcessor(args.input_path, args.workers, args.max_in_flight, args.quiet, args.fields, options,
+                                   args.cache_dir, cache_max_bytes, args.output_format)
+            summary = batch.run()
+            with contextlib.redirect_stdout(sys.stdout if args.output_format == "text" else sys.stderr):
+                summary.print_results()
+            sys.exit(1 if summary.failed else 0)
+        cache = ResultCache(args.cache_dir, cache_max_bytes) if args.cache_dir else None
+        processor = FileProcessor(args.input_path, args.fields, options, cache, args.output_format)
+        ok = processor.process()
+        if cache is not None:
+            stats = cache.stats()
+            print(f"\nКэш результатов: попаданий {stats['hits']}, промахов {stats['misses']}",
+                  file=sys.stdout if args.output_format == "text" else sys.stderr)
+        if args.output_format != "text" and not ok:
+            sys.exit(1)
     except KeyboardInterrupt:
         print("\nПрервано пользователем")
         sys.exit(0)
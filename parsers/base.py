@@ -0,0 +1,167 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+PagesSpec = Union[str, Sequence[int]]
+
+# Имена полей, которые можно запросить у обработчиков (--fields)
+FIELD_NAMES = ("text", "ocr", "tables", "images", "metadata", "links")
+# Поле -> тип записей JSON/JSONL (для списков - по записи на элемент)
+RECORD_TYPES = {
+    "text": "text",
+    "ocr": "ocr",
+    "tables": "table",
+    "images": "image",
+    "metadata": "metadata",
+    "links": "link",
+}
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Разбор списка полей вида "text,tables"; None - все поля"""
+    if value is None:
+        return None
+    fields = tuple(name.strip().lower() for name in value.split(",") if name.strip())
+    unknown = [name for name in fields if name not in FIELD_NAMES]
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(unknown)}. Доступны: {', '.join(FIELD_NAMES)}")
+    return fields
+
+
+def parse_pages(spec: str) -> List[Tuple[int, Optional[int]]]:
+    """Разбор диапазонов страниц вида "1-3,7,10-" (нумерация с 1; "10-" - до конца)"""
+    ranges = []
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        try:
+            first = int(start)
+            last = (int(end) if end else None) if sep else first
+        except ValueError:
+            raise ValueError(f"Некорректный диапазон страниц: {part}")
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Некорректный диапазон страниц: {part}")
+        ranges.append((first, last))
+    if not ranges:
+        raise ValueError("Пустой диапазон страниц")
+    return ranges
+
+
+def select_pages(total: int, pages: Optional[PagesSpec] = None, max_pages: Optional[int] = None) -> List[int]:
+    """Номера выбранных страниц документа из total страниц (по возрастанию)"""
+    if pages is None:
+        numbers = list(range(1, total + 1))
+    elif isinstance(pages, str):
+        selected = set()
+        for first, last in parse_pages(pages):
+            selected.update(range(first, min(last or total, total) + 1))
+        numbers = sorted(selected)
+    else:
+        numbers = sorted({number for number in pages if 1 <= number <= total})
+    if max_pages is not None:
+        numbers = numbers[:max(0, max_pages)]
+    return numbers
+
+
+def format_pages(numbers: Sequence[int]) -> str:
+    """Обратное преобразование номеров страниц в компактный вид "1-3,7" """
+    parts = []
+    start = prev = None
+    for number in numbers:
+        if prev is not None and number == prev + 1:
+            prev = number
+            continue
+        if start is not None:
+            parts.append(f"{start}-{prev}" if prev != start else str(start))
+        start = prev = number
+    if start is not None:
+        parts.append(f"{start}-{prev}" if prev != start else str(start))
+    return ",".join(parts)
+
+
+class BaseProcessor:
+    # Поле -> (атрибут результата, метод извлечения, значение по умолчанию)
+    FIELDS: Dict[str, Tuple[str, str, Callable[[], Any]]] = {}
+    # Версия результата обработчика: меняется вместе с логикой извлечения,
+    # чтобы устаревшие записи кэша результатов не использовались
+    VERSION = "1"
+    # Параметры конструктора, от которых зависит результат (входят в ключ кэша)
+    OUTPUT_OPTIONS: Tuple[str, ...] = ()
+    # Атрибуты помимо полей, которые сохраняются в кэше вместе с результатом
+    STATE_ATTRIBUTES: Tuple[str, ...] = ()
+
+    def _init_fields(self, fields: Optional[Iterable[str]]) -> None:
+        """Заполнение полей значениями по умолчанию и извлечение запрошенных"""
+        self.extracted_fields: Set[str] = set()
+        for attribute, _, default in self.FIELDS.values():
+            setattr(self, attribute, default())
+        self.extract(fields)
+
+    def extract(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Извлечение запрошенных полей (None - все); уже извлеченные не пересчитываются"""
+        requested = set(self.FIELDS if fields is None else fields)
+        names = [name for name in self.FIELDS if name in requested]
+        for name in names:
+            if name not in self.extracted_fields:
+                attribute, method, _ = self.FIELDS[name]
+                setattr(self, attribute, getattr(self, method)())
+                self.extracted_fields.add(name)
+        return {name: getattr(self, self.FIELDS[name][0]) for name in names}
+
+    def iter_records(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Записи результата для JSON/JSONL. Поля извлекаются по очереди и выдаются
+        по мере готовности; обработчик может выдавать поле частями через метод
+        _stream_<поле> (например, OCR по страницам)"""
+        requested = set(self.FIELDS if fields is None else fields)
+        for name in self.FIELDS:
+            if name not in requested:
+                continue
+            stream = getattr(self, f"_stream_{name}", None)
+            if stream is not None and name not in self.extracted_fields:
+                yield from stream()
+                self.extracted_fields.add(name)
+                continue
+            self.extract([name])
+            yield from self._field_records(name, getattr(self, self.FIELDS[name][0]))
+
+    def _field_records(self, name: str, value: Any) -> Iterator[Dict[str, Any]]:
+        """Записи одного поля: элемент списка, текст или словарь метаданных"""
+        record_type = RECORD_TYPES.get(name, name)
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                record = {"type": record_type, "index": index}
+                record.update(self._item_record(name, item))
+                yield record
+        elif isinstance(value, dict):
+            yield {"type": record_type, record_type: value}
+        else:
+            yield {"type": record_type, "text": value}
+
+    def _item_record(self, name: str, item: Any) -> Dict[str, Any]:
+        """Содержимое записи для элемента списка (строки таблицы, ссылка, изображение)"""
+        if isinstance(item, dict):
+            return dict(item)
+        return {"rows" if name == "tables" else "value": item}
+
+    def is_cacheable(self) -> bool:
+        """Результат можно кэшировать: документ прочитан без ошибок"""
+        return bool(getattr(self, "is_valid", True))
+
+    def cache_state(self) -> Dict[str, Any]:
+        """Извлеченные поля и служебные атрибуты для кэша результатов"""
+        state = {attribute: getattr(self, attribute) for attribute, _, _ in self.FIELDS.values()}
+        state.update({attribute: getattr(self, attribute) for attribute in self.STATE_ATTRIBUTES})
+        state["extracted_fields"] = set(self.extracted_fields)
+        return state
+
+    @classmethod
+    def from_cache_state(cls, file_path: str, state: Dict[str, Any]) -> "BaseProcessor":
+        """Обработчик с результатами из кэша, без повторного чтения документа.
+        Такой обработчик не извлекает новые поля: документ им не открывался."""
+        processor = cls.__new__(cls)
+        processor.file_path = file_path
+        processor._restore_state(state)
+        return processor
+
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
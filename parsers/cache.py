@@ -0,0 +1,178 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Вытеснение освобождает кэш до этой доли max_bytes, чтобы полный обход
+# каталога выполнялся не на каждой записи, а раз в несколько записей
+EVICT_LOW_WATER = 0.9
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 содержимого файла (читается блоками, без загрузки целиком)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """Записи кэша: (путь, размер, время последнего использования)"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str, count: bool = True) -> Optional[bytes]:
+        """Чтение записи; время изменения файла обновляется для LRU-вытеснения.
+        count=False - предварительное чтение, не учитываемое в статистике"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += count
+            return None
+        self.hits += count
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        """Атомарная запись (общий каталог могут использовать несколько процессов)"""
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous = os.path.getsize(path)
+        except FileNotFoundError:
+            previous = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.writes += 1
+        self.size += len(data) - previous
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Удаление давно не использованных записей, пока кэш больше
+        EVICT_LOW_WATER * max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.size = sum(size for _, size, _ in entries)
+        if self.size <= self.max_bytes:
+            return
+        target = int(self.max_bytes * EVICT_LOW_WATER)
+        for path, size, _ in entries:
+            if self.size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "bytes": self.size,
+        }
+
+
+class ResultCache:
+    def __init__(self, directory: str, max_bytes: int = 1024 ** 3) -> None:
+        self.store = DiskCache(directory, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_path: str, processor_cls: type, options: Dict[str, Any]) -> str:
+        """Ключ: хэш содержимого файла, обработчик с его версией и влияющие на результат параметры"""
+        return self._key(file_digest(file_path), processor_cls, options)
+
+    def url_key(self, url: str, processor_cls: type, options: Dict[str, Any]) -> str:
+        """Ключ для страницы: адрес вместо содержимого (актуальность проверяет HTTP-кэш)"""
+        return self._key(url, processor_cls, options)
+
+    def _key(self, source: str, processor_cls: type, options: Dict[str, Any]) -> str:
+        output_options = {
+            name: options[name] for name in getattr(processor_cls, "OUTPUT_OPTIONS", ())
+            if options.get(name) is not None
+        }
+        source = "|".join([
+            source,
+            processor_cls.__name__,
+            str(getattr(processor_cls, "VERSION", "")),
+            repr(sorted(output_options.items())),
+        ])
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def load(self, key: str, fields: Iterable[str], count: bool = True) -> Optional[Dict[str, Any]]:
+        """Сохраненное состояние обработчика, если в нем есть все нужные поля"""
+        data = self.store.get(key, count)
+        state = None
+        if data is not None:
+            try:
+                state = pickle.loads(zlib.decompress(data))
+            except Exception as e:
+                print(f"Предупреждение: поврежденная запись кэша: {e}")
+        if state is None or not set(fields) <= state["extracted_fields"]:
+            self.misses += count
+            return None
+        self.hits += count
+        return state
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        """Сжатая запись состояния (pickle + zlib)"""
+        self.store.set(key, zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 6))
+
+    def stats(self) -> Dict[str, int]:
+        stats = self.store.stats()
+        stats.update(hits=self.hits, misses=self.misses)
+        return stats
+
+
+_result_caches: Dict[str, ResultCache] = {}
+
+
+def get_result_cache(directory: str, max_bytes: Optional[int] = None) -> ResultCache:
+    """Общий для процесса кэш результатов для каталога"""
+    directory = os.path.abspath(directory)
+    if directory not in _result_caches:
+        _result_caches[directory] = ResultCache(directory, max_bytes or 1024 ** 3)
+    return _result_caches[directory]
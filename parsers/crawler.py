@@ -0,0 +1,176 @@
+import hashlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+
+from requests.exceptions import RequestException
+
+from parsers.fetch import Fetcher, read_content
+from parsers.parser_html import WebPageProcessor, network_error_message
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Частота запросов к одному хосту, если она не задана явно
+DEFAULT_CRAWL_RATE = 2.0
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Абсолютный адрес без фрагмента, с хостом в нижнем регистре и без порта
+    по умолчанию; None - не http(s)-ссылка (mailto:, javascript: и т.п.)"""
+    try:
+        url, _ = urldefrag(urljoin(base, url.strip()) if base else url.strip())
+        parsed = urlsplit(url)
+        port = parsed.port
+    except ValueError:
+        return None
+    scheme = parsed.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parsed.hostname:
+        return None
+    host = f"[{parsed.hostname}]" if ":" in parsed.hostname else parsed.hostname
+    netloc = host if port is None or port == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parsed.path or "/", parsed.query, ""))
+
+
+class VisitedSet:
+    """Множество посещенных адресов: хранятся 64-битные хэши вместо строк
+    (вероятность совпадения хэшей у разных адресов пренебрежимо мала)"""
+
+    def __init__(self) -> None:
+        self._hashes: Set[int] = set()
+
+    @staticmethod
+    def _hash(url: str) -> int:
+        return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, url: str) -> bool:
+        """Добавление адреса; False - адрес уже был"""
+        value = self._hash(url)
+        if value in self._hashes:
+            return False
+        self._hashes.add(value)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return self._hash(url) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class Crawler:
+    def __init__(
+        self,
+        seeds: Iterable[str],
+        fetcher: Optional[Fetcher] = None,
+        max_depth: int = 2,
+        max_pages: int = 100,
+        same_host: bool = True,
+        max_in_flight: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        backend: Optional[str] = None
+    ) -> None:
+        """Обход сайта от начальных адресов: ссылки страниц глубины меньше max_depth
+        добавляются в очередь; загружается не больше max_pages страниц.
+        same_host - переходить только по ссылкам на хосты начальных адресов"""
+        self.fetcher = fetcher or Fetcher(per_host_rate=DEFAULT_CRAWL_RATE)
+        self.max_depth = max(0, max_depth)
+        self.max_pages = max(0, max_pages)
+        self.same_host = same_host
+        self.max_in_flight = max(1, max_in_flight or self.fetcher.workers * 2)
+        self.fields = fields
+        self.backend = backend
+        self.visited = VisitedSet()
+        # Итоговые адреса загруженных страниц (после перенаправлений): страница,
+        # полученная и напрямую, и через перенаправление, выводится один раз
+        self.fetched = VisitedSet()
+        self._fetched_lock = threading.Lock()
+        self.scheduled = 0
+        self._frontier: Deque[Tuple[str, int]] = deque()
+        self.hosts: Set[str] = set()
+        for seed in seeds:
+            url = normalize_url(seed)
+            if url is None:
+                print(f"Пропущен некорректный адрес: {seed}")
+            elif self.visited.add(url):
+                self.hosts.add(urlsplit(url).netloc)
+                self._frontier.append((url, 0))
+
+    def crawl(self) -> Iterator[Dict[str, Any]]:
+        """Страницы в порядке завершения разбора; загрузка и разбор идут в пуле потоков
+        с ограничением частоты запросов к хосту, новые ссылки сразу ставятся в очередь"""
+        pending: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.fetcher.workers) as executor:
+            while self._frontier or pending:
+                while self._frontier and len(pending) < self.max_in_flight and self.scheduled < self.max_pages:
+                    url, depth = self._frontier.popleft()
+                    pending[executor.submit(self._visit, url, depth)] = url
+                    self.scheduled += 1
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    page = future.result()
+                    if page["duplicate"]:
+                        # Повтор уже загруженной страницы не занимает место в лимите max_pages
+                        self.scheduled -= 1
+                        continue
+                    self._enqueue(page)
+                    yield page
+
+    def _enqueue(self, page: Dict[str, Any]) -> None:
+        """Постановка в очередь новых ссылок страницы"""
+        if page["final_url"] != page["url"]:
+            self.visited.add(page["final_url"])
+        if page["depth"] >= self.max_depth:
+            return
+        for link in page.pop("links"):
+            url = normalize_url(link, page["final_url"])
+            if url is None or (self.same_host and urlsplit(url).netloc not in self.hosts):
+                continue
+            if self.visited.add(url):
+                self._frontier.append((url, page["depth"] + 1))
+
+    def _visit(self, url: str, depth: int) -> Dict[str, Any]:
+        """Загрузка и разбор одной страницы (в потоке пула)"""
+        started = time.perf_counter()
+        page = {
+            "url": url, "final_url": url, "depth": depth, "processor": None,
+            "links": [], "error": "", "size": 0, "seconds": 0.0, "duplicate": False,
+        }
+        try:
+            response = self.fetcher.get(url, stream=True)
+            page["final_url"] = normalize_url(response.url) or url
+            with self._fetched_lock:
+                page["duplicate"] = not self.fetched.add(page["final_url"])
+            if page["duplicate"]:
+                response.close()
+                return page
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and "html" not in content_type.lower():
+                response.close()
+                page["error"] = f"Не HTML-страница: {content_type}"
+                page["seconds"] = time.perf_counter() - started
+                return page
+            content = read_content(response, self.fetcher.max_bytes)
+        except RequestException as e:
+            page["error"] = network_error_message(url, e)
+            page["seconds"] = time.perf_counter() - started
+            return page
+
+        # Ссылки нужны для обхода в любом случае; если их не запрашивали,
+        # они собираются тем же проходом, но не выводятся
+        fields = set(self.fields or WebPageProcessor.FIELDS)
+        processor = WebPageProcessor(
+            url, fields=fields | {"links"}, backend=self.backend, fetcher=self.fetcher,
+            content=content, response=response
+        )
+        page["links"] = [link["url"] for link in processor.links]
+        if "links" not in fields:
+            processor.extracted_fields.discard("links")
+        page["processor"] = processor
+        page["size"] = len(content)
+        page["seconds"] = time.perf_counter() - started
+        return page
@@ -0,0 +1,201 @@
+import posixpath
+import zipfile
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from docx.opc.coreprops import CoreProperties
+from docx.opc.exceptions import PackageNotFoundError
+from docx.oxml.parser import parse_xml
+from lxml import etree
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+BODY, P, R, T, TAB, PTAB, BR, CR, NO_BREAK_HYPHEN, HYPERLINK = (
+    W + tag for tag in ("body", "p", "r", "t", "tab", "ptab", "br", "cr", "noBreakHyphen", "hyperlink")
+)
+TBL, TR, TC, TR_PR, TC_PR, GRID_BEFORE, GRID_SPAN, V_MERGE = (
+    W + tag for tag in ("tbl", "tr", "tc", "trPr", "tcPr", "gridBefore", "gridSpan", "vMerge")
+)
+W_TYPE, W_VAL = W + "type", W + "val"
+RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+CORE_PROPERTIES = "http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties"
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+DEFAULT_CORE_PART = "docProps/core.xml"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+CHUNK_SIZE = 64 * 1024
+
+RUN_TEXT = {TAB: "\t", PTAB: "\t", CR: "\n", NO_BREAK_HYPHEN: "-"}
+
+
+def run_text(run: Any, parts: List[str]) -> None:
+    """Текст фрагмента (w:r) - как run.text в python-docx"""
+    for child in run:
+        tag = child.tag
+        if tag == T:
+            parts.append(child.text or "")
+        elif tag == BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+
+
+def paragraph_text(paragraph: Any) -> str:
+    """Текст абзаца (w:p) - как paragraph.text в python-docx: фрагменты и гиперссылки"""
+    parts: List[str] = []
+    for child in paragraph:
+        if child.tag == R:
+            run_text(child, parts)
+        elif child.tag == HYPERLINK:
+            for run in child.iterchildren(R):
+                run_text(run, parts)
+    return "".join(parts)
+
+
+def cell_text(cell: Any) -> str:
+    return "\n".join(paragraph_text(paragraph) for paragraph in cell.iterchildren(P))
+
+
+def _int_property(parent: Any, tag: str, default: int) -> int:
+    element = parent.find(tag) if parent is not None else None
+    try:
+        return int(element.get(W_VAL)) if element is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def row_cells(row: Any, above: Dict[int, str]) -> List[str]:
+    """Ячейки строки по сетке таблицы - как row.cells в python-docx: объединенная
+    по горизонтали ячейка повторяется, продолжение объединения по вертикали берет
+    текст ячейки выше. above - тексты предыдущей строки по смещению в сетке"""
+    cells = []
+    current: Dict[int, str] = {}
+    offset = _int_property(row.find(TR_PR), GRID_BEFORE, 0)
+    for cell in row.iterchildren(TC):
+        properties = cell.find(TC_PR)
+        span = max(1, _int_property(properties, GRID_SPAN, 1))
+        merge = properties.find(V_MERGE) if properties is not None else None
+        if merge is not None and merge.get(W_VAL, "continue") == "continue" and offset in above:
+            text = above[offset]
+        else:
+            text = cell_text(cell)
+        current[offset] = text
+        cells.extend([text] * span)
+        offset += span
+    above.clear()
+    above.update(current)
+    return [text.strip() for text in cells]
+
+
+def _part_name(archive: zipfile.ZipFile, relationship: str, default: str) -> str:
+    """Имя части пакета по связи из _rels/.rels"""
+    try:
+        rels = etree.fromstring(archive.read("_rels/.rels"), etree.XMLParser(resolve_entities=False))
+    except (KeyError, etree.XMLSyntaxError):
+        return default
+    for rel in rels.iter(RELATIONSHIPS):
+        if rel.get("Type") == relationship and rel.get("TargetMode") != "External":
+            return posixpath.normpath(rel.get("Target", default).lstrip("/"))
+    return default
+
+
+class _SyntaxOnly:
+    """Цель парсера без обработчиков событий: дерево не строится, проверяется только синтаксис"""
+
+    def close(self) -> None:
+        return None
+
+
+def check_xml(source: IO[bytes]) -> None:
+    """Потоковая проверка синтаксиса XML; ошибка - etree.XMLSyntaxError"""
+    parser = etree.XMLParser(target=_SyntaxOnly(), resolve_entities=False, huge_tree=True)
+    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+        parser.feed(chunk)
+    parser.close()
+
+
+def _rels_part(part_name: str) -> str:
+    """Имя части связей (.rels) для части пакета"""
+    folder, name = posixpath.split(part_name)
+    return posixpath.join(folder, "_rels", f"{name}.rels")
+
+
+def check_package(file_path: str, check_main_part: bool = True) -> None:
+    """Проверка пакета DOCX без загрузки документа: есть [Content_Types].xml и основная
+    часть документа, синтаксически корректны [Content_Types].xml, связи пакета и основной
+    части и (при check_main_part) сама основная часть. Остальные части (стили, темы,
+    customXml) не разбираются. check_main_part=False - основная часть проверяется
+    потоковым разбором тела (iter_body), чтобы не разбирать ее дважды"""
+    with zipfile.ZipFile(file_path) as archive:
+        names = set(archive.namelist())
+        main_part = _part_name(archive, OFFICE_DOCUMENT, DEFAULT_DOCUMENT_PART)
+        if CONTENT_TYPES_PART not in names or main_part not in names:
+            raise PackageNotFoundError(f"в пакете нет {CONTENT_TYPES_PART} или {main_part}")
+        parts = [CONTENT_TYPES_PART, "_rels/.rels", _rels_part(main_part)]
+        if check_main_part:
+            parts.append(main_part)
+        for name in parts:
+            if name in names:
+                with archive.open(name) as source:
+                    check_xml(source)
+
+
+def iter_body(source: IO[bytes]) -> Iterator[Tuple[str, Any]]:
+    """Потоковый разбор word/document.xml: ("paragraph", текст) для абзацев тела,
+    ("row", ячейки) для строк таблиц верхнего уровня и ("table", None) в конце таблицы.
+    Разобранные элементы удаляются, поэтому память не растет с размером документа"""
+    above: Dict[int, str] = {}
+    events = etree.iterparse(source, events=("end",), tag=(P, TR, TBL), resolve_entities=False, huge_tree=True)
+    for _, element in events:
+        parent = element.getparent()
+        if parent is None or parent.tag != BODY:
+            # Абзацы ячеек и вложенные таблицы разбираются вместе со строкой верхнего уровня
+            if element.tag == TR and parent is not None and parent.getparent() is not None \
+                    and parent.getparent().tag == BODY:
+                yield "row", row_cells(element, above)
+                _release(element)
+            continue
+        if element.tag == P:
+            yield "paragraph", paragraph_text(element)
+        elif element.tag == TBL:
+            above.clear()
+            yield "table", None
+        _release(element)
+
+
+def _release(element: Any) -> None:
+    """Очистка разобранного элемента и уже обработанных соседей"""
+    element.clear()
+    parent = element.getparent()
+    while element.getprevious() is not None:
+        del parent[0]
+
+
+def read_body(file_path: str) -> Tuple[List[str], List[List[List[str]]]]:
+    """Абзацы тела документа и таблицы верхнего уровня - как doc.paragraphs и doc.tables"""
+    paragraphs: List[str] = []
+    tables: List[List[List[str]]] = []
+    rows: List[List[str]] = []
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open(_part_name(archive, OFFICE_DOCUMENT, DEFAULT_DOCUMENT_PART)) as source:
+            for kind, value in iter_body(source):
+                if kind == "paragraph":
+                    paragraphs.append(value)
+                elif kind == "row":
+                    rows.append(value)
+                else:
+                    tables.append(rows)
+                    rows = []
+    return paragraphs, tables
+
+
+def read_core_properties(file_path: str) -> Dict[str, Any]:
+    """Автор и даты из docProps/core.xml (разбор свойств python-docx, без загрузки документа)"""
+    with zipfile.ZipFile(file_path) as archive:
+        try:
+            blob: Optional[bytes] = archive.read(_part_name(archive, CORE_PROPERTIES, DEFAULT_CORE_PART))
+        except KeyError:
+            blob = None
+    if blob is None:
+        return {"author": "", "created": None, "modified": None}
+    core = CoreProperties(parse_xml(blob))
+    return {"author": core.author, "created": core.created, "modified": core.modified}
@@ -0,0 +1,197 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, RequestException, Timeout
+
+# Ответы, после которых запрос повторяется (перегрузка и временные ошибки сервера)
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+MAX_RETRY_AFTER = 60.0
+# Ограничение размера страницы (после распаковки gzip/deflate) и размер части при потоковой загрузке
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# Тело ответа с ошибкой дочитывается до этого размера, чтобы соединение вернулось в пул
+ERROR_BODY_BYTES = 1024 * 1024
+
+
+class ResponseTooLarge(RequestException):
+    """Ответ больше допустимого размера; загрузка прервана"""
+
+
+def iter_content(
+    response: requests.Response,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Тело ответа (запрошенного с stream=True) по частям по мере получения;
+    при превышении max_bytes (None или 0 - без ограничения) загрузка прерывается"""
+    try:
+        length = response.headers.get("Content-Length", "")
+        if max_bytes and length.isdigit() and int(length) > max_bytes:
+            raise ResponseTooLarge(f"Размер ответа {length} байт больше допустимого ({max_bytes})", response=response)
+        received = 0
+        for chunk in response.iter_content(chunk_size):
+            received += len(chunk)
+            if max_bytes and received > max_bytes:
+                raise ResponseTooLarge(f"Размер ответа больше допустимого ({max_bytes} байт)", response=response)
+            yield chunk
+    finally:
+        response.close()
+
+
+def read_content(response: requests.Response, max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> bytes:
+    """Тело ответа целиком с ограничением размера"""
+    return b"".join(iter_content(response, max_bytes))
+
+
+class HostRateLimiter:
+    def __init__(self, rate: Optional[float] = None) -> None:
+        """rate - не больше rate запросов в секунду к одному хосту (None - без ограничения)"""
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str) -> None:
+        """Ожидание очереди хоста; разные хосты друг друга не задерживают"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Fetcher:
+    def __init__(
+        self,
+        workers: int = 16,
+        per_host_rate: Optional[float] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10,
+        pool_size: Optional[int] = None,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.workers = max(1, workers)
+        self.limiter = HostRateLimiter(per_host_rate)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.pool_size = pool_size or self.workers
+        self.max_bytes = max_bytes
+        self.requests = 0
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """Сессия потока: соединения с хостами остаются открытыми (keep-alive)
+        и переиспользуются между запросами"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """GET с ограничением частоты по хосту и повтором с экспоненциальной паузой
+        при сетевых ошибках и ответах RETRY_STATUSES"""
+        host = urlparse(url).netloc
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire(host)
+            self.requests += 1
+            try:
+                response = self.session.get(url, **kwargs)
+            except (ConnectionError, Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                delay = self._delay(attempt, response.headers.get("Retry-After"))
+                self._release(response)
+                time.sleep(delay)
+                continue
+            if response.status_code >= 400:
+                self._release(response)
+            response.raise_for_status()
+            return response
+        raise RequestException(f"Не удалось загрузить {url}")
+
+    @staticmethod
+    def _release(response: requests.Response) -> None:
+        """Освобождение соединения после ответа с ошибкой (в том числе при stream=True)"""
+        try:
+            read_content(response, ERROR_BODY_BYTES)
+        except RequestException:
+            pass
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Пауза перед повтором: Retry-After сервера или backoff * 2^attempt"""
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+    def fetch_many(
+        self,
+        urls: Iterable[str],
+        max_in_flight: Optional[int] = None,
+        headers: Optional[Callable[[str], Dict[str, str]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Параллельная загрузка страниц в порядке завершения; одновременно
+        в работе не больше max_in_flight адресов (по умолчанию 2 x workers).
+        headers - заголовки запроса для адреса (например, условного запроса)"""
+        max_in_flight = max(1, max_in_flight or self.workers * 2)
+        pending: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for url in urls:
+                if len(pending) >= max_in_flight:
+                    yield from self._collect(pending)
+                pending[executor.submit(self._fetch, url, headers)] = url
+            while pending:
+                yield from self._collect(pending)
+
+    def _collect(self, pending: Dict[Future, str]) -> Iterator[Dict[str, Any]]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.pop(future)
+            yield future.result()
+
+    def _fetch(self, url: str, headers: Optional[Callable[[str], Dict[str, str]]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        response = error = None
+        try:
+            response = self.get(url, headers=headers(url) if headers else None, stream=True)
+            content = read_content(response, self.max_bytes)
+        except RequestException as e:
+            content, error = None, e
+        return {
+            "url": url,
+            "response": response,
+            "content": content,
+            "error": error,
+            "seconds": time.perf_counter() - started,
+        }
+
+
+_shared_fetcher: Optional[Fetcher] = None
+
+
+def get_fetcher() -> Fetcher:
+    """Общий для процесса загрузчик: соединения переиспользуются между страницами"""
+    global _shared_fetcher
+    if _shared_fetcher is None:
+        _shared_fetcher = Fetcher()
+    return _shared_fetcher
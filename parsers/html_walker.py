@@ -0,0 +1,237 @@
+import codecs
+import importlib.util
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag, UnicodeDammit
+from bs4.dammit import EncodingDetector
+
+# Строки, которые BeautifulSoup.get_text() учитывает (без комментариев, doctype и т.п.)
+TEXT_STRING_TYPES = (NavigableString, CData)
+# Содержимое этих тегов get_text() не включает в текст (Script, Stylesheet, TemplateString...)
+SKIPPED_TEXT_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+
+PAGE_FIELDS = ("text", "images", "tables", "metadata", "links")
+
+# Способы разбора HTML от быстрого к медленному:
+# lxml-target - события парсера lxml сразу идут в сборщик, дерево не строится;
+# lxml и html.parser - дерево BeautifulSoup с соответствующим парсером
+HTML_BACKENDS = ("lxml-target", "lxml", "html.parser")
+LXML_BACKENDS = ("lxml-target", "lxml")
+
+# Сколько байт начала страницы накопить до выбора кодировки при разборе
+# по частям (в этом окне ищется <meta charset>, как в браузерах)
+SNIFF_BYTES = 1024
+
+
+def lxml_available() -> bool:
+    return importlib.util.find_spec("lxml") is not None
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Установленные способы разбора (от быстрого к медленному)"""
+    if lxml_available():
+        return HTML_BACKENDS
+    return tuple(backend for backend in HTML_BACKENDS if backend not in LXML_BACKENDS)
+
+
+def default_backend() -> str:
+    """Самый быстрый из установленных способов разбора"""
+    return available_backends()[0]
+
+
+def soup_features(backend: str) -> str:
+    """Парсер BeautifulSoup для способа разбора (для lxml-target - lxml)"""
+    return "html.parser" if backend == "html.parser" else "lxml"
+
+
+class PageCollector:
+    """Сборщик полей страницы по событиям start/end/data за один проход.
+    Интерфейс совпадает с target-парсером lxml, поэтому сборщик можно
+    подключить и к обходу дерева BeautifulSoup, и напрямую к парсеру lxml."""
+
+    def __init__(self, fields: Optional[Iterable[str]] = None) -> None:
+        self.fields = set(PAGE_FIELDS if fields is None else fields)
+        self.texts: List[str] = []
+        self.images: List[Dict[str, str]] = []
+        self.tables: List[Dict[str, list]] = []
+        self.meta_tags: Dict[str, str] = {}
+        self.links: List[Dict[str, Any]] = []
+        # Текст ячеек и ссылок копится в буферах и склеивается в close()
+        self._buffers: List[List[str]] = []
+        self._open: List[Optional[List[str]]] = []
+        self._open_tables: List[Dict[str, list]] = []
+        self._open_rows: List[list] = []
+        self._rows: List[list] = []
+        self._skip_depth = 0
+        # Парсер может разбить строку текста на несколько событий data
+        # (например, на границе частей при разборе по мере загрузки)
+        self._run: List[str] = []
+
+    def start(self, tag: str, attrib: Mapping[str, Any]) -> None:
+        self._flush_text()
+        buffer = None
+        if tag in SKIPPED_TEXT_TAGS:
+            self._skip_depth += 1
+        elif tag == "img" and "images" in self.fields:
+            self.images.append({"src": attrib.get("src", ""), "alt": attrib.get("alt", "No alt text")})
+        elif tag == "meta" and "metadata" in self.fields:
+            name = attrib.get("name") or attrib.get("property")
+            content = attrib.get("content")
+            if name and content:
+                self.meta_tags[name] = content
+        elif tag == "a" and "links" in self.fields and attrib.get("href") is not None:
+            buffer = []
+            self.links.append({"text": buffer, "url": attrib.get("href", "")})
+        elif "tables" in self.fields:
+            if tag == "table":
+                table = {"headers": [], "rows": []}
+                self.tables.append(table)
+                self._open_tables.append(table)
+            elif tag == "tr":
+                # Строка вложенной таблицы входит и во все внешние (как find_all)
+                row: list = []
+                self._rows.append(row)
+                for table in self._open_tables:
+                    table["rows"].append(row)
+                self._open_rows.append(row)
+            elif tag == "th":
+                buffer = []
+                for table in self._open_tables:
+                    table["headers"].append(buffer)
+            elif tag == "td":
+                buffer = []
+                for row in self._open_rows:
+                    row.append(buffer)
+        if buffer is not None:
+            self._buffers.append(buffer)
+        self._open.append(buffer)
+
+    def end(self, tag: str) -> None:
+        self._flush_text()
+        buffer = self._open.pop() if self._open else None
+        if buffer is not None:
+            self._buffers.pop()
+        if tag in SKIPPED_TEXT_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "table" and self._open_tables and "tables" in self.fields:
+            self._open_tables.pop()
+        elif tag == "tr" and self._open_rows and "tables" in self.fields:
+            self._open_rows.pop()
+
+    def data(self, text: str) -> None:
+        if self._skip_depth:
+            return
+        if "text" in self.fields:
+            self._run.append(text)
+        for buffer in self._buffers:
+            buffer.append(text)
+
+    def comment(self, text: str) -> None:
+        """Комментарий (и прочие нетекстовые строки) разделяет текст,
+        как отдельные строки дерева BeautifulSoup"""
+        self._flush_text()
+
+    def _flush_text(self) -> None:
+        if self._run:
+            stripped = "".join(self._run).strip()
+            if stripped:
+                self.texts.append(stripped)
+            self._run = []
+
+    def close(self) -> Dict[str, Any]:
+        """Собранные поля в том же виде, что и у поиска по дереву (find_all)"""
+        self._flush_text()
+        for row in self._rows:
+            row[:] = ["".join(cell).strip() for cell in row]
+        for table in self.tables:
+            table["headers"] = ["".join(cell).strip() for cell in table["headers"]]
+        for link in self.links:
+            link["text"] = "".join(link["text"]).strip()
+        result = {
+            "text": "\n".join(self.texts),
+            "images": self.images,
+            "tables": self.tables,
+            "metadata": self.meta_tags,
+            "links": self.links,
+        }
+        return {field: value for field, value in result.items() if field in self.fields}
+
+
+def walk_soup(soup: BeautifulSoup, collector: PageCollector) -> Dict[str, Any]:
+    """Один обход дерева BeautifulSoup без рекурсии с передачей событий сборщику"""
+    stack = [iter(soup.contents)]
+    tags: List[Tag] = []
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if tags:
+                collector.end(tags.pop().name)
+        elif isinstance(node, Tag):
+            collector.start(node.name, node.attrs)
+            tags.append(node)
+            stack.append(iter(node.contents))
+        elif type(node) in TEXT_STRING_TYPES:
+            collector.data(node)
+            collector.comment("")
+        else:
+            collector.comment(node)
+    return collector.close()
+
+
+def parse_with_target(markup: bytes, collector: PageCollector) -> Dict[str, Any]:
+    """Разбор парсером lxml с передачей событий сборщику, без дерева BeautifulSoup.
+    Кодировка определяется так же, как в BeautifulSoup (UnicodeDammit)."""
+    from lxml import etree
+
+    text = UnicodeDammit(markup, is_html=True).unicode_markup or ""
+    parser = etree.HTMLParser(target=collector)
+    parser.feed(text)
+    return parser.close()
+
+
+def sniff_encoding(head: bytes) -> Tuple[str, bytes]:
+    """Кодировка по началу страницы в том же порядке, что у UnicodeDammit
+    (BOM, объявленная в документе, utf-8, windows-1252); начало без BOM"""
+    detector = EncodingDetector(head, is_html=True)
+    for encoding in detector.encodings:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(detector.markup, final=False)
+        except (LookupError, UnicodeDecodeError):
+            continue
+        return encoding, detector.markup
+    return "windows-1252", detector.markup
+
+
+class IncrementalParser:
+    """Разбор HTML по частям по мере загрузки: части сразу передаются
+    парсеру lxml и сборщику, текст и ссылки собираются до конца загрузки"""
+
+    def __init__(self, collector: PageCollector) -> None:
+        from lxml import etree
+
+        self.collector = collector
+        self.encoding: Optional[str] = None
+        self._parser = etree.HTMLParser(target=collector)
+        self._head = b""
+        self._decoder: Optional[codecs.IncrementalDecoder] = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) < SNIFF_BYTES:
+                return
+            self.encoding, chunk = sniff_encoding(self._head)
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+            self._head = b""
+        text = self._decoder.decode(chunk)
+        if text:
+            self._parser.feed(text)
+
+    def close(self) -> Dict[str, Any]:
+        """Собранные поля; короткая страница разбирается целиком, как в parse_with_target"""
+        if self._decoder is None:
+            self._parser.feed(UnicodeDammit(self._head, is_html=True).unicode_markup or "")
+        else:
+            self._parser.feed(self._decoder.decode(b"", final=True))
+        return self._parser.close()
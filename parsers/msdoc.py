@@ -0,0 +1,436 @@
+import mmap
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Составной файл OLE2 (Compound File Binary, MS-CFB)
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+MAXREGSECT = 0xFFFFFFFA
+ENDOFCHAIN = 0xFFFFFFFE
+NOSTREAM = 0xFFFFFFFF
+STREAM_OBJECT = 2
+ROOT_OBJECT = 5
+
+# Документ Word 97-2003 (MS-DOC)
+WORD_IDENT = 0xA5EC
+MIN_NFIB = 0x00C1
+F_WHICH_TBL_STM = 0x0200
+F_ENCRYPTED = 0x0100
+F_OBFUSCATED = 0x8000
+# Номера пар fc/lcb в FibRgFcLcb97
+FC_PLCF_BTE_PAPX = 13
+FC_CLX = 33
+FKP_SIZE = 512
+
+# Свойства абзаца (sprm) для разметки таблиц
+SPRM_P_F_IN_TABLE = 0x2416
+SPRM_P_F_TTP = 0x2417
+SPRM_P_F_INNER_TABLE_CELL = 0x244B
+SPRM_P_F_INNER_TTP = 0x244C
+SPRM_P_ITAP = 0x6649
+SPRM_T_DEF_TABLE = 0xD608
+SPRM_P_CHG_TABS = 0xC615
+SPRM_OPERAND_SIZES = {0: 1, 1: 1, 2: 2, 3: 4, 4: 2, 5: 2, 7: 3}
+
+# Конец абзаца, ячейки (и строки таблицы) и границы полей
+SPECIAL_CHARS = re.compile("[\r\x07\x13\x14\x15]")
+FIELD_BEGIN, FIELD_SEPARATOR, FIELD_END = "\x13", "\x14", "\x15"
+CELL_MARK = "\x07"
+# Разрыв строки и страницы - перевод строки; объекты, сноски и мягкие переносы не выводятся
+CLEAN_TEXT = str.maketrans({
+    "\x0b": "\n", "\x0c": "\n", "\x0e": "\n", "\x1e": "-", "\x1f": None,
+    "\x01": None, "\x02": None, "\x03": None, "\x04": None, "\x05": None, "\x08": None,
+})
+
+# Свойства документа (SummaryInformation)
+PID_CODEPAGE = 1
+PID_AUTHOR = 4
+PID_CREATE_DTM = 12
+VT_I2 = 2
+VT_LPSTR = 0x1E
+VT_FILETIME = 0x40
+
+
+class DocFormatError(ValueError):
+    """Документ не читается встроенным разборщиком (не OLE2, Word 6/95, шифрование и т.п.)"""
+
+
+class CompoundFile:
+    """Чтение потоков составного файла OLE2 по таблице FAT и каталогу"""
+
+    def __init__(self, data: Any) -> None:
+        if len(data) < 512 or data[:8] != CFB_SIGNATURE:
+            raise DocFormatError("не составной файл OLE2")
+        self.data = data
+        major, byte_order, sector_shift, mini_shift = struct.unpack_from("<HHHH", data, 26)
+        if byte_order != 0xFFFE or sector_shift not in (9, 12):
+            raise DocFormatError("некорректный заголовок составного файла")
+        self.major = major
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_shift
+        (_, num_fat, first_dir, _, self.mini_cutoff,
+         first_mini_fat, _, first_difat, num_difat) = struct.unpack_from("<9I", data, 40)
+        self.fat = self._read_fat(num_fat, first_difat, num_difat)
+        self.entries = self._read_directory(first_dir)
+        self.mini_fat = self._to_array(self._read_chain(first_mini_fat, self.fat, self.sector_size, self._sector))
+        self._mini_stream: Optional[bytes] = None
+
+    def _sector(self, sector: int) -> bytes:
+        offset = (sector + 1) * self.sector_size
+        return self.data[offset:offset + self.sector_size]
+
+    @staticmethod
+    def _to_array(raw: bytes) -> array:
+        values = array("I")
+        values.frombytes(raw[:len(raw) - len(raw) % 4])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def _read_fat(self, num_fat: int, first_difat: int, num_difat: int) -> array:
+        sectors = list(struct.unpack_from("<109I", self.data, 76))
+        per_sector = self.sector_size // 4
+        difat = first_difat
+        for _ in range(num_difat):
+            if difat > MAXREGSECT:
+                break
+            entries = struct.unpack(f"<{per_sector}I", self._sector(difat))
+            sectors.extend(entries[:-1])
+            difat = entries[-1]
+        sectors = [sector for sector in sectors[:num_fat] if sector <= MAXREGSECT]
+        return self._to_array(b"".join(self._sector(sector) for sector in sectors))
+
+    def _read_chain(self, start: int, fat: array, size: int, read: Any) -> bytes:
+        """Данные цепочки секторов (защита от циклов и выхода за таблицу)"""
+        parts = []
+        sector = start
+        while sector != ENDOFCHAIN and sector != NOSTREAM:
+            if sector > MAXREGSECT or sector >= len(fat) or len(parts) > len(fat):
+                raise DocFormatError("поврежденная цепочка секторов")
+            parts.append(read(sector))
+            sector = fat[sector]
+        return b"".join(parts)
+
+    def _read_directory(self, first_dir: int) -> List[Tuple[str, int, int, int, int, int, int]]:
+        raw = self._read_chain(first_dir, self.fat, self.sector_size, self._sector)
+        entries = []
+        for offset in range(0, len(raw) - 127, 128):
+            name_length = struct.unpack_from("<H", raw, offset + 64)[0]
+            name = raw[offset:offset + max(0, min(name_length, 64) - 2)].decode("utf-16-le", "replace")
+            kind = raw[offset + 66]
+            left, right, child = struct.unpack_from("<3I", raw, offset + 68)
+            start, size = struct.unpack_from("<IQ", raw, offset + 116)
+            if self.major == 3:
+                size &= 0xFFFFFFFF
+            entries.append((name, kind, left, right, child, start, size))
+        if not entries or entries[0][1] != ROOT_OBJECT:
+            raise DocFormatError("нет корневого каталога")
+        return entries
+
+    def root_streams(self) -> Dict[str, int]:
+        """Потоки корневого каталога (без вложенных хранилищ, например ObjectPool)"""
+        streams = {}
+        stack = [self.entries[0][4]]
+        seen = set()
+        while stack:
+            index = stack.pop()
+            if index == NOSTREAM or index >= len(self.entries) or index in seen:
+                continue
+            seen.add(index)
+            name, kind, left, right, _, _, _ = self.entries[index]
+            if kind == STREAM_OBJECT:
+                streams[name.lower()] = index
+            stack.extend((left, right))
+        return streams
+
+    def read(self, name: str) -> bytes:
+        index = self.root_streams().get(name.lower())
+        if index is None:
+            raise DocFormatError(f"нет потока {name!r}")
+        _, _, _, _, _, start, size = self.entries[index]
+        if size < self.mini_cutoff:
+            mini_size = self.mini_sector_size
+            mini_stream = self._root_mini_stream()
+
+            def read_mini(sector: int) -> bytes:
+                return mini_stream[sector * mini_size:(sector + 1) * mini_size]
+
+            data = self._read_chain(start, self.mini_fat, mini_size, read_mini)
+        else:
+            data = self._read_chain(start, self.fat, self.sector_size, self._sector)
+        if len(data) < size:
+            raise DocFormatError(f"поток {name!r} обрезан")
+        return data[:size]
+
+    def _root_mini_stream(self) -> bytes:
+        if self._mini_stream is None:
+            _, _, _, _, _, start, size = self.entries[0]
+            self._mini_stream = self._read_chain(start, self.fat, self.sector_size, self._sector)[:size]
+        return self._mini_stream
+
+
+class Paragraph:
+    def __init__(self, text: str, mark: str, in_table: bool = False, row_end: bool = False) -> None:
+        self.text = text
+        # Символ конца: \r - абзац, \x07 - ячейка или строка таблицы, "" - конец текста
+        self.mark = mark
+        self.in_table = in_table
+        self.row_end = row_end
+
+
+class WordDocument:
+    """Текст, простые таблицы и свойства документа Word 97-2003 без сторонних библиотек:
+    каталог составного файла, FIB и таблица фрагментов (piece table) читаются
+    из отображенного в память файла"""
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise DocFormatError("пустой файл")
+            with mapped:
+                cfb = CompoundFile(mapped)
+                self._word = cfb.read("WordDocument")
+                self._read_fib()
+                self._table = cfb.read("1Table" if self._flags & F_WHICH_TBL_STM else "0Table")
+                self.paragraphs = self._read_paragraphs()
+                try:
+                    self.metadata = read_summary(cfb.read("\x05SummaryInformation"))
+                except DocFormatError:
+                    self.metadata = {"author": "", "created": None}
+        self.tables = self._collect_tables()
+        self._word = self._table = b""
+
+    @property
+    def text(self) -> str:
+        """Текст основной части документа: абзац или ячейка таблицы - строка"""
+        return "\n".join(paragraph.text for paragraph in self.paragraphs if not paragraph.row_end)
+
+    def _read_fib(self) -> None:
+        word = self._word
+        if len(word) < 34:
+            raise DocFormatError("нет FIB")
+        ident, nfib = struct.unpack_from("<HH", word, 0)
+        if ident != WORD_IDENT:
+            raise DocFormatError("нет сигнатуры документа Word")
+        if nfib < MIN_NFIB:
+            raise DocFormatError("формат Word 6/95")
+        self._flags = struct.unpack_from("<H", word, 0x0A)[0]
+        if self._flags & (F_ENCRYPTED | F_OBFUSCATED):
+            raise DocFormatError("документ зашифрован")
+        offset = 32
+        csw = struct.unpack_from("<H", word, offset)[0]
+        offset += 2 + csw * 2
+        cslw = struct.unpack_from("<H", word, offset)[0]
+        rg_lw = offset + 2
+        offset = rg_lw + cslw * 4
+        cb_rg_fc_lcb = struct.unpack_from("<H", word, offset)[0]
+        rg_fc_lcb = offset + 2
+        if cslw < 4 or cb_rg_fc_lcb <= FC_CLX:
+            raise DocFormatError("неполный FIB")
+        self._ccp_text = struct.unpack_from("<i", word, rg_lw + 3 * 4)[0]
+        self._clx = struct.unpack_from("<II", word, rg_fc_lcb + FC_CLX * 8)
+        self._bte_papx = struct.unpack_from("<II", word, rg_fc_lcb + FC_PLCF_BTE_PAPX * 8)
+
+    def _read_pieces(self) -> List[Tuple[int, int, int, bool]]:
+        """Фрагменты основного текста: (cp начала, cp конца, смещение в WordDocument, 8-битный)"""
+        fc, lcb = self._clx
+        clx = self._table[fc:fc + lcb]
+        position = 0
+        while position < len(clx) and clx[position] == 0x01:
+            position += 3 + struct.unpack_from("<h", clx, position + 1)[0]
+        if position + 5 > len(clx) or clx[position] != 0x02:
+            raise DocFormatError("нет таблицы фрагментов")
+        size = struct.unpack_from("<I", clx, position + 1)[0]
+        plc = clx[position + 5:position + 5 + size]
+        count = (len(plc) - 4) // 12
+        if count <= 0:
+            raise DocFormatError("пустая таблица фрагментов")
+        cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+        pieces = []
+        for i in range(count):
+            start, end = cps[i], min(cps[i + 1], self._ccp_text)
+            if start >= end:
+                continue
+            fc_value = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * i + 2)[0]
+            compressed = bool(fc_value & 0x40000000)
+            fc_value &= 0x3FFFFFFF
+            pieces.append((start, end, fc_value // 2 if compressed else fc_value, compressed))
+        return pieces
+
+    def _read_paragraphs(self) -> List[Paragraph]:
+        """Абзацы основного текста: поля заменяются их значениями, свойства
+        абзаца (в таблице, конец строки) берутся из PAPX по смещению символа конца"""
+        paragraphs = []
+        current: List[str] = []
+        fields: List[bool] = []
+        for start, end, offset, compressed in self._read_pieces():
+            width = 1 if compressed else 2
+            raw = self._word[offset:offset + (end - start) * width]
+            if len(raw) < (end - start) * width:
+                raise DocFormatError("фрагмент текста за пределами потока")
+            text = raw.decode("cp1252" if compressed else "utf-16-le", "replace")
+            position = 0
+            for match in SPECIAL_CHARS.finditer(text):
+                if all(fields):
+                    current.append(text[position:match.start()])
+                char = match.group()
+                if char == FIELD_BEGIN:
+                    fields.append(False)
+                elif char == FIELD_SEPARATOR:
+                    if fields:
+                        fields[-1] = True
+                elif char == FIELD_END:
+                    if fields:
+                        fields.pop()
+                else:
+                    paragraphs.append(self._paragraph(current, char, offset + match.start() * width))
+                    current = []
+                position = match.end()
+            if all(fields):
+                current.append(text[position:])
+        if current:
+            paragraphs.append(Paragraph("".join(current).translate(CLEAN_TEXT), ""))
+        return paragraphs
+
+    def _paragraph(self, parts: List[str], mark: str, fc: int) -> Paragraph:
+        sprms = self._paragraph_sprms(fc)
+        if SPRM_P_F_INNER_TABLE_CELL in sprms or SPRM_P_F_INNER_TTP in sprms or \
+                struct.unpack("<i", sprms.get(SPRM_P_ITAP, b"\0\0\0\0"))[0] > 1:
+            raise DocFormatError("вложенные таблицы")
+        in_table = sprms.get(SPRM_P_F_IN_TABLE, b"\0")[0] == 1
+        row_end = sprms.get(SPRM_P_F_TTP, b"\0")[0] == 1
+        return Paragraph("".join(parts).translate(CLEAN_TEXT), mark, in_table, row_end)
+
+    def _paragraph_sprms(self, fc: int) -> Dict[int, bytes]:
+        """Свойства абзаца, символ конца которого находится по смещению fc"""
+        bte_fc, bte_lcb = self._bte_papx
+        count = (bte_lcb - 4) // 8
+        if count <= 0:
+            return {}
+        if not hasattr(self, "_bte_fcs"):
+            plc = self._table[bte_fc:bte_fc + bte_lcb]
+            self._bte_fcs = struct.unpack_from(f"<{count + 1}I", plc, 0)
+            self._bte_pages = [pn & 0x3FFFFF for pn in struct.unpack_from(f"<{count}I", plc, 4 * (count + 1))]
+            self._fkps: Dict[int, Tuple[Tuple[int, ...], bytes]] = {}
+        index = bisect_right(self._bte_fcs, fc) - 1
+        if index < 0 or index >= count:
+            return {}
+        page_number = self._bte_pages[index]
+        if page_number not in self._fkps:
+            page = self._word[page_number * FKP_SIZE:(page_number + 1) * FKP_SIZE]
+            if len(page) < FKP_SIZE:
+                raise DocFormatError("страница свойств абзацев за пределами потока")
+            self._fkps[page_number] = (struct.unpack_from(f"<{page[-1] + 1}I", page, 0), page)
+        fcs, page = self._fkps[page_number]
+        run = bisect_right(fcs, fc) - 1
+        if run < 0 or run >= len(fcs) - 1:
+            return {}
+        papx = page[4 * len(fcs) + 13 * run] * 2
+        if papx == 0:
+            return {}
+        if page[papx]:
+            size, start = 2 * page[papx] - 1, papx + 1
+        else:
+            size, start = 2 * page[papx + 1], papx + 2
+        return parse_sprms(page[start + 2:start + size])
+
+    def _collect_tables(self) -> List[List[List[str]]]:
+        """Простые таблицы: ячейка заканчивается символом \\x07, строка - абзацем TTP"""
+        tables: List[List[List[str]]] = []
+        rows: List[List[str]] = []
+        cells: List[str] = []
+        cell: List[str] = []
+        for paragraph in self.paragraphs:
+            if not paragraph.in_table:
+                if rows or cells:
+                    tables.append(rows + ([cells] if cells else []))
+                    rows, cells, cell = [], [], []
+                continue
+            if paragraph.row_end:
+                rows.append(cells)
+                cells, cell = [], []
+            elif paragraph.mark == CELL_MARK:
+                cell.append(paragraph.text)
+                cells.append("\n".join(cell).strip())
+                cell = []
+            else:
+                cell.append(paragraph.text)
+        if rows or cells:
+            tables.append(rows + ([cells] if cells else []))
+        return tables
+
+
+def parse_sprms(grpprl: bytes) -> Dict[int, bytes]:
+    """Свойства (sprm) и их операнды"""
+    sprms = {}
+    position = 0
+    while position + 2 <= len(grpprl):
+        opcode = struct.unpack_from("<H", grpprl, position)[0]
+        position += 2
+        spra = opcode >> 13
+        if spra != 6:
+            size = SPRM_OPERAND_SIZES[spra]
+        elif opcode == SPRM_T_DEF_TABLE:
+            size = struct.unpack_from("<H", grpprl, position)[0] + 1
+        elif opcode == SPRM_P_CHG_TABS and position < len(grpprl) and grpprl[position] == 255:
+            raise DocFormatError("неподдерживаемое свойство табуляции")
+        else:
+            size = grpprl[position] + 1 if position < len(grpprl) else 1
+        sprms[opcode] = grpprl[position:position + size]
+        position += size
+    return sprms
+
+
+def read_summary(data: bytes) -> Dict[str, Any]:
+    """Автор и дата создания из потока SummaryInformation"""
+    metadata: Dict[str, Any] = {"author": "", "created": None}
+    if len(data) < 48:
+        return metadata
+    section = struct.unpack_from("<I", data, 44)[0]
+    if section + 8 > len(data):
+        return metadata
+    count = struct.unpack_from("<I", data, section + 4)[0]
+    offsets = {}
+    for i in range(min(count, (len(data) - section - 8) // 8)):
+        pid, offset = struct.unpack_from("<II", data, section + 8 + 8 * i)
+        offsets[pid] = section + offset
+
+    def value(pid: int) -> Tuple[int, int]:
+        offset = offsets.get(pid)
+        if offset is None or offset + 8 > len(data):
+            return 0, 0
+        return struct.unpack_from("<I", data, offset)[0] & 0xFFFF, offset + 4
+
+    kind, offset = value(PID_CODEPAGE)
+    codepage = struct.unpack_from("<H", data, offset)[0] if kind == VT_I2 else 1252
+    encoding = "utf-16-le" if codepage == 1200 else f"cp{codepage}"
+    kind, offset = value(PID_AUTHOR)
+    if kind == VT_LPSTR:
+        size = struct.unpack_from("<I", data, offset)[0]
+        raw = data[offset + 4:offset + 4 + size]
+        try:
+            metadata["author"] = raw.decode(encoding).split("\0")[0]
+        except (LookupError, UnicodeDecodeError):
+            metadata["author"] = raw.decode("cp1252", "replace").split("\0")[0]
+    kind, offset = value(PID_CREATE_DTM)
+    if kind == VT_FILETIME:
+        low, high = struct.unpack_from("<II", data, offset)
+        ticks = (high << 32) | low
+        if ticks:
+            metadata["created"] = datetime(1601, 1, 1) + timedelta(microseconds=ticks // 10)
+    return metadata
+
+
+def read_word_document(file_path: str) -> WordDocument:
+    """Разбор .doc; DocFormatError - документ нужно открыть Aspose"""
+    try:
+        return WordDocument(file_path)
+    except (struct.error, IndexError, KeyError, OverflowError) as e:
+        raise DocFormatError(f"поврежденная структура документа: {e}")
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar, Union
+
+import pytesseract
+from PIL import Image
+
+from parsers.cache import DiskCache
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_OCR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class OCRCache:
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_OCR_CACHE_MAX_BYTES) -> None:
+        self.store = DiskCache(directory, max_bytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image: Image.Image, lang: str, dpi: Optional[int] = None) -> str:
+        """Ключ: хэш пикселей растеризованной страницы, язык и DPI"""
+        digest = hashlib.sha256(f"{image.mode}|{image.size}|{lang}|{dpi}|".encode("utf-8"))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            data = self.store.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def set(self, key: str, text: str) -> None:
+        with self._lock:
+            self.store.set(key, text.encode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        return self.store.stats()
+
+
+_ocr_caches: Dict[str, OCRCache] = {}
+
+
+def get_ocr_cache(directory: str, max_bytes: Optional[int] = None) -> OCRCache:
+    """Общий для процесса кэш OCR для каталога (один на все документы и потоки)"""
+    directory = os.path.abspath(directory)
+    if directory not in _ocr_caches:
+        _ocr_caches[directory] = OCRCache(directory, max_bytes or DEFAULT_OCR_CACHE_MAX_BYTES)
+    return _ocr_caches[directory]
+
+
+def ocr_image(
+    image: Union[str, Image.Image],
+    lang: str,
+    cache: Optional[OCRCache] = None,
+    dpi: Optional[int] = None
+) -> str:
+    """Распознавание одного изображения страницы; повторяющаяся страница
+    (те же пиксели, язык и DPI) берется из кэша без запуска Tesseract"""
+    if cache is None:
+        return pytesseract.image_to_string(image, lang=lang)
+    if isinstance(image, str):
+        with Image.open(image) as opened:
+            return ocr_image(opened, lang, cache, dpi)
+    key = cache.key(image, lang, dpi)
+    text = cache.get(key)
+    if text is None:
+        text = pytesseract.image_to_string(image, lang=lang)
+        cache.set(key, text)
+    return text
+
+
+def tesseract_threads(workers: int) -> int:
+    """Число внутренних потоков Tesseract, при котором пул не превышает число ядер"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+@contextmanager
+def tesseract_thread_limit(workers: int) -> Iterator[None]:
+    """OMP_THREAD_LIMIT для процессов Tesseract на время работы пула.
+    Значение, заданное пользователем в окружении, не переопределяется."""
+    if workers <= 1 or "OMP_THREAD_LIMIT" in os.environ:
+        yield
+        return
+    os.environ["OMP_THREAD_LIMIT"] = str(tesseract_threads(workers))
+    try:
+        yield
+    finally:
+        os.environ.pop("OMP_THREAD_LIMIT", None)
+
+
+def map_pages(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int = 1,
+    max_in_flight: Optional[int] = None
+) -> Iterator[R]:
+    """Обработка страниц пулом потоков: порядок результатов совпадает с порядком
+    страниц, одновременно в работе не больше max_in_flight страниц"""
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    max_in_flight = max(1, max_in_flight or workers)
+    with tesseract_thread_limit(workers), ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,57 @@
+import datetime
+import json
+from typing import Any, Dict, IO, Iterable
+
+OUTPUT_FORMATS = ("text", "json", "jsonl")
+
+
+def json_default(value: Any) -> Any:
+    """Преобразование значений, которые json не сериализует сам"""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if hasattr(value, "item"):
+        # Скаляры numpy/pandas из ячеек таблиц
+        return value.item()
+    return str(value)
+
+
+def dump_record(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, default=json_default)
+
+
+class RecordWriter:
+    def __init__(self, stream: IO[str], output_format: str = "jsonl") -> None:
+        if output_format not in ("json", "jsonl"):
+            raise ValueError(f"Неизвестный формат вывода: {output_format}")
+        self.stream = stream
+        self.output_format = output_format
+        self.records = 0
+
+    def write_document(self, header: Dict[str, Any], records: Iterable[Dict[str, Any]]) -> int:
+        """Запись результата документа по мере получения записей: JSONL - строка на
+        запись, JSON - объект документа, массив records которого пишется по элементу.
+        Документ целиком в памяти не собирается."""
+        count = 0
+        if self.output_format == "jsonl":
+            source = header.get("source")
+            self._write(dump_record(dict({"type": "document"}, **header)) + "\n")
+            for record in records:
+                self._write(dump_record(dict(record, source=source)) + "\n")
+                count += 1
+        else:
+            self._write(dump_record(header)[:-1] + ', "records": [')
+            try:
+                for record in records:
+                    self._write(("\n" if count == 0 else ",\n") + dump_record(record))
+                    count += 1
+            finally:
+                # Документ закрывается и при ошибке извлечения, чтобы вывод оставался JSON
+                self._write("\n]}\n")
+        self.records += count
+        return count
+
+    def _write(self, chunk: str) -> None:
+        self.stream.write(chunk)
+        self.stream.flush()
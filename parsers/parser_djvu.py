@@ -1,22 +1,59 @@
+import io
 import subprocess
 import pytesseract
 from PIL import Image
-import os
 from subprocess import CalledProcessError
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-class DJVUProcessor:
-    def __init__(self, file_path: str, lang: str = "rus+eng") -> None:
+from parsers.base import BaseProcessor, PagesSpec, format_pages, select_pages
+from parsers.ocr import OCRCache, get_ocr_cache, map_pages, ocr_image
+
+class DJVUProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("text_content", "_extract_text", str),
+        "ocr": ("ocr_text", "_extract_text_ocr_if_needed", str),
+        "metadata": ("metadata", "_extract_metadata", str),
+    }
+    OUTPUT_OPTIONS = ("lang", "pages", "max_pages")
+    # 3 - страницы для OCR отрисовываются с разрешением OCR_DPI
+    VERSION = "3"
+    # Разрешение отрисовки страниц для OCR (как для PDF)
+    OCR_DPI = 300
+    STATE_ATTRIBUTES = ("is_valid", "image_count", "page_numbers", "ocr_pages", "ocr_page_texts")
+
+    def __init__(
+        self,
+        file_path: str,
+        lang: str = "rus+eng",
+        fields: Optional[Iterable[str]] = None,
+        pages: Optional[PagesSpec] = None,
+        max_pages: Optional[int] = None,
+        ocr_workers: int = 1,
+        ocr_max_pages_in_flight: Optional[int] = None,
+        ocr_cache_dir: Optional[str] = None,
+        ocr_cache_max_bytes: Optional[int] = None
+    ) -> None:
         self.file_path = file_path
         self.lang = lang
+        self.ocr_workers = max(1, ocr_workers)
+        # Отрисованные, но еще не распознанные страницы (изображения в памяти)
+        self.ocr_max_pages_in_flight = max(1, ocr_max_pages_in_flight or self.ocr_workers * 2)
+        self.ocr_pages: List[int] = []
+        self.ocr_page_texts: List[str] = []
+        self.ocr_cache: Optional[OCRCache] = (
+            get_ocr_cache(ocr_cache_dir, ocr_cache_max_bytes) if ocr_cache_dir else None
+        )
+        self.pages = pages
+        self.max_pages = max_pages
+        self.page_numbers: List[int] = []
+        self._page_spec: Optional[str] = None
         self.is_valid = self._validate_dependencies()
-        self.text_content = self._extract_text()
-        self.ocr_text = self._extract_text_ocr() if not self.text_content else ""
-        self.metadata = self._extract_metadata()
+        self._init_fields(fields)
         self.image_count = 0
 
     def _validate_dependencies(self) -> bool:
         """Проверка наличия необходимых утилит"""
-        required_tools = ["djvutxt", "ddjvu"]
+        required_tools = ["djvutxt", "ddjvu", "djvused"]
         missing = []
         for tool in required_tools:
             try:
@@ -28,13 +65,48 @@ class DJVUProcessor:
             return False
         return True
 
+    def _get_page_count(self) -> int:
+        """Число страниц документа"""
+        try:
+            result = subprocess.run(
+                ["djvused", "-e", "n", self.file_path],
+                capture_output=True,
+                text=True,
+                encoding="utf-8"
+            )
+            return int(result.stdout.strip())
+        except FileNotFoundError:
+            print("Ошибка: не найдена утилита djvused")
+            return 0
+        except ValueError:
+            print("Ошибка: не удалось определить число страниц")
+            return 0
+
+    def _selected_pages(self) -> List[int]:
+        """Номера обрабатываемых страниц (с 1); число страниц определяется один раз"""
+        if self._page_spec is None:
+            self.page_numbers = select_pages(self._get_page_count(), self.pages, self.max_pages)
+            self._page_spec = format_pages(self.page_numbers)
+        return self.page_numbers
+
+    def _page_args(self) -> Optional[List[str]]:
+        """Аргумент -page=... для djvutxt: [] - весь документ,
+        None - ни одна страница не попала в выбранный диапазон"""
+        if self.pages is None and self.max_pages is None:
+            return []
+        self._selected_pages()
+        return [f"-page={self._page_spec}"] if self._page_spec else None
+
     def _extract_text(self) -> str:
         """Извлечение текста"""
         if not self.is_valid:
             return ""
+        page_args = self._page_args()
+        if page_args is None:
+            return ""
         try:
             result = subprocess.run(
-                ["djvutxt", self.file_path],
+                ["djvutxt", *page_args, self.file_path],
                 capture_output=True,
                 text=True,
                 encoding="utf-8"
@@ -52,34 +124,67 @@ class DJVUProcessor:
             print(f"Непредвиденная ошибка извлечения текста: {str(e)}")
             return ""
 
+    def _extract_text_ocr_if_needed(self) -> str:
+        """OCR только для документов без текстового слоя (то же условие, что и при потоковой выдаче)"""
+        for _ in self._stream_ocr():
+            pass
+        return self.ocr_text
+
     def _extract_text_ocr(self) -> str:
-        """Извлечение текста с изображений"""
+        """Извлечение текста с изображений страниц"""
+        for _ in self._iter_ocr_records():
+            pass
+        return "\n".join(text.strip() for text in self.ocr_page_texts if text.strip())
+
+    def _stream_ocr(self) -> Iterator[Dict[str, Any]]:
+        """OCR для JSON/JSONL только для документов без текстового слоя:
+        запись выдается сразу после распознавания страницы"""
+        self.ocr_pages = []
+        self.ocr_page_texts = []
+        self.extract(["text"])
+        if not self.text_content:
+            yield from self._iter_ocr_records()
+        self.ocr_text = "\n".join(text.strip() for text in self.ocr_page_texts if text.strip())
+
+    def _iter_ocr_records(self) -> Iterator[Dict[str, Any]]:
+        """Постраничный OCR пулом потоков в порядке страниц; при ошибке результат OCR сбрасывается"""
+        self.ocr_pages = []
+        self.ocr_page_texts = []
         if not self.is_valid:
-            return ""
-        temp_image = "temp.tiff"
+            return
         try:
-            subprocess.run(["ddjvu", "-format=tiff", self.file_path, temp_image], check=True)
-            text = pytesseract.image_to_string(Image.open(temp_image), lang=self.lang)
-            return text.strip()
+            pages = self._selected_pages()
+            texts = map_pages(self._ocr_page, pages, self.ocr_workers, self.ocr_max_pages_in_flight)
+            for number, text in zip(pages, texts):
+                self.ocr_pages.append(number)
+                self.ocr_page_texts.append(text)
+                yield {"type": "ocr_page", "page": number, "text": text.strip()}
+            return
+
         except (PermissionError, IOError) as e:
             print(f"Ошибка доступа к файлам: {str(e)}")
-            return ""
+
         except CalledProcessError as e:
-            print(f"Ошибка конвертации в TIFF: {e.stderr.decode()}")
-            return ""           
+            print(f"Ошибка растеризации страницы: {(e.stderr or b'').decode(errors='replace')}")
+
         except pytesseract.TesseractError as e:
             print(f"Ошибка OCR: {e}")
-            return ""
+
         except Exception as e:
             print(f"Непредвиденная ошибка OCR: {str(e)}")
-            return ""
-        
-        finally:
-            if os.path.exists(temp_image):
-                try:
-                    os.remove(temp_image)
-                except PermissionError:
-                    print("Предупреждение: не удалось удалить временный файл")
+        self.ocr_pages = []
+        self.ocr_page_texts = []
+
+    def _ocr_page(self, number: int) -> str:
+        """Отрисовка одной страницы с разрешением OCR_DPI (ddjvu, PNM через канал -
+        без временных файлов) и OCR"""
+        result = subprocess.run(
+            ["ddjvu", "-format=pnm", f"-page={number}", f"-scale={self.OCR_DPI}", self.file_path, "-"],
+            capture_output=True,
+            check=True
+        )
+        with Image.open(io.BytesIO(result.stdout)) as image:
+            return ocr_image(image, self.lang, self.ocr_cache, self.OCR_DPI)
 
     def _extract_metadata(self) -> str:
         """Получение метаданных"""
@@ -103,15 +208,26 @@ class DJVUProcessor:
             print(f"Непредвиденная ошибка метаданных: {str(e)}")
             return ""
         
+    def _field_records(self, name: str, value: Any) -> Iterator[Dict[str, Any]]:
+        """OCR - по записи на страницу, остальные поля - как в базовом классе"""
+        if name == "ocr":
+            for number, text in zip(self.ocr_pages, self.ocr_page_texts):
+                yield {"type": "ocr_page", "page": number, "text": text.strip()}
+        else:
+            yield from super()._field_records(name, value)
+
     def print_results(self) -> None:
         print(f"Статус: {'Валиден' if self.is_valid else 'Ошибка зависимостей'}")
         
-        print("\nТекст документа:")
-        print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
+        if "text" in self.extracted_fields:
+            print("\nТекст документа:")
+            print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
         
         if self.ocr_text:
             print("\nТекст документа (OCR):")
+            print(f"Распознанные страницы: {', '.join(map(str, self.ocr_pages))}")
             print(self.ocr_text[:500] + "\n..." if len(self.ocr_text) > 500 else self.ocr_text)
             
-        print("\nМетаданные:")
-        print(self.metadata[:500] + "\n..." if len(self.metadata) > 500 else self.metadata)
\ No newline at end of file
+        if "metadata" in self.extracted_fields:
+            print("\nМетаданные:")
+            print(self.metadata[:500] + "\n..." if len(self.metadata) > 500 else self.metadata)
\ No newline at end of file
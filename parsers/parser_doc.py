@@ -1,29 +1,118 @@
-import aspose.words as aw
-from aspose.words import exceptions
-from typing import List, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, Union, Iterable
 
-class DOCProcessor:
-    def __init__(self, file_path: str) -> None:
+from parsers.base import BaseProcessor
+from parsers.msdoc import DocFormatError, WordDocument, read_word_document
+
+if TYPE_CHECKING:
+    import aspose.words as aw
+
+# Ошибки Aspose перехватываются при извлечении; модуль не импортирует Aspose до первого обращения
+FORMAT_ERRORS = (DocFormatError,)
+# Способы чтения: auto - встроенный разборщик, Aspose - для документов, которые он не читает;
+# native - только встроенный; aspose - только Aspose
+ENGINES = ("auto", "native", "aspose")
+# Профили загрузки: text - только то, что нужно для текста, таблиц и метаданных;
+# full - параметры Aspose по умолчанию
+LOAD_PROFILES = ("text", "full")
+
+
+def _aspose() -> Any:
+    """Модуль Aspose.Words (импорт занимает заметное время и нужен не для каждого документа)"""
+    import aspose.words as aw
+    return aw
+
+
+def normalize_text(text: str) -> str:
+    """Непустые строки без пробелов по краям"""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def text_load_options() -> "aw.loading.LoadOptions":
+    """Параметры загрузки для извлечения текста: без данных OLE-объектов и без
+    загрузки связанных изображений (INCLUDEPICTURE остается полем). Встроенные
+    изображения и фигуры загружаются, как и в профиле full"""
+    aw = _aspose()
+    options = aw.loading.LoadOptions()
+    options.ignore_ole_data = True
+    options.preserve_include_picture_field = True
+    return options
+
+
+class DOCProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("text_content", "_extract_text", str),
+        "tables": ("tables", "_extract_tables", list),
+        "metadata": ("metadata", "_extract_metadata", dict),
+    }
+    OUTPUT_OPTIONS = ("engine", "load_profile")
+    # 2 - текст без повторов абзацев (текстовый экспорт вместо обхода всех узлов);
+    # 3 - по умолчанию встроенный разборщик
+    VERSION = "3"
+    STATE_ATTRIBUTES = ("is_valid",)
+
+    def __init__(
+        self,
+        file_path: str,
+        fields: Optional[Iterable[str]] = None,
+        load_profile: str = "text",
+        engine: str = "auto"
+    ) -> None:
         self.file_path = file_path
-        self.doc = self._load_document()
-        self.text_content = self._extract_text()
-        self.tables = self._extract_tables()
-        self.metadata = self._extract_metadata()
+        if load_profile not in LOAD_PROFILES:
+            raise ValueError(f"Неизвестный профиль загрузки: {load_profile}. Доступны: {', '.join(LOAD_PROFILES)}")
+        if engine not in ENGINES:
+            raise ValueError(f"Неизвестный способ чтения: {engine}. Доступны: {', '.join(ENGINES)}")
+        self.load_profile = load_profile
+        self.engine = engine
+        self._doc: Optional["aw.Document"] = None
+        self._doc_loaded = False
+        self.native = self._load_native() if engine != "aspose" else None
+        # Aspose загружается, только если встроенный разборщик не прочитал документ
+        self.is_valid = self.native is not None or self.doc is not None
+        self._init_fields(fields)
+
+    @property
+    def doc(self) -> Optional["aw.Document"]:
+        """Документ Aspose; загружается при первом обращении (кроме режима native)"""
+        if not getattr(self, "_doc_loaded", False):
+            self._doc_loaded = True
+            self._doc = self._load_document() if getattr(self, "engine", "auto") != "native" else None
+        return self._doc
+
+    def _load_native(self) -> Optional[WordDocument]:
+        """Чтение встроенным разборщиком; None - документ нужно открыть Aspose"""
+        try:
+            return read_word_document(self.file_path)
+        except DocFormatError as e:
+            if self.engine == "native":
+                print(f"Ошибка: документ {self.file_path} не читается встроенным разборщиком: {e}")
+            return None
+        except FileNotFoundError:
+            if self.engine == "native":
+                print(f"Ошибка: файл {self.file_path} не найден")
+            return None
+        except OSError as e:
+            if self.engine == "native":
+                print(f"Ошибка чтения файла {self.file_path}: {e}")
+            return None
 
-    def _load_document(self) -> Optional[aw.Document]:
+    def _load_document(self) -> Optional["aw.Document"]:
         """Загрузка документа"""
+        aw = _aspose()
         try:
+            if self.load_profile == "text":
+                return aw.Document(self.file_path, text_load_options())
             return aw.Document(self.file_path)
-        except exceptions.FileCorruptedException:
+        except aw.FileCorruptedException:
             print(f"Ошибка: файл {self.file_path} поврежден")
             return None
-        except exceptions.UnsupportedFileFormatException:
+        except aw.UnsupportedFileFormatException:
             print(f"Ошибка: формат файла {self.file_path} не поддерживается")
             return None
         except FileNotFoundError:
             print(f"Ошибка: файл {self.file_path} не найден")
             return None 
-        except exceptions.IncorrectPasswordException:
+        except aw.IncorrectPasswordException:
             print("Ошибка: документ защищен паролем")
             return None
         except Exception as e:
@@ -32,15 +121,17 @@ class DOCProcessor:
 
     def _extract_text(self) -> str:
         """Извлечение текста"""
+        if self.native is not None:
+            return normalize_text(self.native.text)
         if not self.doc:
                 return ""        
         try:
-            return "\n".join(
-                node.get_text().strip() 
-                for node in self.doc.get_child_nodes(aw.NodeType.ANY, True)
-            )
+            # Текстовый экспорт документа: один проход, каждый абзац (и ячейка таблицы) -
+            # ровно один раз, поля - своими значениями. Обход всех узлов с get_text()
+            # повторял текст каждого абзаца на всех уровнях вложенности (раздел, тело, абзац, фрагмент)
+            return normalize_text(self.doc.to_string(_aspose().SaveFormat.TEXT))
                 
-        except exceptions.InvalidOperationException as e:
+        except RuntimeError as e:
                 print(f"Ошибка доступа к узлам документа: {e}")
                 return ""
                 
@@ -54,23 +145,25 @@ class DOCProcessor:
 
     def _extract_tables(self) -> List[List[List[str]]]:
         """Извлечение таблиц"""
+        if self.native is not None:
+            return self.native.tables
         if not self.doc:
             return []
         tables = []
         try:
-            for table in self.doc.get_child_nodes(aw.NodeType.TABLE, True):
+            for table in self.doc.get_child_nodes(_aspose().NodeType.TABLE, True):
                 rows = []
                 for row in table.as_table().rows:
                     try:
                         cells = [cell.get_text().strip() for cell in row.cells]
                         rows.append(cells)
-                    except exceptions.InvalidOperationException:
+                    except RuntimeError:
                         print("Пропущена поврежденная строка таблицы")
                         continue
                 tables.append(rows)
             return tables
             
-        except exceptions.InvalidNodeTypeException:
+        except RuntimeError:
             print("Ошибка: обнаружен неожиданный тип узла при обработке таблиц")
             return []
         
@@ -80,6 +173,8 @@ class DOCProcessor:
 
     def _extract_metadata(self) -> Dict[str, Union[str, int]]:
         """Получение метаданных"""
+        if self.native is not None:
+            return dict(self.native.metadata)
         if not self.doc:
             return {}
         try:
@@ -87,7 +182,7 @@ class DOCProcessor:
                 "author": self.doc.built_in_document_properties.author,
                 "created": self.doc.built_in_document_properties.created_time
             }
-        except exceptions.ArgumentOutOfRangeException:
+        except RuntimeError:
             print("Ошибка: недопустимое свойство документа")
             return {}
             
@@ -100,15 +195,18 @@ class DOCProcessor:
             return {}
 
     def print_results(self) -> None:
-        print("\nТекст документа:")
-        print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
+        if "text" in self.extracted_fields:
+            print("\nТекст документа:")
+            print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
         
-        print("\nТаблицы из документа:")
-        for i, table in enumerate(self.tables, 1):
-            print(f"Таблица {i}:")
-            for row in table:
-                print(" | ".join(row))
+        if "tables" in self.extracted_fields:
+            print("\nТаблицы из документа:")
+            for i, table in enumerate(self.tables, 1):
+                print(f"Таблица {i}:")
+                for row in table:
+                    print(" | ".join(row))
                 
-        print("\nМетаданные:")
-        for key, value in self.metadata.items():
-            print(f"{key}: {value}")
\ No newline at end of file
+        if "metadata" in self.extracted_fields:
+            print("\nМетаданные:")
+            for key, value in self.metadata.items():
+                print(f"{key}: {value}")
\ No newline at end of file
@@ -1,22 +1,55 @@
+import zipfile
+import zlib
 from docx import Document
-import xml.etree.ElementTree as ET
-from docx.exceptions import InvalidFileFormatError
-from typing import List, Dict, Optional, Union
+from docx.opc.exceptions import PackageNotFoundError
+from lxml import etree
+from typing import List, Dict, Optional, Tuple, Union, Iterable
 
-class DOCXProcessor:
-    def __init__(self, file_path: str) -> None:
+from parsers.base import BaseProcessor
+from parsers.docx_stream import check_package, read_body, read_core_properties
+
+FORMAT_ERRORS = (PackageNotFoundError,)
+
+class DOCXProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("text_content", "_extract_text", str),
+        "tables": ("tables", "_extract_tables", list),
+        "metadata": ("metadata", "_extract_metadata", dict),
+    }
+    STATE_ATTRIBUTES = ("is_valid",)
+
+    def __init__(self, file_path: str, fields: Optional[Iterable[str]] = None) -> None:
         self.file_path = file_path
-        self.doc = self._load_document()
+        self._doc: Optional[Document] = None
+        self._doc_loaded = False
+        self._body: Optional[Tuple[List[str], List[List[List[str]]]]] = None
+        # Если нужны текст или таблицы, синтаксис word/document.xml проверяется
+        # тем же потоковым проходом, которым они читаются
+        requested = set(self.FIELDS if fields is None else fields)
+        self._read_body_on_validate = bool({"text", "tables"} & requested)
         self.is_valid = self._validate_syntax()
-        self.text_content = self._extract_text()
-        self.tables = self._extract_tables()
-        self.metadata = self._extract_metadata()
+        self._init_fields(requested)
+
+    @property
+    def doc(self) -> Optional[Document]:
+        """Объектная модель python-docx; текст, таблицы и метаданные читаются
+        потоково без нее, документ загружается при первом обращении"""
+        if not getattr(self, "_doc_loaded", False):
+            self._doc_loaded = True
+            self._doc = self._load_document()
+        return self._doc
+
+    def _read_body(self) -> Tuple[List[str], List[List[List[str]]]]:
+        """Абзацы и таблицы за один потоковый проход по word/document.xml"""
+        if self._body is None:
+            self._body = read_body(self.file_path)
+        return self._body
 
     def _load_document(self) -> Optional[Document]:
         """Загрузка документа"""
         try:
             return Document(self.file_path)
-        except InvalidFileFormatError:
+        except PackageNotFoundError:
             print(f"Ошибка: файл {self.file_path} не является валидным DOCX")
             return None
             
@@ -33,16 +66,30 @@ class DOCXProcessor:
             return None
 
     def _validate_syntax(self) -> bool:
-        """Проверка XML-структуры документа"""
-        if not self.doc:
-            return False
+        """Проверка пакета и XML-структуры документа: части разбираются потоково,
+        без построения дерева и загрузки объектной модели"""
+        read_body_now = getattr(self, "_read_body_on_validate", False)
         try:
-            xml_str = self.doc._element.xml
-            ET.fromstring(xml_str)
+            check_package(self.file_path, check_main_part=not read_body_now)
+            if read_body_now:
+                self._read_body()
             return True
-        except ET.ParseError as e:
+        except (zipfile.BadZipFile, PackageNotFoundError):
+            print(f"Ошибка: файл {self.file_path} не является валидным DOCX")
+            return False
+        except FileNotFoundError:
+            print(f"Ошибка: файл {self.file_path} не найден")
+            return False
+        except PermissionError:
+            print("Ошибка доступа: недостаточно прав для чтения файла")
+            return False
+        except etree.XMLSyntaxError as e:
             print(f"XML ошибка: {e}")
             return False
+        except (zlib.error, EOFError, RuntimeError, NotImplementedError) as e:
+            # Поврежденный или неподдерживаемый поток сжатия части пакета
+            print(f"Ошибка: поврежденный архив DOCX: {e}")
+            return False
 
     def _extract_text(self) -> str:
         """Извлечение текста"""
@@ -50,9 +97,9 @@ class DOCXProcessor:
             return ""
             
         try:
-            return "\n".join(para.text for para in self.doc.paragraphs)
-            
-        except AttributeError:
+            return "\n".join(self._read_body()[0])
+
+        except (KeyError, zipfile.BadZipFile, etree.XMLSyntaxError):
             print("Ошибка: документ не содержит параграфов")
             return ""
         
@@ -65,21 +112,12 @@ class DOCXProcessor:
         if not self.is_valid:
             return []
             
-        tables = []
         try:
-            for table in self.doc.tables:
-                rows = []
-                for row in table.rows:
-                    try:
-                        cells = [cell.text.strip() for cell in row.cells]
-                        rows.append(cells)
-                    except (AttributeError, IndexError):
-                        print("Пропущена поврежденная строка таблицы")
-                        continue
-                tables.append(rows)
-            return tables
-            
-        except AttributeError:
+            # Строки таблиц собираются из XML напрямую: row.cells в python-docx
+            # на каждой строке заново вычисляет сетку и объединения ячеек
+            return self._read_body()[1]
+
+        except (KeyError, zipfile.BadZipFile, etree.XMLSyntaxError):
             print("Ошибка: неожиданная структура таблиц")
             return []
         except Exception as e:
@@ -91,13 +129,8 @@ class DOCXProcessor:
         if not self.is_valid:
             return {}
         try:
-            core = self.doc.core_properties
-            return {
-                "author": core.author,
-                "created": core.created,
-                "modified": core.modified
-            }
-        except AttributeError:
+            return read_core_properties(self.file_path)
+        except (KeyError, zipfile.BadZipFile, etree.XMLSyntaxError, AttributeError):
             print("Предупреждение: метаданные отсутствуют")
             return {}
         except Exception as e:
@@ -107,15 +140,18 @@ class DOCXProcessor:
     def print_results(self) -> None:
         print(f"XML-структура: {'Валидна' if self.is_valid else 'Ошибка'}")
         
-        print("\nТекст документа:")
-        print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
+        if "text" in self.extracted_fields:
+            print("\nТекст документа:")
+            print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
         
-        print("\nТаблицы из документа:")
-        for i, table in enumerate(self.tables, 1):
-            print(f"Таблица {i}:")
-            for row in table:
-                print(" | ".join(row))
+        if "tables" in self.extracted_fields:
+            print("\nТаблицы из документа:")
+            for i, table in enumerate(self.tables, 1):
+                print(f"Таблица {i}:")
+                for row in table:
+                    print(" | ".join(row))
                 
-        print("\nМетаданные:")
-        for key, value in self.metadata.items():
-            print(f"{key}: {value}")
\ No newline at end of file
+        if "metadata" in self.extracted_fields:
+            print("\nМетаданные:")
+            for key, value in self.metadata.items():
+                print(f"{key}: {value}")
\ No newline at end of file
@@ -1,52 +1,262 @@
-import requests
 from bs4 import BeautifulSoup, FeatureNotFound
-from typing import List, Dict, Union
+from typing import Any, List, Dict, Union, Iterable, Iterator, Optional, Set, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+import requests
 from requests.exceptions import RequestException, ConnectionError, Timeout, HTTPError
 
-class WebPageProcessor:
-    def __init__(self, url: str) -> None:
+from parsers.base import BaseProcessor
+from parsers.cache import ResultCache, get_result_cache
+from parsers.fetch import DEFAULT_MAX_BYTES, Fetcher, ResponseTooLarge, get_fetcher, iter_content, read_content
+from parsers.html_walker import (
+    HTML_BACKENDS, IncrementalParser, PageCollector, available_backends, default_backend, parse_with_target,
+    soup_features, walk_soup
+)
+
+NETWORK_ERRORS = (RequestException,)
+
+
+def local_path(url: str) -> Optional[str]:
+    """Путь к локальному файлу (путь или file://); None - адрес страницы в сети"""
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return url2pathname(parsed.path)
+    if parsed.scheme and parsed.netloc:
+        return None
+    return url
+
+
+def network_error_message(url: str, error: RequestException) -> str:
+    """Сообщение о сетевой ошибке загрузки страницы"""
+    if isinstance(error, ConnectionError):
+        return f"Ошибка подключения к {url}"
+    if isinstance(error, Timeout):
+        return f"Таймаут при загрузке {url}"
+    if isinstance(error, ResponseTooLarge):
+        return f"Страница {url} слишком большая: {str(error)}"
+    if isinstance(error, HTTPError) and error.response is not None:
+        return f"HTTP ошибка {error.response.status_code}: {error.response.reason}"
+    return f"Непредвиденная сетевая ошибка: {str(error)}"
+
+
+class WebPageProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("full_text", "_extract_full_text", str),
+        "images": ("images", "_extract_images", list),
+        "tables": ("tables", "_extract_tables", list),
+        "metadata": ("meta_tags", "_extract_meta_tags", dict),
+        "links": ("links", "_extract_links", list),
+    }
+
+    OUTPUT_OPTIONS = ("backend",)
+    STATE_ATTRIBUTES = ("http_validators",)
+    # Значения для обработчика из кэша результатов (создается без __init__)
+    content: Optional[bytes] = None
+    not_modified = False
+    from_cache = False
+    http_cache: Optional[ResultCache] = None
+
+    def __init__(
+        self,
+        url: str,
+        fields: Optional[Iterable[str]] = None,
+        backend: Optional[str] = None,
+        fetcher: Optional[Fetcher] = None,
+        content: Optional[bytes] = None,
+        response: Optional[requests.Response] = None,
+        http_cache_dir: Optional[str] = None,
+        http_cache_max_bytes: Optional[int] = None,
+        max_page_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        incremental: bool = False
+    ) -> None:
         self.url = url
-        self.soup = self._load_page()
-        self.full_text = self._extract_full_text()
-        self.images = self._extract_images()
-        self.tables = self._extract_tables()
-        self.meta_tags = self._extract_meta_tags()
-        self.links = self._extract_links()
-
-    def _load_page(self) -> BeautifulSoup:
-        """Загрузка страницы html"""
-        try:
-            response = requests.get(self.url, timeout=10)
-            response.raise_for_status()
+        # Локальный файл (сохраненная страница, зеркало сайта) читается с диска без HTTP
+        self.local_path = local_path(url) if content is None and response is None else None
+        # Загрузчик с пулом соединений и повторами (для локального файла не создается);
+        # content - уже загруженная страница, response - ответ, с которым она получена
+        # (для заголовков и кода 304)
+        self.fetcher: Optional[Fetcher] = fetcher
+        if self.local_path is None and self.fetcher is None:
+            self.fetcher = get_fetcher()
+        # Страница загружается потоком; больше max_page_bytes (0 - без ограничения) не читается.
+        # incremental - разбор частей по мере загрузки (только для lxml-target)
+        self.max_page_bytes = max_page_bytes
+        self.incremental = incremental
+        # Способ разбора: по умолчанию самый быстрый из установленных
+        self.backend = backend or default_backend()
+        if self.backend not in HTML_BACKENDS:
+            raise ValueError(f"Неизвестный способ разбора HTML: {self.backend}. Доступны: {', '.join(HTML_BACKENDS)}")
+        if self.backend not in available_backends():
+            raise ValueError(f"Способ разбора HTML {self.backend} недоступен: не установлен lxml")
+        self._soup: Optional[BeautifulSoup] = None
+        # Без заранее запрошенных полей (fields=None или ленивое извлечение)
+        # первый обход собирает все поля
+        self._requested = self.http_cache_fields(fields)
+        self._page: Dict[str, Any] = {}
+        # HTTP-кэш: результат разбора хранится вместе с ETag/Last-Modified страницы;
+        # если сервер отвечает 304, страница не скачивается и не разбирается заново
+        self.http_validators: Dict[str, str] = {}
+        self.not_modified = False
+        self.http_cache: Optional[ResultCache] = None
+        self._http_key: Optional[str] = None
+        self._http_entry: Optional[Dict[str, Any]] = None
+        prefetched = content is not None and response is None
+        if http_cache_dir and not prefetched and self.local_path is None:
+            self.http_cache = get_result_cache(http_cache_dir, http_cache_max_bytes)
+            self._http_key, self._http_entry = self.http_cache_entry(self.http_cache, url, self._requested, self.backend)
+        if self.local_path is not None:
+            self.content = self._load_file(self.local_path)
+        else:
+            self.content = content if prefetched else self._load_page(response, content)
+        if self.not_modified:
+            self._restore_state(self._http_entry)
+            return
+        self._init_fields(fields)
+        self._store_http_cache()
+
+    @classmethod
+    def http_cache_fields(cls, fields: Optional[Iterable[str]]) -> Set[str]:
+        """Поля первого обхода страницы и записи HTTP-кэша: по ним же строятся
+        условные заголовки, чтобы ответ 304 всегда имел сохраненный результат"""
+        return set(fields or cls.FIELDS)
+
+    @classmethod
+    def http_cache_entry(
+        cls,
+        http_cache: ResultCache,
+        url: str,
+        fields: Iterable[str],
+        backend: Optional[str] = None,
+        count: bool = True
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Ключ HTTP-кэша страницы и сохраненный результат (если в нем есть нужные поля)"""
+        key = http_cache.url_key(url, cls, {"backend": backend or default_backend()})
+        return key, http_cache.load(key, [name for name in fields if name in cls.FIELDS], count)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Заголовки условного запроса по сохраненным ETag и Last-Modified"""
+        validators = (entry or {}).get("http_validators") or {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def _store_http_cache(self) -> None:
+        """Сохранение результата разбора вместе с валидаторами ответа"""
+        if self.http_cache is None or self.content is None or not self.http_validators:
+            return
+        if self.extracted_fields:
+            # Запись содержит все поля первого обхода (они уже собраны), иначе
+            # следующий запрос по тем же полям не найдет ее
+            self.extract(self._requested)
+            self.http_cache.save(self._http_key, self.cache_state())
+
+    def iter_records(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        yield from super().iter_records(fields)
+        if not self.not_modified:
+            self._store_http_cache()
+
+    @classmethod
+    def from_cache_state(cls, file_path: str, state: Dict[str, Any]) -> "WebPageProcessor":
+        processor = super().from_cache_state(file_path, state)
+        processor.url = file_path
+        processor.from_cache = True
+        return processor
+
+    def is_cacheable(self) -> bool:
+        # В кэш результатов попадают только прочитанные без ошибок страницы
+        return self.content is not None or self.not_modified or self.from_cache
+
+    @property
+    def soup(self) -> Optional[BeautifulSoup]:
+        """Дерево BeautifulSoup; для lxml-target строится только при обращении"""
+        if self._soup is None and self.content is not None:
+            features = soup_features(self.backend)
             try:
-                return BeautifulSoup(response.content, "html.parser")
+                self._soup = BeautifulSoup(self.content, features)
             except FeatureNotFound:
-                print("Ошибка: не найден парсер 'html.parser'")
-                return None
-                
-        except ConnectionError:
-            print(f"Ошибка подключения к {self.url}")
-            return None
-            
-        except Timeout:
-            print(f"Таймаут при загрузке {self.url}")
-            return None
-            
-        except HTTPError as e:
-            print(f"HTTP ошибка {e.response.status_code}: {e.response.reason}")
-            return None
+                print(f"Ошибка: не найден парсер '{features}'")
+        return self._soup
+
+    def _load_page(
+        self,
+        response: Optional[requests.Response] = None,
+        content: Optional[bytes] = None
+    ) -> Optional[bytes]:
+        """Загрузка страницы html (response - уже полученный ответ, content - его тело)"""
+        try:
+            if response is None:
+                headers = self.conditional_headers(self._http_entry)
+                response = self.fetcher.get(self.url, headers=headers, stream=True)
+            if response.status_code == 304:
+                response.close()
+                if self._http_entry is not None:
+                    self.not_modified = True
+                    return None
+                # 304 без сохраненного результата: страница запрашивается заново
+                # без условных заголовков, пустое тело ответа не разбирается
+                response = self.fetcher.get(self.url, stream=True)
+                content = None
+                if response.status_code == 304:
+                    response.close()
+                    print(f"Ошибка: ответ 304 без условного запроса для {self.url}")
+                    return None
+            self.http_validators = {
+                name: value for name, value in (
+                    ("etag", response.headers.get("ETag")),
+                    ("last_modified", response.headers.get("Last-Modified")),
+                ) if value
+            }
+            return content if content is not None else self._read_page(response)
             
         except RequestException as e:
-            print(f"Непредвиденная сетевая ошибка: {str(e)}")
+            print(network_error_message(self.url, e))
             return None
 
+    def _load_file(self, path: str) -> Optional[bytes]:
+        """Чтение локального файла html"""
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            print(f"Файл {path} не найден")
+        except OSError as e:
+            print(f"Ошибка чтения файла {path}: {str(e)}")
+        return None
+
+    def _read_page(self, response: requests.Response) -> bytes:
+        """Чтение тела ответа; при разборе по частям поля собираются во время загрузки"""
+        if not (self.incremental and self.backend == "lxml-target"):
+            return read_content(response, self.max_page_bytes)
+        parser = IncrementalParser(PageCollector(self._requested))
+        chunks = []
+        for chunk in iter_content(response, self.max_page_bytes):
+            chunks.append(chunk)
+            parser.feed(chunk)
+        self._page = parser.close()
+        return b"".join(chunks)
+
+    def _collect(self, field: str) -> Any:
+        """Поле из однопроходного обхода страницы: за один обход собираются
+        все запрошенные и еще не извлеченные поля"""
+        if field not in self._page:
+            collector = PageCollector(({field} | self._requested) - self.extracted_fields)
+            if self.backend == "lxml-target":
+                self._page = parse_with_target(self.content, collector)
+            else:
+                self._page = walk_soup(self.soup, collector)
+        return self._page[field]
+
     def _extract_full_text(self) -> str:
         """Извлечение текста"""
-        if not self.soup:
+        if self.content is None:
             return ""
             
         try:
-            return self.soup.get_text(separator="\n", strip=True)
+            return self._collect("text")
             
         except AttributeError:
             print("Ошибка: неожиданная структура HTML")
@@ -57,16 +267,11 @@ class WebPageProcessor:
 
     def _extract_images(self) -> List[Dict[str, str]]:
         """Извлечение изображений"""
-        if not self.soup:
+        if self.content is None:
             return []
             
-        images = []
         try:
-            for img in self.soup.find_all("img"):
-                src = img.get("src", "")
-                alt = img.get("alt", "No alt text")
-                images.append({"src": src, "alt": alt})
-            return images
+            return self._collect("images")
             
         except AttributeError:
             print("Ошибка: неожиданная структура тега img")
@@ -77,28 +282,11 @@ class WebPageProcessor:
 
     def _extract_tables(self) -> List[Dict[str, Union[List[str], List[List[str]]]]]:
         """Извлечение таблиц"""
-        if not self.soup:
+        if self.content is None:
             return []
             
-        tables = []
         try:
-            for table in self.soup.find_all("table"):
-                headers = []
-                rows = []
-                try:
-                    headers = [th.text.strip() for th in table.find_all("th")]
-                except AttributeError:
-                    print("Предупреждение: пропущены заголовки таблицы")
-                    
-                for row in table.find_all("tr"):
-                    try:
-                        cells = [td.text.strip() for td in row.find_all("td")]
-                        rows.append(cells)
-                    except AttributeError:
-                        print("Пропущена поврежденная строка таблицы")
-                        continue
-                tables.append({"headers": headers, "rows": rows})
-            return tables
+            return self._collect("tables")
             
         except AttributeError:
             print("Ошибка: неожиданная структура таблицы")
@@ -109,17 +297,11 @@ class WebPageProcessor:
 
     def _extract_meta_tags(self) -> Dict[str, str]:
         """Извлечние метаданных"""
-        if not self.soup:
+        if self.content is None:
             return {}
             
-        meta_tags = {}
         try:
-            for meta in self.soup.find_all("meta"):
-                name = meta.get("name") or meta.get("property")
-                content = meta.get("content")
-                if name and content:
-                    meta_tags[name] = content
-            return meta_tags
+            return self._collect("metadata")
             
         except AttributeError:
             print("Ошибка: неожиданная структура meta-тегов")
@@ -130,16 +312,11 @@ class WebPageProcessor:
 
     def _extract_links(self) -> List[Dict[str, str]]:
         """Извлечение ссылок"""
-        if not self.soup:
+        if self.content is None:
             return []
             
-        links = []
         try:
-            for a in self.soup.find_all("a", href=True):
-                text = a.text.strip()
-                url = a.get("href", "")
-                links.append({"text": text, "url": url})
-            return links
+            return self._collect("links")
             
         except AttributeError:
             print("Ошибка: неожиданная структура ссылок")
@@ -149,8 +326,13 @@ class WebPageProcessor:
             return []
 
     def print_results(self) -> None:
-        print(self.full_text[:500] + "\n..." if len(self.full_text) > 500 else self.full_text)
-        print("\nИзображения:", self.images)
-        print("\nТаблицы:", self.tables)
-        print("\nМетаданные:", self.meta_tags)
-        print("\nСсылки:", self.links)
\ No newline at end of file
+        if "text" in self.extracted_fields:
+            print(self.full_text[:500] + "\n..." if len(self.full_text) > 500 else self.full_text)
+        if "images" in self.extracted_fields:
+            print("\nИзображения:", self.images)
+        if "tables" in self.extracted_fields:
+            print("\nТаблицы:", self.tables)
+        if "metadata" in self.extracted_fields:
+            print("\nМетаданные:", self.meta_tags)
+        if "links" in self.extracted_fields:
+            print("\nСсылки:", self.links)
\ No newline at end of file
@@ -1,31 +1,95 @@
 import PyPDF2
-from PyPDF2.errors import PdfReadError, PageRangeError
+from PyPDF2.errors import PdfReadError, EmptyFileError
 from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError
-from tabula.io import TabulaError
+from tabula.errors import CSVParseError, JavaNotFoundError
 from pytesseract import TesseractNotFoundError
 from pdf2image import convert_from_path
-import pytesseract
-import tabula
 import pandas as pd
-from typing import List
+import contextlib
+import os
+import tempfile
+import threading
+import unicodedata
+from typing import Any, BinaryIO, Dict, List, Iterable, Iterator, Optional, Tuple
 
-class PDFProcessor:
-    def __init__(self, file_path: str) -> None:
+from parsers.base import BaseProcessor, PagesSpec, select_pages
+from parsers.ocr import OCRCache, get_ocr_cache, map_pages, ocr_image
+from parsers.tables import TableExtractor, get_table_extractor
+
+FORMAT_ERRORS = (PdfReadError,)
+
+# Категории Unicode, которые в текстовом слое означают "мусор": управляющие,
+# неназначенные, суррогатные символы и символы частного использования
+GARBAGE_CATEGORIES = {"Cc", "Cn", "Co", "Cs"}
+
+class PDFProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("text_content", "_extract_text", str),
+        "ocr": ("ocr_text", "_extract_text_from_images", str),
+        "tables": ("tables", "_extract_tables", list),
+    }
+    OUTPUT_OPTIONS = ("pages", "max_pages")
+    # 3 - результаты с ошибкой извлечения текста страницы больше не сохраняются
+    VERSION = "3"
+    STATE_ATTRIBUTES = ("is_valid", "page_count", "page_numbers", "page_texts", "ocr_pages", "ocr_page_texts")
+    # Страница отправляется на OCR, если в ее текстовом слое меньше OCR_MIN_CHARS
+    # значимых символов или доля мусорных символов больше OCR_MAX_GARBAGE_RATIO
+    OCR_MIN_CHARS = 20
+    OCR_MAX_GARBAGE_RATIO = 0.3
+
+    def __init__(
+        self,
+        file_path: str,
+        fields: Optional[Iterable[str]] = None,
+        ocr_workers: int = 1,
+        ocr_window: int = 8,
+        ocr_max_pages_in_flight: Optional[int] = None,
+        table_extractor: Optional[TableExtractor] = None,
+        pages: Optional[PagesSpec] = None,
+        max_pages: Optional[int] = None,
+        ocr_cache_dir: Optional[str] = None,
+        ocr_cache_max_bytes: Optional[int] = None
+    ) -> None:
         self.file_path = file_path
+        # Подмножество страниц ("1-3,7" или список номеров с 1), которое
+        # учитывают все этапы: текст, OCR и Tabula
+        self.pages = pages
+        self.max_pages = max_pages
+        self.page_count = 0
+        self.page_numbers: List[int] = []
+        self.table_extractor = table_extractor or get_table_extractor()
+        self.ocr_workers = max(1, ocr_workers)
+        # Растеризованные, но еще не распознанные страницы ограничены
+        # ocr_max_pages_in_flight независимо от длины документа
+        self.ocr_max_pages_in_flight = max(1, ocr_max_pages_in_flight or self.ocr_workers * ocr_window)
+        self.ocr_window = max(1, min(ocr_window, self.ocr_max_pages_in_flight))
+        self.ocr_pages: List[int] = []
+        self.ocr_page_texts: List[str] = []
+        self.ocr_cache: Optional[OCRCache] = (
+            get_ocr_cache(ocr_cache_dir, ocr_cache_max_bytes) if ocr_cache_dir else None
+        )
+        # Текстовый слой страниц извлекается при первом запросе text или ocr
+        self.page_texts: Optional[List[str]] = None
+        self.failed_pages: List[int] = []
+        self._reader: Optional[PyPDF2.PdfReader] = None
+        self._reader_file: Optional[BinaryIO] = None
         self.is_valid = self._validate_pdf_syntax()
-        self.text_content = self._extract_text()
-        self.ocr_text = self._extract_text_from_images()
-        self.tables = self._extract_tables()
+        try:
+            self._init_fields(fields)
+        finally:
+            self._close_reader()
 
     def _validate_pdf_syntax(self) -> bool:
-        """Проверка целостности"""
+        """Проверка целостности: чтение структуры и числа страниц. Открытый файл
+        остается до конца извлечения полей конструктора, чтобы текст (если он
+        запрошен) читался за этот же проход"""
         try:
-            with open(self.file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                if reader.is_encrypted:
-                    raise ValueError("Файл зашифрован")
-                for page in reader.pages:
-                    page.extract_text()
+            self._reader_file = open(self.file_path, "rb")
+            self._reader = PyPDF2.PdfReader(self._reader_file)
+            if self._reader.is_encrypted:
+                raise ValueError("Файл зашифрован")
+            self.page_count = len(self._reader.pages)
+            self.page_numbers = select_pages(self.page_count, self.pages, self.max_pages)
             return True
         except FileNotFoundError:
             print(f"Ошибка: файл {self.file_path} не найден")
@@ -35,89 +99,197 @@ class PDFProcessor:
             print("Ошибка доступа: недостаточно прав для чтения файла")
             return False
             
-        except PdfReadError as e:
-            print(f"Ошибка структуры PDF: {str(e)}")
+        except EmptyFileError:
+            print("Ошибка: документ не содержит страниц")
             return False
             
-        except PageRangeError:
-            print("Ошибка: документ не содержит страниц")
+        except PdfReadError as e:
+            print(f"Ошибка структуры PDF: {str(e)}")
             return False
         
         except Exception as e:
             print(f"Непредвиденная ошибка валидации: {str(e)}")
             return False
 
-    def _extract_text(self) -> str:
-        """Извлечение текста"""
-        if not self.is_valid:
-            return ""
-            
+    def _close_reader(self) -> None:
+        self._reader = None
+        if self._reader_file is not None:
+            self._reader_file.close()
+            self._reader_file = None
+
+    def _load_page_texts(self) -> List[str]:
+        """Текстовый слой выбранных страниц: один проход по документу при первом
+        запросе text или ocr (открытым при валидации файлом, если он еще не закрыт).
+        Страница, текст которой не извлекся, остается пустой (и уходит на OCR)"""
+        if self.page_texts is not None:
+            return self.page_texts
+        self.page_texts = []
+        self.failed_pages = []
         try:
-            text = ""
-            with open(self.file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-            return text.strip()
-            
-        except PdfReadError:
-            print("Ошибка чтения PDF при извлечении текста")
-            return ""
-            
-        except PageRangeError:
-            print("Ошибка: неожиданный диапазон страниц")
-            return ""
-            
+            with contextlib.ExitStack() as stack:
+                # Восстановленный из кэша объект создается без __init__
+                reader = getattr(self, "_reader", None)
+                if reader is None:
+                    reader = PyPDF2.PdfReader(stack.enter_context(open(self.file_path, "rb")))
+                for number in self.page_numbers:
+                    self.page_texts.append(self._page_text(reader, number))
+        except (OSError, PdfReadError) as e:
+            print(f"Ошибка извлечения текста: {str(e)}")
         except Exception as e:
             print(f"Непредвиденная ошибка извлечения текста: {str(e)}")
+        for number in self.page_numbers[len(self.page_texts):]:
+            self.page_texts.append("")
+            self.failed_pages.append(number)
+        return self.page_texts
+
+    def _page_text(self, reader: PyPDF2.PdfReader, number: int) -> str:
+        """Текстовый слой одной страницы; при ошибке - пустая строка"""
+        try:
+            return reader.pages[number - 1].extract_text() or ""
+        except Exception as e:
+            print(f"Ошибка извлечения текста страницы {number}: {str(e)}")
+            self.failed_pages.append(number)
             return ""
 
-    def _extract_text_from_images(self, dpi: int = 300, lang: str = "rus+eng") -> str:
-        """Извлечение такста (OCR)"""
+    def is_cacheable(self) -> bool:
+        # Результат с ошибками извлечения отдельных страниц не кэшируется
+        return super().is_cacheable() and not getattr(self, "failed_pages", [])
+
+    def _extract_text(self) -> str:
+        """Извлечение текста"""
         if not self.is_valid:
             return ""
+        return "".join(self._load_page_texts()).strip()
+
+    def _page_needs_ocr(self, text: str) -> bool:
+        """Проверка пригодности текстового слоя страницы"""
+        chars = [ch for ch in text if not ch.isspace()]
+        if len(chars) < self.OCR_MIN_CHARS:
+            return True
+        garbage = sum(
+            1 for ch in chars
+            if ch == "\ufffd" or unicodedata.category(ch) in GARBAGE_CATEGORIES
+        )
+        return garbage / len(chars) > self.OCR_MAX_GARBAGE_RATIO
+
+    def _extract_text_from_images(self, dpi: int = 300, lang: str = "rus+eng") -> str:
+        """Извлечение такста (OCR) страниц без пригодного текстового слоя"""
+        for _ in self._iter_ocr_records(dpi, lang):
+            pass
+        return "\n".join(self.ocr_page_texts).strip()
+
+    def _stream_ocr(self) -> Iterator[Dict[str, Any]]:
+        """OCR для JSON/JSONL: запись выдается сразу после распознавания страницы"""
+        yield from self._iter_ocr_records()
+        self.ocr_text = "\n".join(self.ocr_page_texts).strip()
+
+    def _iter_ocr_records(self, dpi: int = 300, lang: str = "rus+eng") -> Iterator[Dict[str, Any]]:
+        """Постраничный OCR в порядке страниц; при ошибке результат OCR сбрасывается"""
+        self.ocr_pages = []
+        self.ocr_page_texts = []
+        if not self.is_valid:
+            return
             
+        pages = [
+            number for number, text in zip(self.page_numbers, self._load_page_texts())
+            if self._page_needs_ocr(text)
+        ]
         try:
-            images = convert_from_path(self.file_path, dpi=dpi)
-            return "\n".join(
-                pytesseract.image_to_string(img, lang=lang) for img in images
-            ).strip()
+            with tempfile.TemporaryDirectory(prefix="pdf_ocr_") as output_folder:
+                # Окно растеризуется, только когда для всех его страниц есть место:
+                # отрисованных, но не распознанных файлов не больше ocr_max_pages_in_flight
+                slots = threading.Semaphore(self.ocr_max_pages_in_flight)
+                rendered = self._iter_rendered_pages(pages, output_folder, slots, dpi)
+                results = map_pages(
+                    lambda page: (page[0], self._ocr_page_file(page[1], slots, dpi, lang)),
+                    rendered,
+                    self.ocr_workers,
+                    self.ocr_max_pages_in_flight
+                )
+                for number, text in results:
+                    self.ocr_pages.append(number)
+                    self.ocr_page_texts.append(text)
+                    yield {"type": "ocr_page", "page": number, "text": text.strip()}
+            return
             
         except PDFInfoNotInstalledError:
             print("Ошибка: не установлен poppler")
-            return ""
             
         except PDFPageCountError as e:
             print(f"Ошибка определения количества страниц: {e}")
-            return ""
             
         except TesseractNotFoundError:
             print("Ошибка: не найден Tesseract OCR")
-            return ""
             
         except Exception as e:
             print(f"Непредвиденная ошибка OCR: {str(e)}")
-            return ""
+        self.ocr_pages = []
+        self.ocr_page_texts = []
+
+    def _iter_page_windows(self, pages: List[int]) -> Iterator[List[int]]:
+        """Группировка страниц в окна подряд идущих номеров не длиннее ocr_window"""
+        window: List[int] = []
+        for number in pages:
+            if window and (number != window[-1] + 1 or len(window) >= self.ocr_window):
+                yield window
+                window = []
+            window.append(number)
+        if window:
+            yield window
+
+    def _iter_rendered_pages(
+        self,
+        pages: List[int],
+        output_folder: str,
+        slots: threading.Semaphore,
+        dpi: int
+    ) -> Iterator[Tuple[int, str]]:
+        """Растеризация окон подряд идущих страниц одним вызовом poppler; каждая
+        страница (номер, путь к файлу) дальше распознается отдельной задачей пула"""
+        for window in self._iter_page_windows(pages):
+            for _ in window:
+                slots.acquire()
+            paths = convert_from_path(
+                self.file_path,
+                dpi=dpi,
+                first_page=window[0],
+                last_page=window[-1],
+                output_folder=output_folder,
+                paths_only=True
+            )
+            for _ in range(len(window) - len(paths)):
+                slots.release()
+            yield from zip(window, paths)
+
+    def _ocr_page_file(self, path: str, slots: threading.Semaphore, dpi: int, lang: str) -> str:
+        """Распознавание растеризованной страницы; файл удаляется сразу после OCR"""
+        try:
+            return ocr_image(path, lang, self.ocr_cache, dpi)
+        finally:
+            slots.release()
+            with contextlib.suppress(OSError):
+                os.remove(path)
 
     def _extract_tables(self) -> List[pd.DataFrame]:
         """Извлечение таблиц"""
         if not self.is_valid:
             return []
             
+        if self.pages is None and self.max_pages is None:
+            pages = "all"
+        elif self.page_numbers:
+            pages = self.page_numbers
+        else:
+            return []
+            
         try:
-            tables = tabula.read_pdf(
-                self.file_path,
-                pages="all",
-                multiple_tables=True,
-                java_options="-Dfile.encoding=UTF8"
-            )
-            return [df for df in tables if not df.empty]
+            return self.table_extractor.read(self.file_path, pages=pages)
             
-        except FileNotFoundError:
+        except (FileNotFoundError, JavaNotFoundError):
             print("Ошибка: не найден Java Runtime для Tabula")
             return []
             
-        except TabulaError as e:
+        except CSVParseError as e:
             print(f"Ошибка извлечения таблиц: {e}")
             return []
             
@@ -125,16 +297,37 @@ class PDFProcessor:
             print(f"Непредвиденная ошибка таблиц: {str(e)}")
             return []
 
+    def _field_records(self, name: str, value: Any) -> Iterator[Dict[str, Any]]:
+        """Текст и OCR - по записи на страницу, остальные поля - как в базовом классе"""
+        if name == "text" and self.is_valid:
+            for number, text in zip(self.page_numbers, self._load_page_texts()):
+                yield {"type": "page", "page": number, "text": text.strip()}
+        elif name == "ocr":
+            for number, text in zip(self.ocr_pages, self.ocr_page_texts):
+                yield {"type": "ocr_page", "page": number, "text": text.strip()}
+        else:
+            yield from super()._field_records(name, value)
+
+    def _item_record(self, name: str, item: Any) -> Dict[str, Any]:
+        if isinstance(item, pd.DataFrame):
+            rows = item.astype(object).where(item.notna(), None)
+            return {"columns": [str(column) for column in item.columns], "rows": rows.values.tolist()}
+        return super()._item_record(name, item)
+
     def print_results(self) -> None:
         print(f"Статус: {'Валиден' if self.is_valid else 'Ошибка структуры'}")
         
-        print("\nТекст документа:")
-        print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
+        if "text" in self.extracted_fields:
+            print("\nТекст документа:")
+            print(self.text_content[:500] + "\n..." if len(self.text_content) > 500 else self.text_content)
         
-        print("\nТекст с документа (OCR):")
-        print(self.ocr_text[:500] + "\n..." if len(self.ocr_text) > 500 else self.ocr_text)
+        if "ocr" in self.extracted_fields:
+            print("\nТекст с документа (OCR):")
+            print(f"Распознанные страницы: {', '.join(map(str, self.ocr_pages)) or 'нет'}")
+            print(self.ocr_text[:500] + "\n..." if len(self.ocr_text) > 500 else self.ocr_text)
         
-        print("\nТаблицыиз докумета:")
-        for i, table in enumerate(self.tables, 1):
-            print(f"Таблица {i}:")
-            print(table.head().to_string() if not table.empty else "Пустая таблица")
\ No newline at end of file
+        if "tables" in self.extracted_fields:
+            print("\nТаблицыиз докумета:")
+            for i, table in enumerate(self.tables, 1):
+                print(f"Таблица {i}:")
+                print(table.head().to_string() if not table.empty else "Пустая таблица")
\ No newline at end of file
@@ -0,0 +1,49 @@
+import importlib
+from typing import Dict, Optional, Tuple, Type
+
+
+class ProcessorEntry:
+    def __init__(self, module: str, class_name: str) -> None:
+        self.module = module
+        self.class_name = class_name
+
+    def load(self) -> Type:
+        """Импорт модуля обработчика (и его библиотек) только при выборе формата"""
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+    def errors(self, name: str) -> Tuple[Type[BaseException], ...]:
+        """Исключения, объявленные модулем обработчика (FORMAT_ERRORS, NETWORK_ERRORS)"""
+        return tuple(getattr(importlib.import_module(self.module), name, ()))
+
+
+REGISTRY: Dict[str, ProcessorEntry] = {
+    ".html": ProcessorEntry("parsers.parser_html", "WebPageProcessor"),
+    ".htm": ProcessorEntry("parsers.parser_html", "WebPageProcessor"),
+    ".pdf": ProcessorEntry("parsers.parser_pdf", "PDFProcessor"),
+    ".djvu": ProcessorEntry("parsers.parser_djvu", "DJVUProcessor"),
+    ".doc": ProcessorEntry("parsers.parser_doc", "DOCProcessor"),
+    ".docx": ProcessorEntry("parsers.parser_docx", "DOCXProcessor"),
+}
+URL_FORMAT = ".html"
+
+
+def register(ext: str, module: str, class_name: str) -> None:
+    """Регистрация обработчика для расширения файла"""
+    REGISTRY[ext.lower()] = ProcessorEntry(module, class_name)
+
+
+def get_entry(ext: str) -> Optional[ProcessorEntry]:
+    return REGISTRY.get(ext.lower())
+
+
+def supported_extensions() -> Tuple[str, ...]:
+    return tuple(REGISTRY)
+
+
+def warm_up() -> None:
+    """Предварительная загрузка всех обработчиков (для долгоживущих воркеров)"""
+    for ext, entry in REGISTRY.items():
+        try:
+            entry.load()
+        except ImportError as e:
+            print(f"Предупреждение: обработчик {ext} недоступен: {e}")
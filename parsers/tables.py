@@ -0,0 +1,50 @@
+import importlib.util
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+import tabula
+from tabula.backend import TabulaVm
+
+JAVA_OPTIONS = ["-Dfile.encoding=UTF8"]
+
+PagesOption = Union[str, int, Sequence[int]]
+
+
+def jvm_backend_available() -> bool:
+    """Доступен ли JVM внутри процесса (jpype): он запускается один раз на процесс"""
+    return importlib.util.find_spec("jpype") is not None
+
+
+class TableExtractor:
+    def __init__(self, java_options: Optional[List[str]] = None, persistent: Optional[bool] = None) -> None:
+        self.java_options = list(java_options or JAVA_OPTIONS)
+        self.persistent = jvm_backend_available() if persistent is None else persistent
+        self.documents = 0
+
+    def warm_up(self) -> None:
+        """Запуск JVM заранее, чтобы первый документ не платил за старт Java"""
+        if self.persistent:
+            TabulaVm(java_options=list(self.java_options), silent=True)
+
+    def read(self, file_path: str, pages: PagesOption = "all") -> List[pd.DataFrame]:
+        """Таблицы одного PDF; при наличии jpype JVM переиспользуется между документами"""
+        tables = tabula.read_pdf(
+            file_path,
+            pages=pages,
+            multiple_tables=True,
+            java_options=self.java_options,
+            force_subprocess=not self.persistent
+        )
+        self.documents += 1
+        return [df for df in tables if not df.empty]
+
+
+_shared_extractor: Optional[TableExtractor] = None
+
+
+def get_table_extractor() -> TableExtractor:
+    """Общий для процесса извлекатель таблиц (один JVM на процесс)"""
+    global _shared_extractor
+    if _shared_extractor is None:
+        _shared_extractor = TableExtractor()
+    return _shared_extractor
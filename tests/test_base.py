@@ -0,0 +1,66 @@
+import pytest
+
+from parsers.base import BaseProcessor, format_pages, parse_fields, parse_pages, select_pages
+
+class DummyProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("text_content", "_extract_text", str),
+        "tables": ("tables", "_extract_tables", list),
+    }
+
+    def __init__(self, fields=None):
+        self.calls = []
+        self._init_fields(fields)
+
+    def _extract_text(self):
+        self.calls.append("text")
+        return "text"
+
+    def _extract_tables(self):
+        self.calls.append("tables")
+        return [["cell"]]
+
+# Тест на разбор списка полей
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(" Text, tables ,") == ("text", "tables")
+
+def test_parse_fields_unknown():
+    with pytest.raises(ValueError):
+        parse_fields("text,pictures")
+
+# Тест на извлечение всех полей по умолчанию
+def test_all_fields_by_default():
+    processor = DummyProcessor()
+    assert processor.calls == ["text", "tables"]
+    assert processor.extracted_fields == {"text", "tables"}
+
+# Тест на ленивое извлечение
+def test_lazy_extraction():
+    processor = DummyProcessor(fields=())
+    assert processor.text_content == ""
+    assert processor.tables == []
+    assert processor.extract(["tables"]) == {"tables": [["cell"]]}
+    processor.extract(["tables", "text"])
+    assert processor.calls == ["tables", "text"]
+
+# Тест на разбор диапазонов страниц
+def test_parse_pages():
+    assert parse_pages("1-3, 7,10-") == [(1, 3), (7, 7), (10, None)]
+
+@pytest.mark.parametrize("spec", ["", "0", "3-1", "a-b", "1-x"])
+def test_parse_pages_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_pages(spec)
+
+# Тест на выбор страниц
+def test_select_pages():
+    assert select_pages(5) == [1, 2, 3, 4, 5]
+    assert select_pages(12, "1-3,7,10-") == [1, 2, 3, 7, 10, 11, 12]
+    assert select_pages(5, [5, 2, 9, 2]) == [2, 5]
+    assert select_pages(100, max_pages=3) == [1, 2, 3]
+    assert select_pages(10, "5-", max_pages=2) == [5, 6]
+
+def test_format_pages():
+    assert format_pages([1, 2, 3, 7, 10, 11]) == "1-3,7,10-11"
+    assert format_pages([]) == ""
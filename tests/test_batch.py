@@ -0,0 +1,82 @@
+import json
+import shutil
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from main import BatchProcessor, BatchSummary, iter_batch_inputs, _init_batch_worker, _process_batch_item
+
+TEST_FILES = Path(__file__).resolve().parent.parent / "test_files"
+
+@pytest.fixture
+def batch_dir(tmp_path):
+    """Каталог с валидным DOCX, поврежденным PDF и неподдерживаемым файлом."""
+    shutil.copy(TEST_FILES / "test_file.docx", tmp_path / "a.docx")
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / "broken.pdf").write_bytes(b"This is not a PDF")
+    (tmp_path / "notes.xyz").write_text("skip me")
+    return tmp_path
+
+# Тест на обход каталога
+def test_iter_inputs_directory(batch_dir):
+    inputs = list(iter_batch_inputs(str(batch_dir)))
+    assert inputs == [str(batch_dir / "a.docx"), str(batch_dir / "nested" / "broken.pdf")]
+
+# Тест на чтение текстового манифеста
+def test_iter_inputs_manifest(tmp_path):
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("# комментарий\n/data/a.pdf\n\nhttp://example.com/page\n", encoding="utf-8")
+    assert list(iter_batch_inputs(str(manifest))) == ["/data/a.pdf", "http://example.com/page"]
+
+# Тест на чтение JSONL-манифеста
+def test_iter_inputs_jsonl_manifest(tmp_path, capsys):
+    manifest = tmp_path / "list.jsonl"
+    lines = [json.dumps({"path": "/data/a.doc"}), json.dumps({"url": "http://example.com"}), "{broken"]
+    manifest.write_text("\n".join(lines), encoding="utf-8")
+    assert list(iter_batch_inputs(str(manifest))) == ["/data/a.doc", "http://example.com"]
+    assert "Пропущена некорректная строка манифеста" in capsys.readouterr().out
+
+# Тест на glob-шаблон
+def test_iter_inputs_glob(batch_dir):
+    inputs = list(iter_batch_inputs(str(batch_dir / "**" / "*.pdf")))
+    assert inputs == [str(batch_dir / "nested" / "broken.pdf")]
+
+# Тест на обработку одного документа воркером
+def test_process_batch_item(batch_dir):
+    result = _process_batch_item(str(batch_dir / "a.docx"))
+    assert result["ok"] is True
+    assert "Обработка:" in result["output"]
+    assert result["size"] > 0
+
+def test_process_batch_item_invalid(batch_dir):
+    result = _process_batch_item(str(batch_dir / "nested" / "broken.pdf"))
+    assert result["ok"] is False
+    assert result["error"]
+
+# Тест на сводку
+def test_summary_counts(capsys):
+    summary = BatchSummary()
+    summary.add({"input_path": "a.pdf", "ok": True, "error": "", "size": 10, "seconds": 0.5})
+    summary.add({"input_path": "b.doc", "ok": False, "error": "Ошибка", "size": 5, "seconds": 0.1})
+    summary.elapsed = 1.0
+    summary.print_results()
+    captured = capsys.readouterr()
+    assert summary.total == 2 and summary.succeeded == 1 and summary.failed == 1
+    assert summary.throughput == 2.0
+    assert "b.doc: Ошибка" in captured.out
+
+# Тест на пакетную обработку пулом процессов
+def test_batch_run(batch_dir, capsys):
+    summary = BatchProcessor(str(batch_dir), workers=2, max_in_flight=1).run()
+    assert summary.total == 2
+    assert summary.succeeded == 1
+    assert summary.failed == 1
+    assert summary.failures[0]["input_path"].endswith("broken.pdf")
+    assert "Обработка:" in capsys.readouterr().out
+
+# Тест на прогрев воркера без запуска JVM для Tabula
+def test_worker_init_does_not_start_jvm():
+    with patch("parsers.tables.TabulaVm") as mock_vm, patch("main.signal.signal"):
+        _init_batch_worker()
+    mock_vm.assert_not_called()
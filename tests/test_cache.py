@@ -0,0 +1,117 @@
+import os
+import shutil
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from main import FileProcessor, BatchSummary
+from parsers.cache import DiskCache, ResultCache, file_digest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class DummyProcessor:
+    VERSION = "1"
+    OUTPUT_OPTIONS = ("pages",)
+
+
+@pytest.fixture
+def docx_file(tmp_path):
+    file = tmp_path / "doc.docx"
+    shutil.copy(ROOT / "test_files" / "test_file.docx", file)
+    return file
+
+# Тест на хэш содержимого файла
+def test_file_digest(tmp_path):
+    first = tmp_path / "a.bin"
+    second = tmp_path / "b.bin"
+    first.write_bytes(b"data")
+    second.write_bytes(b"data")
+    assert file_digest(str(first)) == file_digest(str(second))
+    second.write_bytes(b"other")
+    assert file_digest(str(first)) != file_digest(str(second))
+
+# Тест на запись и чтение дискового кэша
+def test_disk_cache_get_set(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=1024)
+    assert cache.get("ab" * 32) is None
+    cache.set("ab" * 32, b"value")
+    assert cache.get("ab" * 32) == b"value"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert DiskCache(str(tmp_path / "cache"), max_bytes=1024).size == len(b"value")
+
+# Тест на вытеснение давно не использованных записей
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=250)
+    for index, key in enumerate(("aa", "bb", "cc")):
+        cache.set(key * 32, b"x" * 100)
+        os.utime(cache._path(key * 32), (time.time() - 100 + index, time.time() - 100 + index))
+    assert cache.get("aa" * 32) is None
+    assert cache.get("cc" * 32) == b"x" * 100
+    assert cache.size <= 250
+    assert cache.evictions == 1
+
+# Тест на вытеснение с запасом: каталог обходится не на каждой записи сверх лимита
+def test_disk_cache_eviction_low_water(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=1000)
+    with patch.object(cache, "_entries", wraps=cache._entries) as scans:
+        for index in range(20):
+            cache.set(f"{index:064x}", b"x" * 100)
+    assert scans.call_count == 5
+    assert cache.size <= 1000
+
+# Тест на ключ кэша: содержимое файла и влияющие на результат параметры
+def test_result_cache_key(tmp_path):
+    file = tmp_path / "file.pdf"
+    file.write_bytes(b"content")
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache.key(str(file), DummyProcessor, {"pages": "1-2", "ocr_workers": 4})
+    assert key == cache.key(str(file), DummyProcessor, {"pages": "1-2", "ocr_workers": 1})
+    assert key != cache.key(str(file), DummyProcessor, {"pages": "3"})
+    file.write_bytes(b"changed")
+    assert key != cache.key(str(file), DummyProcessor, {"pages": "1-2"})
+
+# Тест на частичный результат: запись без нужных полей считается промахом
+def test_result_cache_partial_fields(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    cache.save("ab" * 32, {"text_content": "text", "extracted_fields": {"text"}})
+    assert cache.load("ab" * 32, ["text"])["text_content"] == "text"
+    assert cache.load("ab" * 32, ["text", "tables"]) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+# Тест на повторную обработку файла из кэша
+def test_file_processor_cache_hit(tmp_path, docx_file):
+    cache = ResultCache(str(tmp_path / "cache"))
+    first = FileProcessor(str(docx_file), cache=cache)
+    assert not first.from_cache
+    second = FileProcessor(str(docx_file), cache=cache)
+    assert second.from_cache
+    assert second.processor.text_content == first.processor.text_content
+    assert second.processor.metadata == first.processor.metadata
+    assert second.process()
+
+# Тест на вывод только запрошенных полей при попадании в кэш
+def test_file_processor_cache_subset(tmp_path, docx_file):
+    cache = ResultCache(str(tmp_path / "cache"))
+    FileProcessor(str(docx_file), cache=cache)
+    processor = FileProcessor(str(docx_file), fields=["text"], cache=cache)
+    assert processor.from_cache
+    assert processor.processor.extracted_fields == {"text"}
+
+# Тест на то, что некорректный документ не кэшируется
+def test_file_processor_invalid_not_cached(tmp_path):
+    file = tmp_path / "broken.docx"
+    file.write_bytes(b"not a docx")
+    cache = ResultCache(str(tmp_path / "cache"))
+    FileProcessor(str(file), cache=cache)
+    assert cache.stats()["writes"] == 0
+
+# Тест на учет попаданий в кэш в сводке пакета
+def test_batch_summary_counts_cached():
+    summary = BatchSummary()
+    summary.add({"input_path": "a.pdf", "ok": True, "cached": True, "error": ""})
+    summary.add({"input_path": "b.pdf", "ok": True, "error": ""})
+    assert summary.cached == 1
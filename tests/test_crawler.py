@@ -0,0 +1,157 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from main import CrawlProcessor
+from parsers.crawler import Crawler, VisitedSet, normalize_url
+from parsers.fetch import Fetcher
+
+SITE = {
+    "/": "<p>Главная</p><a href='/a'>A</a><a href='b'>B</a><a href='/a#top'>A снова</a>"
+         "<a href='mailto:x@example.com'>почта</a><a href='/doc.pdf'>PDF</a><a href='{other}/x'>другой сайт</a>",
+    "/a": "<p>Страница A</p><a href='/c'>C</a><a href='/'>на главную</a>",
+    "/b": "<p>Страница B</p><a href='/a'>A</a>",
+    "/c": "<p>Страница C</p><a href='/d'>D</a>",
+    "/d": "<p>Страница D</p>",
+    "/x": "<p>Другой сайт</p>",
+}
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        if self.path == "/old-b":
+            self.send_response(301)
+            self.send_header("Location", "/b")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/doc.pdf":
+            self._send(200, b"%PDF-1.4", "application/pdf")
+        elif self.path in SITE:
+            other = f"http://localhost:{self.server.server_address[1]}"
+            self._send(200, SITE[self.path].format(other=other).encode("utf-8"), "text/html; charset=utf-8")
+        else:
+            self._send(404, b"not found", "text/html")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def crawl(seed, **kwargs):
+    crawler = Crawler([seed], Fetcher(workers=4), **kwargs)
+    return {page["url"]: page for page in crawler.crawl()}
+
+# Тест на нормализацию адресов
+def test_normalize_url():
+    assert normalize_url("HTTP://Example.COM:80") == "http://example.com/"
+    assert normalize_url("../b?q=1#frag", "https://example.com/a/c") == "https://example.com/b?q=1"
+    assert normalize_url("https://example.com:8443/x") == "https://example.com:8443/x"
+    assert normalize_url("mailto:x@example.com") is None
+    assert normalize_url("javascript:void(0)", "https://example.com/") is None
+    assert normalize_url("http://example.com:bad/") is None
+
+# Тест на множество посещенных адресов
+def test_visited_set():
+    visited = VisitedSet()
+    assert visited.add("http://example.com/")
+    assert not visited.add("http://example.com/")
+    assert "http://example.com/" in visited
+    assert "http://example.com/other" not in visited
+    assert len(visited) == 1
+
+# Тест на обход с ограничением глубины
+def test_crawl_depth(site):
+    base, server = site
+    pages = crawl(base + "/", max_depth=1)
+    assert set(pages) == {base + "/", base + "/a", base + "/b", base + "/doc.pdf"}
+    assert pages[base + "/a"]["depth"] == 1
+    assert pages[base + "/a"]["processor"].full_text.startswith("Страница A")
+    assert pages[base + "/doc.pdf"]["processor"] is None
+    assert "Не HTML" in pages[base + "/doc.pdf"]["error"]
+    assert sorted(server.requests).count("/a") == 1
+
+def test_crawl_full_site(site):
+    base, _ = site
+    pages = crawl(base + "/", max_depth=5)
+    assert {url[len(base):] for url in pages} == {"/", "/a", "/b", "/c", "/d", "/doc.pdf"}
+
+# Тест на ограничение числа страниц
+def test_crawl_max_pages(site):
+    base, server = site
+    pages = crawl(base + "/", max_depth=5, max_pages=2)
+    assert len(pages) == 2
+    assert len(server.requests) == 2
+
+# Тест на переходы на другие хосты
+def test_crawl_other_hosts(site):
+    base, _ = site
+    pages = crawl(base + "/", max_depth=1, same_host=False)
+    assert any(url.startswith("http://localhost:") for url in pages)
+
+# Тест на обход без вывода ссылок
+def test_crawl_fields_without_links(site):
+    base, _ = site
+    pages = crawl(base + "/", max_depth=1, fields=["text"])
+    processor = pages[base + "/"]["processor"]
+    assert processor.extracted_fields == {"text"}
+    assert len(pages) == 4
+
+# Тест на ограничение частоты запросов по умолчанию
+def test_crawler_default_politeness():
+    assert Crawler(["http://example.com/"]).fetcher.limiter.interval == 0.5
+
+# Тест на потоковый вывод JSONL в режиме обхода
+def test_crawl_processor_jsonl(site, capsys):
+    base, _ = site
+    crawl_processor = CrawlProcessor(base + "/", max_depth=1, per_host_rate=100, fields=["text"], output_format="jsonl")
+    summary = crawl_processor.run()
+    assert summary.total == 4 and summary.failed == 1
+    captured = capsys.readouterr()
+    lines = [json.loads(line) for line in captured.out.splitlines()]
+    documents = [line for line in lines if line["type"] == "document"]
+    assert len(documents) == 3
+    assert {document["depth"] for document in documents} == {0, 1}
+    assert {line["type"] for line in lines} == {"document", "text"}
+    assert "Не HTML" in captured.err
+
+# Тест на сообщения начальных адресов в режиме JSONL: в stderr, а не в поток записей
+def test_crawl_processor_jsonl_diagnostics(site, tmp_path, capsys):
+    base, _ = site
+    seeds = tmp_path / "seeds.txt"
+    seeds.write_text(f"{base}/\nftp://bad\n{{не json\n")
+    CrawlProcessor(str(seeds), max_depth=0, per_host_rate=100, fields=["text"], output_format="jsonl").run()
+    captured = capsys.readouterr()
+    assert all(json.loads(line) for line in captured.out.splitlines())
+    assert "Пропущен некорректный адрес" in captured.err
+    assert "Пропущена некорректная строка манифеста" in captured.err
+
+# Тест на страницу, полученную и напрямую, и через перенаправление: выводится один раз
+def test_crawl_redirect_duplicate(site):
+    base, httpd = site
+    crawler = Crawler([base + "/b", base + "/old-b"], Fetcher(workers=4), max_depth=0)
+    pages = list(crawler.crawl())
+    assert [page["final_url"] for page in pages] == [base + "/b"]
+    assert httpd.requests.count("/b") == 2
@@ -1,3 +1,4 @@
+import io
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -30,7 +31,7 @@ def mock_dependencies():
         mock_run.side_effect = [
             MagicMock(stdout="Version 1.2", returncode=0),  # djvutxt --version
             MagicMock(stdout="Version 1.3", returncode=0),  # ddjvu --version
-            MagicMock(stdout="Version 1.4", returncode=0),  # djvudump --version
+            MagicMock(stdout="Version 1.4", returncode=0),  # djvused --version
         ]
         yield mock_run
 
@@ -138,10 +139,106 @@ def test_no_images(create_valid_djvu, mock_dependencies):
     processor = DJVUProcessor(create_valid_djvu)
     assert processor.ocr_text == ""
 
-# Тест на удаление временного файла после OCR
-def test_temp_file_cleanup(create_valid_djvu):
-    temp_image = "temp.tiff"
-    with patch("os.remove") as mock_remove:
-        processor = DJVUProcessor(create_valid_djvu)
-        processor._extract_text_ocr()
-        mock_remove.assert_called_once_with(temp_image)
\ No newline at end of file
+def fake_djvu_tools(page_count=3, failed_page=None):
+    """Мок djvused/djvutxt/ddjvu: страница N отрисовывается изображением шириной 10 * N"""
+    def run(args, **kwargs):
+        if args[0] == "djvused":
+            return MagicMock(stdout=f"{page_count}\n", returncode=0)
+        if args[0] == "ddjvu" and "--version" not in args:
+            number = int(args[2].split("=")[1])
+            if number == failed_page:
+                raise subprocess.CalledProcessError(1, args, stderr=b"page error")
+            buffer = io.BytesIO()
+            Image.new("L", (10 * number, 10), 255).save(buffer, "PPM")
+            return MagicMock(stdout=buffer.getvalue(), returncode=0)
+        return MagicMock(stdout="", returncode=0)
+    return run
+
+def fake_ocr(image, lang):
+    return f"Страница шириной {image.width}\n"
+
+# Тест на постраничный OCR: каждая страница отрисовывается отдельно, порядок сохраняется
+def test_ocr_per_page(create_valid_djvu):
+    with patch("subprocess.run", side_effect=fake_djvu_tools()) as mock_run, \
+            patch("pytesseract.image_to_string", side_effect=fake_ocr):
+        processor = DJVUProcessor(create_valid_djvu, fields=["ocr"], ocr_workers=3)
+    assert processor.ocr_pages == [1, 2, 3]
+    assert processor.ocr_text == "Страница шириной 10\nСтраница шириной 20\nСтраница шириной 30"
+    renders = [call.args[0] for call in mock_run.call_args_list if call.args[0][0] == "ddjvu" and len(call.args[0]) > 2]
+    assert sorted(renders) == [
+        ["ddjvu", "-format=pnm", f"-page={n}", "-scale=300", create_valid_djvu, "-"] for n in (1, 2, 3)
+    ]
+
+# Тест на передачу разрешения отрисовки в OCR (ключ кэша OCR)
+def test_ocr_page_dpi(create_valid_djvu):
+    with patch("subprocess.run", side_effect=fake_djvu_tools(page_count=1)), \
+            patch("parsers.parser_djvu.ocr_image", return_value="OCR") as mock_ocr:
+        DJVUProcessor(create_valid_djvu, fields=["ocr"])
+    assert mock_ocr.call_args.args[3] == DJVUProcessor.OCR_DPI == 300
+
+def test_ocr_selected_pages(create_valid_djvu):
+    with patch("subprocess.run", side_effect=fake_djvu_tools(page_count=10)), \
+            patch("pytesseract.image_to_string", side_effect=fake_ocr):
+        processor = DJVUProcessor(create_valid_djvu, fields=["ocr"], pages="4-", max_pages=2)
+    assert processor.ocr_pages == [4, 5]
+
+# Тест на записи JSON/JSONL по страницам OCR
+def test_ocr_page_records(create_valid_djvu):
+    with patch("subprocess.run", side_effect=fake_djvu_tools(page_count=2)), \
+            patch("pytesseract.image_to_string", side_effect=fake_ocr):
+        processor = DJVUProcessor(create_valid_djvu, fields=[])
+        records = list(processor.iter_records(["ocr"]))
+    assert records == [
+        {"type": "ocr_page", "page": 1, "text": "Страница шириной 10"},
+        {"type": "ocr_page", "page": 2, "text": "Страница шириной 20"},
+    ]
+    assert processor.ocr_text == "Страница шириной 10\nСтраница шириной 20"
+
+# Тест на ошибку отрисовки одной из страниц
+def test_ocr_page_render_error(create_valid_djvu, capsys):
+    with patch("subprocess.run", side_effect=fake_djvu_tools(failed_page=2)), \
+            patch("pytesseract.image_to_string", side_effect=fake_ocr):
+        processor = DJVUProcessor(create_valid_djvu, fields=["ocr"])
+    assert processor.ocr_text == ""
+    assert processor.ocr_pages == []
+    assert "page error" in capsys.readouterr().out
+
+# Тест на обработку подмножества страниц
+def test_pages_subset(create_valid_djvu):
+    with patch("subprocess.run") as mock_run:
+        mock_run.side_effect = [
+            MagicMock(stdout="", returncode=0),  # djvutxt --version
+            MagicMock(stdout="", returncode=0),  # ddjvu --version
+            MagicMock(stdout="", returncode=0),  # djvused --version
+            MagicMock(stdout="12\n", returncode=0),  # djvused -e n
+            MagicMock(stdout="Page text", returncode=0),  # djvutxt
+        ]
+        processor = DJVUProcessor(create_valid_djvu, fields=["text"], pages="2-", max_pages=3)
+    assert processor.text_content == "Page text"
+    assert processor.page_numbers == [2, 3, 4]
+    assert mock_run.call_args_list[4].args[0] == ["djvutxt", "-page=2-4", create_valid_djvu]
+
+# Тест на проверку наличия djvused (число страниц для выбора и OCR)
+def test_missing_djvused(create_valid_djvu, capsys):
+    def run(args, **kwargs):
+        if args[0] == "djvused":
+            raise FileNotFoundError(args[0])
+        return MagicMock(stdout="", returncode=0)
+    with patch("subprocess.run", side_effect=run):
+        processor = DJVUProcessor(create_valid_djvu, fields=[])
+    assert not processor.is_valid
+    assert "djvused" in capsys.readouterr().out
+
+# Тест на OCR документа с текстовым слоем: поле и потоковые записи не запускают OCR
+def test_ocr_skipped_with_text_layer(create_valid_djvu):
+    def run(args, **kwargs):
+        if args[0] == "djvutxt" and "--version" not in args:
+            return MagicMock(stdout="Текстовый слой", returncode=0)
+        return fake_djvu_tools()(args, **kwargs)
+    with patch("subprocess.run", side_effect=run), \
+            patch("parsers.parser_djvu.ocr_image") as mock_ocr:
+        processor = DJVUProcessor(create_valid_djvu, fields=["ocr"])
+        records = list(DJVUProcessor(create_valid_djvu, fields=[]).iter_records(["ocr"]))
+    mock_ocr.assert_not_called()
+    assert processor.ocr_text == ""
+    assert records == []
@@ -75,6 +75,23 @@ def test_extract_text_valid(create_valid_doc):
     expected_text = "Первый параграф.\nВторой параграф."
     assert processor.text_content.startswith(expected_text)
 
+# Тест на отсутствие повторов текста (каждый абзац и ячейка - один раз)
+def test_extract_text_no_duplicates(create_valid_doc):
+    processor = DOCProcessor(create_valid_doc, engine="aspose")
+    assert processor.text_content.count("Первый параграф.") == 1
+    assert processor.text_content.count("Ячейка 1") == 1
+
+# Тест на облегченный профиль загрузки: результат совпадает с полной загрузкой
+def test_text_load_profile(create_valid_doc):
+    light = DOCProcessor(create_valid_doc, engine="aspose")
+    full = DOCProcessor(create_valid_doc, load_profile="full", engine="aspose")
+    assert light.load_profile == "text"
+    assert light.extract() == full.extract()
+
+def test_unknown_load_profile(create_valid_doc):
+    with pytest.raises(ValueError):
+        DOCProcessor(create_valid_doc, load_profile="images")
+
 def test_extract_text_invalid(create_invalid_doc):
     processor = DOCProcessor(create_invalid_doc)
     assert processor.text_content == ""
@@ -141,4 +158,10 @@ def test_no_tables(create_valid_doc):
 # Тест на обработку документа без метаданных
 def test_no_metadata(create_empty_doc):
     processor = DOCProcessor(create_empty_doc)
-    assert processor.metadata == {"author": "", "created": None}
\ No newline at end of file
+    assert processor.metadata == {"author": "", "created": None}
+# Тест на извлечение только запрошенных полей
+def test_extract_requested_fields_only(create_valid_doc):
+    processor = DOCProcessor(create_valid_doc, fields=["tables"])
+    assert processor.text_content == ""
+    assert processor.tables == [[["Ячейка 1", "Ячейка 2"], ["Ячейка 3", "Ячейка 4"]]]
+    assert processor.extracted_fields == {"tables"}
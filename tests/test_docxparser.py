@@ -1,8 +1,12 @@
+import zipfile
 import pytest
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 from parsers.parser_docx import DOCXProcessor
+from parsers.docx_stream import read_body
 from docx import Document
+from docx.enum.text import WD_BREAK
 
 @pytest.fixture
 def create_valid_docx(tmp_path):
@@ -22,6 +26,29 @@ def create_valid_docx(tmp_path):
     doc.save(str(file))
     return str(file)
 
+@pytest.fixture
+def create_merged_docx(tmp_path):
+    """Создает DOCX с объединенными и вложенными ячейками, разрывами и гиперссылкой."""
+    file = tmp_path / "merged.docx"
+    doc = Document()
+    doc.add_paragraph("Первый\tпараграф.")
+    paragraph = doc.add_paragraph("Строка")
+    run = paragraph.add_run()
+    run.add_break()
+    run.add_text("перенос")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    table = doc.add_table(rows=3, cols=3)
+    for i, row in enumerate(table.rows):
+        for j, cell in enumerate(row.cells):
+            cell.text = f"{i}.{j}"
+    table.cell(0, 0).merge(table.cell(0, 1))
+    table.cell(1, 2).merge(table.cell(2, 2))
+    table.cell(1, 0).add_table(rows=1, cols=2).cell(0, 0).text = "Вложенная"
+    table.cell(2, 0).add_paragraph("Второй абзац ячейки")
+    doc.add_paragraph("После таблицы")
+    doc.save(str(file))
+    return str(file)
+
 @pytest.fixture
 def create_invalid_docx(tmp_path):
     """Создает временный невалидный DOCX-файл."""
@@ -51,6 +78,59 @@ def test_validate_syntax_invalid(create_invalid_docx):
     processor = DOCXProcessor(create_invalid_docx)
     assert processor._validate_syntax() is False
 
+@pytest.mark.parametrize("fields", [None, ["metadata"]])
+def test_validate_syntax_broken_xml(create_valid_docx, tmp_path, capsys, fields):
+    broken = tmp_path / "broken.docx"
+    with zipfile.ZipFile(create_valid_docx) as source, zipfile.ZipFile(broken, "w") as target:
+        for item in source.infolist():
+            data = source.read(item)
+            if item.filename == "word/document.xml":
+                data = data[:len(data) // 2]
+            target.writestr(item, data)
+    processor = DOCXProcessor(str(broken), fields=fields)
+    assert processor.is_valid is False
+    assert processor.text_content == ""
+    assert "XML ошибка" in capsys.readouterr().out
+
+# Тест на однократный разбор word/document.xml и пропуск прочих частей пакета при проверке
+def test_validate_single_body_pass(create_valid_docx):
+    from parsers import docx_stream
+    with patch.object(docx_stream, "check_xml", wraps=docx_stream.check_xml) as mock_check, \
+         patch.object(docx_stream.etree, "iterparse", wraps=docx_stream.etree.iterparse) as mock_iterparse:
+        processor = DOCXProcessor(create_valid_docx)
+    checked = [call.args[0].name for call in mock_check.call_args_list]
+    assert "word/document.xml" not in checked
+    assert "word/styles.xml" not in checked
+    assert "[Content_Types].xml" in checked
+    assert mock_iterparse.call_count == 1
+    assert processor.is_valid is True
+    assert "Первый параграф." in processor.text_content
+
+# Тест на поврежденный поток сжатия word/document.xml: ошибка проверки, а не исключение
+def test_validate_syntax_corrupted_deflate(create_valid_docx, tmp_path):
+    import random
+    import struct
+    data = Path(create_valid_docx).read_bytes()
+    with zipfile.ZipFile(create_valid_docx) as archive:
+        info = archive.getinfo("word/document.xml")
+    name_length, extra_length = struct.unpack("<HH", data[info.header_offset + 26:info.header_offset + 30])
+    start = info.header_offset + 30 + name_length + extra_length
+    generator = random.Random(0)
+    for attempt in range(200):
+        corrupted = bytearray(data)
+        for _ in range(8):
+            corrupted[start + generator.randrange(info.compress_size)] = generator.randrange(256)
+        file = tmp_path / f"corrupted_{attempt}.docx"
+        file.write_bytes(bytes(corrupted))
+        processor = DOCXProcessor(str(file))
+        assert processor.is_valid in (True, False)
+
+def test_validate_syntax_not_docx_package(tmp_path):
+    file = tmp_path / "archive.docx"
+    with zipfile.ZipFile(file, "w") as archive:
+        archive.writestr("readme.xml", "<a/>")
+    assert DOCXProcessor(str(file)).is_valid is False
+
 # Тест на извлечение текста
 def test_extract_text_valid(create_valid_docx):
     processor = DOCXProcessor(create_valid_docx)
@@ -69,6 +149,23 @@ def test_extract_tables_valid(create_valid_docx):
     ]
     assert processor.tables == expected_tables
 
+# Тест на совпадение потокового разбора с объектной моделью python-docx
+def test_stream_matches_python_docx(create_merged_docx):
+    doc = Document(create_merged_docx)
+    paragraphs, tables = read_body(create_merged_docx)
+    assert paragraphs == [paragraph.text for paragraph in doc.paragraphs]
+    assert tables == [[[cell.text.strip() for cell in row.cells] for row in table.rows] for table in doc.tables]
+    assert tables[0][0] == ["0.0\n0.1", "0.0\n0.1", "0.2"]
+    assert tables[0][2][2] == "1.2\n2.2"
+
+# Тест на то, что проверка и извлечение не строят объектную модель python-docx
+def test_extract_does_not_use_object_model(create_valid_docx, monkeypatch):
+    monkeypatch.setattr(DOCXProcessor, "_load_document", lambda self: pytest.fail("документ загружен"))
+    processor = DOCXProcessor(create_valid_docx)
+    assert processor.is_valid is True
+    assert processor.tables == [[["Ячейка 1", "Ячейка 2"], ["Ячейка 3", "Ячейка 4"]]]
+    assert processor.metadata["author"] == "Test Author"
+
 def test_extract_tables_invalid(create_invalid_docx):
     processor = DOCXProcessor(create_invalid_docx)
     assert processor.tables == []
@@ -115,3 +212,17 @@ def test_print_results_invalid(create_invalid_docx, capsys):
     assert "Текст документа:" in captured.out
     assert "Таблицы из документа:" in captured.out
     assert "Метаданные:" in captured.out
+
+# Тест на извлечение только запрошенных полей
+def test_extract_requested_fields_only(create_valid_docx):
+    processor = DOCXProcessor(create_valid_docx, fields=["text"])
+    assert processor.text_content == "Первый параграф.\nВторой параграф."
+    assert processor.tables == []
+    assert processor.extracted_fields == {"text"}
+
+def test_extract_fields_on_demand(create_valid_docx):
+    processor = DOCXProcessor(create_valid_docx, fields=[])
+    assert processor.extract(["tables", "ocr"]) == {
+        "tables": [[["Ячейка 1", "Ячейка 2"], ["Ячейка 3", "Ячейка 4"]]]
+    }
+    assert processor.extracted_fields == {"tables"}
@@ -0,0 +1,218 @@
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from main import UrlBatchProcessor
+from parsers.fetch import Fetcher, HostRateLimiter, ResponseTooLarge, read_content
+from parsers.parser_html import WebPageProcessor
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.client_address[1], time.monotonic()))
+            attempt = server.attempts.get(self.path, 0) + 1
+            server.attempts[self.path] = attempt
+        if self.path.startswith("/flaky") and attempt <= 2:
+            self._send(503, b"busy")
+        elif self.path == "/missing":
+            self._send(404, b"not found")
+        elif self.path == "/endless":
+            self._send_endless()
+        elif self.path == "/large":
+            self._send(200, b"<p>" + b"x" * 100000 + b"</p>")
+        elif self.path.startswith("/cached"):
+            etag = f'"{server.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", {"ETag": etag})
+            else:
+                body = f"<html><body><p>version {server.version}</p></body></html>".encode()
+                self._send(200, body, {"ETag": etag, "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+        else:
+            self._send(200, f"<html><body><p>page {self.path}</p><a href='/next'>next</a></body></html>".encode())
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_endless(self):
+        """Бесконечный поток (chunked) - пока клиент не закроет соединение"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunk = b"<p>" + b"y" * 8000 + b"</p>"
+        try:
+            for _ in range(10000):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.attempts = {}
+    httpd.version = 1
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+# Тест на переиспользование соединения (keep-alive)
+def test_fetcher_reuses_connections(server):
+    fetcher = Fetcher(workers=1)
+    for i in range(5):
+        assert b"page" in fetcher.get(url(server, f"/p{i}")).content
+    assert len({port for _, port, _ in server.requests}) == 1
+
+# Тест на повтор запроса после временной ошибки сервера
+def test_fetcher_retries_with_backoff(server):
+    fetcher = Fetcher(workers=1, retries=3, backoff=0.01)
+    assert fetcher.get(url(server, "/flaky")).status_code == 200
+    assert server.attempts["/flaky"] == 3
+
+def test_fetcher_gives_up(server):
+    import requests
+    fetcher = Fetcher(workers=1, retries=1, backoff=0.01)
+    with pytest.raises(requests.HTTPError):
+        fetcher.get(url(server, "/flaky-2"))
+    assert server.attempts["/flaky-2"] == 2
+
+# Тест на ограничение частоты запросов к одному хосту
+def test_rate_limiter_per_host():
+    limiter = HostRateLimiter(rate=20)
+    started = time.monotonic()
+    for _ in range(5):
+        limiter.acquire("a.example")
+    limiter.acquire("b.example")
+    elapsed = time.monotonic() - started
+    assert 0.18 <= elapsed < 0.5
+
+# Тест на параллельную загрузку многих страниц
+def test_fetch_many(server):
+    fetcher = Fetcher(workers=4, per_host_rate=200)
+    urls = [url(server, f"/p{i}") for i in range(20)] + [url(server, "/missing")]
+    results = {result["url"]: result for result in fetcher.fetch_many(urls, max_in_flight=6)}
+    assert len(results) == 21
+    assert results[url(server, "/missing")]["error"] is not None
+    assert all(results[u]["content"] for u in urls[:-1])
+    assert len({port for _, port, _ in server.requests}) <= 4
+
+# Тест на разбор заранее загруженной страницы без сетевого запроса
+def test_processor_uses_prefetched_content(server):
+    processor = WebPageProcessor(url(server, "/p1"), content=b"<p>prefetched</p>")
+    assert processor.full_text == "prefetched"
+    assert server.requests == []
+
+# Тест на режим списка URL
+def test_url_batch(server, tmp_path, capsys):
+    manifest = tmp_path / "urls.txt"
+    manifest.write_text("\n".join([url(server, "/a"), url(server, "/flaky-b"), url(server, "/missing")]))
+    batch = UrlBatchProcessor(str(manifest), fetch_workers=2, retries=2, fields=["text"])
+    batch.run()
+    summary = batch.summary
+    assert summary.total == 3
+    assert summary.succeeded == 2
+    assert summary.failures[0]["error"].startswith("HTTP ошибка 404")
+    assert "page /a" in capsys.readouterr().out
+
+# Тест на условный запрос: при ответе 304 используется сохраненный результат
+def test_http_cache_not_modified(server, tmp_path):
+    page = url(server, "/cached")
+    first = WebPageProcessor(page, http_cache_dir=str(tmp_path))
+    assert first.full_text == "version 1" and not first.not_modified
+    assert first.http_validators["etag"] == '"1"'
+
+    second = WebPageProcessor(page, http_cache_dir=str(tmp_path))
+    assert second.not_modified
+    assert second.content is None and second.is_cacheable()
+    assert second.full_text == first.full_text
+    assert second.links == first.links
+
+# Тест на обновление кэша при изменении страницы
+def test_http_cache_modified(server, tmp_path):
+    page = url(server, "/cached")
+    WebPageProcessor(page, http_cache_dir=str(tmp_path))
+    server.version = 2
+    processor = WebPageProcessor(page, http_cache_dir=str(tmp_path))
+    assert not processor.not_modified
+    assert processor.full_text == "version 2"
+    assert WebPageProcessor(page, http_cache_dir=str(tmp_path)).not_modified
+
+# Тест на условные запросы в режиме списка URL
+def test_url_batch_http_cache(server, tmp_path, capsys):
+    manifest = tmp_path / "urls.txt"
+    manifest.write_text(url(server, "/cached-a"))
+    options = {"http_cache_dir": str(tmp_path / "http")}
+    for _ in range(2):
+        batch = UrlBatchProcessor(str(manifest), fields=["text"], options=options)
+        assert batch.run().succeeded == 1
+    assert capsys.readouterr().out.count("version 1") == 2
+    assert [path for path, _, _ in server.requests] == ["/cached-a"] * 2
+    assert server.attempts["/cached-a"] == 2
+
+# Тест на HTTP-кэш в режиме JSONL: повторный запуск берет сохраненный результат по 304
+def test_url_batch_http_cache_jsonl(server, tmp_path, capsys):
+    manifest = tmp_path / "urls.txt"
+    manifest.write_text(url(server, "/cached-json"))
+    options = {"http_cache_dir": str(tmp_path / "http")}
+    for _ in range(2):
+        batch = UrlBatchProcessor(str(manifest), fields=["text"], options=options, output_format="jsonl")
+        assert batch.run().succeeded == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    texts = [line["text"] for line in lines if line.get("type") == "text"]
+    assert texts == ["version 1", "version 1"]
+    assert server.attempts["/cached-json"] == 2
+
+# Тест на ответ 304 без сохраненного результата: страница запрашивается заново
+def test_not_modified_without_entry(server, tmp_path):
+    page = url(server, "/cached-orphan")
+    fetcher = Fetcher(workers=1)
+    response = fetcher.get(page, headers={"If-None-Match": '"1"'}, stream=True)
+    assert response.status_code == 304
+    processor = WebPageProcessor(
+        page, fetcher=fetcher, response=response, content=b"", http_cache_dir=str(tmp_path)
+    )
+    assert not processor.not_modified
+    assert processor.full_text == "version 1"
+    assert server.attempts["/cached-orphan"] == 2
+
+# Тест на ограничение размера страницы по Content-Length
+def test_max_bytes_content_length(server):
+    fetcher = Fetcher(workers=1)
+    with pytest.raises(ResponseTooLarge):
+        read_content(fetcher.get(url(server, "/large"), stream=True), max_bytes=1000)
+    assert len(read_content(fetcher.get(url(server, "/large"), stream=True), max_bytes=0)) == 100007
+
+# Тест на прерывание бесконечного потока
+def test_max_bytes_endless_stream(server, capsys):
+    started = time.monotonic()
+    processor = WebPageProcessor(url(server, "/endless"), max_page_bytes=100000, incremental=True)
+    assert processor.content is None and not processor.is_cacheable()
+    assert "слишком большая" in capsys.readouterr().out
+    assert time.monotonic() - started < 5
+    result = next(Fetcher(workers=1, max_bytes=100000).fetch_many([url(server, "/endless")]))
+    assert isinstance(result["error"], ResponseTooLarge)
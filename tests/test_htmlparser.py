@@ -1,5 +1,6 @@
 import pytest
 import requests_mock
+from unittest.mock import patch
 
 
 from parsers.parser_html import WebPageProcessor 
@@ -266,4 +267,231 @@ def test_print_results_links(capsys):
     captured = capsys.readouterr()
     output = captured.out
 
-    assert "Ссылки: [{'text': 'Example Link', 'url': 'https://example.com'}]" in output
\ No newline at end of file
+    assert "Ссылки: [{'text': 'Example Link', 'url': 'https://example.com'}]" in output
+# Тест на извлечение только запрошенных полей
+def test_requested_fields_only(mock_html, capsys):
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.url", text=mock_html)
+        processor = WebPageProcessor("http://mock.url", fields=["links"])
+    assert processor.links == [{"text": "Example Link", "url": "https://example.com"}]
+    assert processor.full_text == ""
+    assert processor.images == []
+    processor.print_results()
+    captured = capsys.readouterr()
+    assert "Ссылки:" in captured.out
+    assert "Изображения:" not in captured.out
+
+# Тест на совпадение однопроходного обхода с поиском по дереву (find_all)
+TRICKY_HTML = """
+<html><head><title>Заголовок окна</title>
+<meta name="description" content="d"><meta property="og:title" content="t">
+<meta name="empty" content=""><meta content="без имени">
+<style>p { color: red }</style><script>var s = "<a href='x'>";</script></head>
+<body><!-- комментарий --><p>Текст <b>жирный</b> и <a href="">пустая ссылка</a></p>
+<a name="anchor">без href</a><a href="/a"> <span>вложенный</span> текст </a>
+<img src="1.png"><img alt="без src"><ruby>漢<rt>kan</rt></ruby>
+<template><p>шаблон</p></template>
+<table><tr><th>H1</th><th>H2</th></tr>
+<tr><td>a <a href="/in-table">ссылка</a></td><td><table><tr><th>Вложенный</th></tr>
+<tr><td>в1</td><td>в2</td></tr></table></td></tr></table>
+<td>ячейка без строки</td><tr><td>строка без таблицы</td></tr>
+</body></html>
+"""
+
+
+def legacy_extract(soup):
+    tables = []
+    for table in soup.find_all("table"):
+        tables.append({
+            "headers": [th.text.strip() for th in table.find_all("th")],
+            "rows": [[td.text.strip() for td in row.find_all("td")] for row in table.find_all("tr")],
+        })
+    meta_tags = {}
+    for meta in soup.find_all("meta"):
+        name = meta.get("name") or meta.get("property")
+        if name and meta.get("content"):
+            meta_tags[name] = meta.get("content")
+    return {
+        "text": soup.get_text(separator="\n", strip=True),
+        "images": [{"src": img.get("src", ""), "alt": img.get("alt", "No alt text")} for img in soup.find_all("img")],
+        "tables": tables,
+        "metadata": meta_tags,
+        "links": [{"text": a.text.strip(), "url": a.get("href", "")} for a in soup.find_all("a", href=True)],
+    }
+
+
+@pytest.mark.parametrize("html", [TRICKY_HTML, "", "<p>только текст</p>", "<table><tr><td>x"])
+def test_walker_matches_find_all(html):
+    from bs4 import BeautifulSoup
+    from parsers.html_walker import PageCollector, walk_soup
+    soup = BeautifulSoup(html, "html.parser")
+    assert walk_soup(soup, PageCollector()) == legacy_extract(soup)
+
+# Тест на сбор только запрошенных полей
+def test_walker_requested_fields():
+    from bs4 import BeautifulSoup
+    from parsers.html_walker import PageCollector, walk_soup
+    soup = BeautifulSoup(TRICKY_HTML, "html.parser")
+    assert set(walk_soup(soup, PageCollector(["links", "metadata"]))) == {"links", "metadata"}
+
+# Тест на один обход страницы для всех полей
+@pytest.mark.parametrize("backend, walker", [("html.parser", "walk_soup"), ("lxml", "walk_soup"), ("lxml-target", "parse_with_target")])
+def test_single_traversal(mock_html, backend, walker):
+    from parsers import parser_html
+    with requests_mock.Mocker() as m, patch.object(parser_html, walker, wraps=getattr(parser_html, walker)) as walk:
+        m.get("http://mock.url", text=mock_html)
+        processor = WebPageProcessor("http://mock.url", backend=backend)
+    assert walk.call_count == 1
+    assert processor.links == [{"text": "Example Link", "url": "https://example.com"}]
+
+# Тест на совпадение результатов всех способов разбора с html.parser
+def parity_pages():
+    from benchmarks.samples import html_page
+    return {
+        "tricky": TRICKY_HTML.encode("utf-8"),
+        "empty": b"",
+        "synthetic": html_page(100 * 1024).encode("utf-8"),
+        "cp1251": '<html><head><meta charset="windows-1251"></head><body><p>Привет</p><a href="/x">ссылка</a></body></html>'.encode("cp1251"),
+        "no-charset": "<p>Текст без объявления кодировки, достаточно длинный для определения</p>".encode("cp1251"),
+        "broken": b"<html><body><p>open <b>bold <i>italic</p><table><td>cell</table><a href=/x>link",
+    }
+
+
+@pytest.mark.parametrize("page", ["tricky", "empty", "synthetic", "cp1251", "no-charset", "broken"])
+@pytest.mark.parametrize("backend", ["lxml", "lxml-target"])
+def test_backend_parity(page, backend):
+    if page == "empty" and backend == "lxml":
+        pytest.skip("BeautifulSoup с lxml не повторяет текст \"b''\" html.parser для пустого ответа")
+    content = parity_pages()[page]
+    results = {}
+    for name in ("html.parser", backend):
+        with requests_mock.Mocker() as m:
+            m.get("http://parity.url", content=content)
+            processor = WebPageProcessor("http://parity.url", backend=name)
+        results[name] = {field: processor.extract([field])[field] for field in processor.FIELDS}
+    assert results[backend] == results["html.parser"]
+
+# Тест на выбор самого быстрого способа разбора по умолчанию
+def test_default_backend(mock_html):
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.url", text=mock_html)
+        processor = WebPageProcessor("http://mock.url")
+    assert processor.backend == "lxml-target"
+    assert processor._soup is None
+    assert processor.soup.find("h1").text == "Заголовок"
+
+def test_default_backend_without_lxml():
+    from parsers import html_walker
+    with patch.object(html_walker, "lxml_available", return_value=False):
+        assert html_walker.default_backend() == "html.parser"
+
+# Тест на неизвестный способ разбора
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        WebPageProcessor("http://mock.url", backend="regex")
+
+# Тест на разбор по частям: результат не зависит от размера частей
+@pytest.mark.parametrize("page", ["tricky", "empty", "synthetic", "cp1251", "no-charset", "broken"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_incremental_parity(page, chunk_size):
+    from parsers.html_walker import IncrementalParser, PageCollector, parse_with_target
+    content = parity_pages()[page]
+    parser = IncrementalParser(PageCollector())
+    for start in range(0, len(content), chunk_size):
+        parser.feed(content[start:start + chunk_size])
+    assert parser.close() == parse_with_target(content, PageCollector())
+
+# Тест на извлечение текста и ссылок до окончания загрузки
+def test_incremental_extracts_before_close():
+    from parsers.html_walker import IncrementalParser, PageCollector
+    collector = PageCollector()
+    parser = IncrementalParser(collector)
+    parser.feed(("<p>первый абзац</p><a href='/a'>ссылка</a>" * 100).encode("utf-8"))
+    parser.feed("<p>после".encode("utf-8"))
+    assert collector.texts[:2] == ["первый абзац", "ссылка"]
+    assert len(collector.links) >= 99
+    assert parser.encoding == "utf-8"
+
+# Тест на разбор страницы по мере загрузки в WebPageProcessor
+def test_incremental_processor(mock_html):
+    from parsers import parser_html
+    with requests_mock.Mocker() as m, patch.object(parser_html, "parse_with_target") as parse:
+        m.get("http://mock.url", text=mock_html)
+        processor = WebPageProcessor("http://mock.url", incremental=True)
+        expected = WebPageProcessor("http://mock.url", backend="html.parser")
+    assert parse.call_count == 0
+    assert {field: processor.extract([field])[field] for field in processor.FIELDS} == \
+        {field: expected.extract([field])[field] for field in expected.FIELDS}
+
+# Тест на ограничение размера страницы
+def test_max_page_bytes(capsys):
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.url", content=b"<p>" + b"x" * 5000 + b"</p>")
+        processor = WebPageProcessor("http://mock.url", max_page_bytes=1000)
+    assert processor.content is None
+    assert processor.full_text == ""
+    assert "слишком большая" in capsys.readouterr().out
+
+# Тест на разбор локального файла без HTTP
+@pytest.mark.parametrize("as_url", [False, True])
+def test_local_file(mock_html, tmp_path, as_url):
+    file = tmp_path / "page.html"
+    file.write_text(mock_html, encoding="utf-8")
+    with requests_mock.Mocker() as m:
+        m.get("http://mock.url", text=mock_html)
+        expected = WebPageProcessor("http://mock.url")
+        processor = WebPageProcessor(file.as_uri() if as_url else str(file))
+        assert m.call_count == 1
+    assert processor.local_path == str(file)
+    assert processor.extract() == expected.extract()
+
+# Тест на чтение большого локального файла
+def test_local_file_large(tmp_path):
+    file = tmp_path / "big.htm"
+    file.write_bytes("<p>Большой файл</p>".encode("utf-8") * 1000)
+    processor = WebPageProcessor(str(file))
+    assert processor.content == file.read_bytes()
+    assert processor.full_text.count("Большой файл") == 1000
+
+# Тест на чтение локального файла без создания HTTP-загрузчика
+def test_local_file_without_fetcher(tmp_path):
+    file = tmp_path / "page.html"
+    file.write_text("<p>Локальная страница</p>", encoding="utf-8")
+    with patch("parsers.parser_html.get_fetcher") as mock_fetcher:
+        processor = WebPageProcessor(str(file))
+    mock_fetcher.assert_not_called()
+    assert processor.fetcher is None
+    assert "Локальная страница" in processor.full_text
+
+def test_local_file_missing(tmp_path, capsys):
+    processor = WebPageProcessor(str(tmp_path / "missing.html"))
+    assert processor.content is None and not processor.is_cacheable()
+    assert "не найден" in capsys.readouterr().out
+
+# Тест на обработку локальной страницы через FileProcessor с кэшем результатов
+def test_file_processor_local_html(mock_html, tmp_path, capsys):
+    from main import FileProcessor
+    from parsers.cache import ResultCache
+    file = tmp_path / "page.html"
+    file.write_text(mock_html, encoding="utf-8")
+    cache = ResultCache(str(tmp_path / "cache"))
+    assert FileProcessor(str(file), cache=cache).process()
+    assert "Заголовок" in capsys.readouterr().out
+    assert FileProcessor(str(file), cache=cache).from_cache
+
+# Тест на повторную обработку локальной страницы с кэшем результатов в режиме JSONL
+def test_file_processor_local_html_cached_jsonl(mock_html, tmp_path, capsys):
+    import json
+    from main import FileProcessor
+    from parsers.cache import ResultCache
+    file = tmp_path / "page.html"
+    file.write_text(mock_html, encoding="utf-8")
+    cache = ResultCache(str(tmp_path / "cache"))
+    outputs = []
+    for _ in range(2):
+        processor = FileProcessor(str(file), cache=cache, output_format="jsonl")
+        assert processor.process()
+        outputs.append([json.loads(line) for line in capsys.readouterr().out.splitlines()])
+    assert processor.from_cache and processor.processor.is_cacheable()
+    assert outputs[1][0]["cached"] and outputs[1][0]["valid"]
+    assert outputs[1][1:] == outputs[0][1:]
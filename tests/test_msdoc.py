@@ -0,0 +1,108 @@
+import json
+import subprocess
+import sys
+import struct
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+from parsers.msdoc import DocFormatError, Paragraph, WordDocument, parse_sprms, read_word_document
+from parsers.parser_doc import DOCProcessor
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE = ROOT / "test_files" / "test_file.doc"
+
+
+@pytest.fixture
+def truncated_doc(tmp_path):
+    """Создает DOC-файл, обрезанный на середине."""
+    file = tmp_path / "truncated.doc"
+    data = SAMPLE.read_bytes()
+    file.write_bytes(data[:len(data) // 2])
+    return str(file)
+
+# Тест на чтение текста и свойств документа
+def test_read_word_document():
+    document = read_word_document(str(SAMPLE))
+    lines = [line for line in document.text.splitlines() if line]
+    assert lines[:3] == ["Отлично!", "Файл открылся.", "Ссылка на статью:"]
+    assert document.tables == []
+    assert document.metadata == {"author": "AlexFine", "created": datetime(2021, 2, 21, 15, 19)}
+
+# Тест на файлы, которые встроенный разборщик не читает
+def test_not_ole_file(tmp_path):
+    file = tmp_path / "invalid.doc"
+    file.write_bytes(b"This is not a valid DOC")
+    with pytest.raises(DocFormatError):
+        read_word_document(str(file))
+
+def test_truncated_file(truncated_doc):
+    with pytest.raises(DocFormatError):
+        read_word_document(truncated_doc)
+
+# Тест на сборку таблиц из ячеек и концов строк
+def test_collect_tables():
+    document = WordDocument.__new__(WordDocument)
+    document.paragraphs = [
+        Paragraph("До таблицы", "\r"),
+        Paragraph("A1", "\x07", in_table=True),
+        Paragraph("B1, строка 1", "\r", in_table=True),
+        Paragraph("B1, строка 2", "\x07", in_table=True),
+        Paragraph("", "\x07", in_table=True, row_end=True),
+        Paragraph("A2", "\x07", in_table=True),
+        Paragraph("B2", "\x07", in_table=True),
+        Paragraph("", "\x07", in_table=True, row_end=True),
+        Paragraph("После таблицы", "\r"),
+    ]
+    assert document._collect_tables() == [[["A1", "B1, строка 1\nB1, строка 2"], ["A2", "B2"]]]
+    assert "A1\nB1, строка 1" in document.text
+
+# Тест на разбор свойств абзаца переменной длины
+def test_parse_sprms():
+    grpprl = (struct.pack("<HB", 0x2416, 1) + struct.pack("<HH", 0xD608, 3) + b"\0\0"
+              + struct.pack("<HI", 0x6649, 1))
+    sprms = parse_sprms(grpprl)
+    assert sprms[0x2416] == b"\x01"
+    assert len(sprms[0xD608]) == 4
+    assert sprms[0x6649] == b"\x01\0\0\0"
+
+# Тест на чтение DOCProcessor без Aspose
+def test_processor_native_engine():
+    processor = DOCProcessor(str(SAMPLE))
+    assert processor.native is not None
+    assert processor.text_content.startswith("Отлично!\nФайл открылся.")
+    assert processor.metadata["author"] == "AlexFine"
+    assert processor.is_cacheable()
+    restored = DOCProcessor.from_cache_state(str(SAMPLE), processor.cache_state())
+    assert restored.is_cacheable() and restored.text_content == processor.text_content
+
+def test_processor_native_only_invalid(truncated_doc, capsys):
+    processor = DOCProcessor(truncated_doc, engine="native")
+    assert processor.doc is None
+    assert not processor.is_cacheable()
+    assert processor.text_content == "" and processor.tables == [] and processor.metadata == {}
+    assert "встроенным разборщиком" in capsys.readouterr().out
+
+# Тест на раздельный кэш результатов разных способов чтения
+def test_engine_in_cache_key(tmp_path):
+    from parsers.cache import ResultCache
+    cache = ResultCache(str(tmp_path / "cache"))
+    native = cache.key(str(SAMPLE), DOCProcessor, {"engine": "native"})
+    aspose = cache.key(str(SAMPLE), DOCProcessor, {"engine": "aspose"})
+    full = cache.key(str(SAMPLE), DOCProcessor, {"engine": "aspose", "load_profile": "full"})
+    assert len({native, aspose, full}) == 3
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        DOCProcessor(str(SAMPLE), engine="antiword")
+
+# Тест на то, что документы, прочитанные встроенным разборщиком, не загружают Aspose
+def test_doc_does_not_import_aspose():
+    snippet = (
+        "import json, sys, main;"
+        "main.FileProcessor('test_files/test_file.doc').process();"
+        "print(json.dumps('aspose.words' in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert "Отлично!" in result.stdout
+    assert json.loads(result.stdout.strip().splitlines()[-1]) is False
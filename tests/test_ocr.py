@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from parsers.ocr import map_pages, tesseract_thread_limit, tesseract_threads
+
+# Тест на сохранение порядка страниц при параллельной обработке
+def test_map_pages_keeps_order():
+    def work(number):
+        time.sleep(0.01 * (5 - number % 5))
+        return number * 10
+    assert list(map_pages(work, range(12), workers=4)) == [n * 10 for n in range(12)]
+
+# Тест на ограничение числа страниц в работе
+def test_map_pages_bounded_in_flight():
+    lock = threading.Lock()
+    state = {"current": 0, "peak": 0}
+
+    def work(number):
+        with lock:
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+        time.sleep(0.01)
+        with lock:
+            state["current"] -= 1
+        return number
+
+    assert list(map_pages(work, range(20), workers=8, max_in_flight=3)) == list(range(20))
+    assert state["peak"] <= 3
+
+# Тест на последовательный режим
+def test_map_pages_serial():
+    assert list(map_pages(str, [1, 2], workers=1)) == ["1", "2"]
+
+# Тест на OMP_THREAD_LIMIT на время работы пула
+def test_thread_limit_set_and_restored(monkeypatch):
+    monkeypatch.delenv("OMP_THREAD_LIMIT", raising=False)
+    with patch("parsers.ocr.os.cpu_count", return_value=32):
+        with tesseract_thread_limit(8):
+            assert os.environ["OMP_THREAD_LIMIT"] == "4"
+    assert "OMP_THREAD_LIMIT" not in os.environ
+
+def test_thread_limit_respects_user_value(monkeypatch):
+    monkeypatch.setenv("OMP_THREAD_LIMIT", "2")
+    with tesseract_thread_limit(8):
+        assert os.environ["OMP_THREAD_LIMIT"] == "2"
+    assert os.environ["OMP_THREAD_LIMIT"] == "2"
+
+def test_tesseract_threads_minimum():
+    with patch("parsers.ocr.os.cpu_count", return_value=4):
+        assert tesseract_threads(16) == 1
+
+# Тест на повторную страницу: Tesseract не запускается второй раз
+def test_ocr_cache_skips_repeated_page(tmp_path):
+    from PIL import Image
+    from parsers.ocr import OCRCache, ocr_image
+    cache = OCRCache(str(tmp_path / "ocr"))
+    page = Image.new("L", (40, 20), color=255)
+    with patch("pytesseract.image_to_string", return_value="text") as mock_ocr:
+        assert ocr_image(page, "eng", cache, 300) == "text"
+        assert ocr_image(page.copy(), "eng", cache, 300) == "text"
+        assert mock_ocr.call_count == 1
+        ocr_image(page, "rus", cache, 300)
+        ocr_image(page, "eng", cache, 150)
+        ocr_image(Image.new("L", (40, 20), color=0), "eng", cache, 300)
+        assert mock_ocr.call_count == 4
+
+# Тест на кэш OCR для страницы, переданной путем к файлу
+def test_ocr_cache_image_path(tmp_path):
+    from PIL import Image
+    from parsers.ocr import get_ocr_cache, ocr_image
+    path = tmp_path / "page.png"
+    Image.new("RGB", (10, 10), color="white").save(path)
+    cache = get_ocr_cache(str(tmp_path / "ocr"))
+    assert get_ocr_cache(str(tmp_path / "ocr")) is cache
+    with patch("pytesseract.image_to_string", return_value="text") as mock_ocr:
+        ocr_image(str(path), "eng", cache)
+        ocr_image(str(path), "eng", cache)
+    assert mock_ocr.call_count == 1
+    assert cache.stats()["hits"] == 1
+
+# Тест на ограничение размера кэша OCR
+def test_ocr_cache_bounded(tmp_path):
+    from PIL import Image
+    from parsers.ocr import OCRCache, ocr_image
+    cache = OCRCache(str(tmp_path / "ocr"), max_bytes=250)
+    with patch("pytesseract.image_to_string", return_value="x" * 100):
+        for color in range(5):
+            ocr_image(Image.new("L", (4, 4), color=color), "eng", cache)
+    assert cache.stats()["bytes"] <= 250
+    assert cache.stats()["evictions"] >= 3
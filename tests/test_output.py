@@ -0,0 +1,147 @@
+import datetime
+import io
+import json
+import shutil
+import pytest
+import pandas as pd
+from pathlib import Path
+
+from main import FileProcessor
+from parsers.base import BaseProcessor
+from parsers.output import RecordWriter, json_default
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class DummyProcessor(BaseProcessor):
+    FIELDS = {
+        "text": ("text_content", "_extract_text", str),
+        "links": ("links", "_extract_links", list),
+        "metadata": ("metadata", "_extract_metadata", dict),
+    }
+
+    def __init__(self, fields=None):
+        self.calls = []
+        self._init_fields(fields)
+
+    def _extract_text(self):
+        self.calls.append("text")
+        return "text"
+
+    def _extract_links(self):
+        self.calls.append("links")
+        return [{"text": "a", "url": "/a"}, {"text": "b", "url": "/b"}]
+
+    def _extract_metadata(self):
+        self.calls.append("metadata")
+        return {"created": datetime.datetime(2024, 1, 2, 3, 4, 5)}
+
+# Тест на сериализацию значений, которые json не поддерживает
+def test_json_default():
+    assert json_default(datetime.date(2024, 1, 2)) == "2024-01-02"
+    assert json_default({"b", "a"}) == ["a", "b"]
+    assert json_default(pd.Series([1]).iloc[0]) == 1
+
+# Тест на записи по элементам полей
+def test_iter_records():
+    processor = DummyProcessor(fields=())
+    records = list(processor.iter_records(["links", "metadata"]))
+    assert [record["type"] for record in records] == ["link", "link", "metadata"]
+    assert records[1] == {"type": "link", "index": 1, "text": "b", "url": "/b"}
+    assert processor.calls == ["links", "metadata"]
+
+# Тест на ленивое извлечение: поле извлекается только при выводе его записей
+def test_iter_records_lazy():
+    processor = DummyProcessor(fields=())
+    records = processor.iter_records()
+    assert next(records) == {"type": "text", "text": "text"}
+    assert processor.calls == ["text"]
+
+# Тест на формат JSONL: строка на запись, первая - описание документа
+def test_writer_jsonl():
+    stream = io.StringIO()
+    count = RecordWriter(stream, "jsonl").write_document(
+        {"source": "doc.pdf"}, DummyProcessor(fields=()).iter_records()
+    )
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert count == 4
+    assert lines[0] == {"type": "document", "source": "doc.pdf"}
+    assert all(line["source"] == "doc.pdf" for line in lines)
+    assert lines[-1]["metadata"]["created"] == "2024-01-02T03:04:05"
+
+# Тест на формат JSON: один корректный объект документа
+def test_writer_json():
+    stream = io.StringIO()
+    RecordWriter(stream, "json").write_document({"source": "doc.pdf"}, DummyProcessor(fields=()).iter_records())
+    document = json.loads(stream.getvalue())
+    assert document["source"] == "doc.pdf"
+    assert len(document["records"]) == 4
+
+def test_writer_json_empty():
+    stream = io.StringIO()
+    RecordWriter(stream, "json").write_document({"source": "doc.pdf"}, iter([]))
+    assert json.loads(stream.getvalue()) == {"source": "doc.pdf", "records": []}
+
+# Тест на потоковую запись: запись выводится до получения следующей
+def test_writer_streams_records():
+    stream = io.StringIO()
+
+    def records():
+        yield {"type": "page", "page": 1}
+        assert "page" in stream.getvalue()
+        yield {"type": "page", "page": 2}
+
+    RecordWriter(stream, "jsonl").write_document({"source": "doc.pdf"}, records())
+    assert len(stream.getvalue().splitlines()) == 3
+
+# Тест на формат JSON: при ошибке извлечения документ закрывается
+def test_writer_json_error_closes_document():
+    stream = io.StringIO()
+
+    def records():
+        yield {"type": "page", "page": 1}
+        raise RuntimeError("сбой страницы")
+
+    with pytest.raises(RuntimeError):
+        RecordWriter(stream, "json").write_document({"source": "doc.pdf"}, records())
+    assert json.loads(stream.getvalue())["records"] == [{"type": "page", "page": 1}]
+
+def test_writer_unknown_format():
+    with pytest.raises(ValueError):
+        RecordWriter(io.StringIO(), "xml")
+
+# Тест на таблицы PDF: колонки и строки, пропуски - null
+def test_pdf_table_record():
+    from parsers.parser_pdf import PDFProcessor
+    processor = PDFProcessor.__new__(PDFProcessor)
+    table = pd.DataFrame({"a": [1, None], "b": ["x", "y"]})
+    record = processor._item_record("tables", table)
+    assert record["columns"] == ["a", "b"]
+    assert json.loads(json.dumps(record, default=json_default))["rows"] == [[1.0, "x"], [None, "y"]]
+
+# Тест на вывод JSONL для документа
+def test_file_processor_jsonl(tmp_path, capsys):
+    file = tmp_path / "doc.docx"
+    shutil.copy(ROOT / "test_files" / "test_file.docx", file)
+    processor = FileProcessor(str(file), fields=["text", "tables"], output_format="jsonl")
+    assert processor.processor.extracted_fields == set()
+    assert processor.process()
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0]["type"] == "document" and lines[0]["valid"]
+    assert {line["type"] for line in lines[1:]} == {"text", "table"}
+
+# Тест на вывод JSON с ошибкой обработки: stdout - только JSON, сообщение - в stderr
+def test_file_processor_json_error_to_stderr(tmp_path, capsys):
+    file = tmp_path / "doc.docx"
+    shutil.copy(ROOT / "test_files" / "test_file.docx", file)
+    processor = FileProcessor(str(file), fields=["text"], output_format="json")
+
+    def records(fields=None):
+        yield {"type": "text", "text": "начало"}
+        raise RuntimeError("сбой извлечения")
+
+    processor.processor.iter_records = records
+    assert not processor.process()
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["records"] == [{"type": "text", "text": "начало"}]
+    assert "сбой извлечения" in captured.err
@@ -1,3 +1,4 @@
+import os
 import pytest
 from pathlib import Path
 from unittest.mock import patch
@@ -48,7 +49,7 @@ def test_extract_text_encrypted_pdf(tmp_pdf):
 
 
 # Тест на извлечение текста через OCR
-@patch("pytesseract.image_to_string", return_value="Extracted OCR text")
+@patch("parsers.ocr.pytesseract.image_to_string", return_value="Extracted OCR text")
 def test_extract_ocr_text_from_scanned_pdf(mock_tesseract, tmp_pdf):
     """Проверка, что OCR корректно извлекает текст."""
     processor = PDFProcessor(tmp_pdf)
@@ -96,3 +97,175 @@ def test_nonexistent_file():
     """Проверка, что несуществующий файл вызывает FileNotFoundError."""
     with pytest.raises(FileNotFoundError):
         PDFProcessor("nonexistent.pdf")
+
+# Тест на пропуск незапрошенных этапов (OCR и Tabula)
+@patch("parsers.tables.tabula.read_pdf")
+@patch("parsers.parser_pdf.convert_from_path")
+def test_text_only_skips_ocr_and_tables(mock_convert, mock_tabula, tmp_pdf):
+    processor = PDFProcessor(tmp_pdf, fields=["text"])
+    assert processor.extracted_fields == {"text"}
+    assert processor.ocr_text == ""
+    assert processor.tables == []
+    mock_convert.assert_not_called()
+    mock_tabula.assert_not_called()
+
+# Тест на однократное чтение PDF для валидации и извлечения текста
+def test_single_reader_pass():
+    import PyPDF2
+    path = str(Path(__file__).resolve().parent.parent / "test_files" / "test_file.pdf")
+    expected = "".join(page.extract_text() or "" for page in PyPDF2.PdfReader(path).pages).strip()
+    with patch("parsers.parser_pdf.PyPDF2.PdfReader", wraps=PyPDF2.PdfReader) as mock_reader:
+        processor = PDFProcessor(path, fields=["text"])
+    assert mock_reader.call_count == 1
+    assert processor.text_content == expected
+    assert len(processor.page_texts) == len(PyPDF2.PdfReader(path).pages)
+
+# Тест на ошибку извлечения текста одной страницы: остальные страницы сохраняются, результат не кэшируется
+def test_page_text_error():
+    import PyPDF2
+    path = str(Path(__file__).resolve().parent.parent / "test_files" / "test_file.pdf")
+    page_count = len(PyPDF2.PdfReader(path).pages)
+    original = PyPDF2.PageObject.extract_text
+    calls = []
+
+    def extract_text(page, *args, **kwargs):
+        calls.append(page)
+        if len(calls) == 1:
+            raise ValueError("битый поток страницы")
+        return original(page, *args, **kwargs)
+
+    with patch.object(PyPDF2.PageObject, "extract_text", extract_text):
+        processor = PDFProcessor(path, fields=["text"])
+    assert processor.is_valid
+    assert len(processor.page_texts) == page_count
+    assert processor.page_texts[0] == ""
+    assert processor.failed_pages == [1]
+    assert not processor.is_cacheable()
+
+# Тест на отсутствие извлечения текста, если текст и OCR не запрошены
+def test_tables_only_skips_text_extraction():
+    import PyPDF2
+    path = str(Path(__file__).resolve().parent.parent / "test_files" / "test_file.pdf")
+    with patch("parsers.tables.tabula.read_pdf", return_value=[]), \
+         patch.object(PyPDF2.PageObject, "extract_text") as mock_extract:
+        processor = PDFProcessor(path, fields=["tables"])
+    mock_extract.assert_not_called()
+    assert processor.page_texts is None
+    assert processor.page_count == len(PyPDF2.PdfReader(path).pages)
+
+# Тест на OCR только страниц без текстового слоя
+@patch("parsers.ocr.pytesseract.image_to_string", return_value="OCR page")
+@patch("parsers.parser_pdf.convert_from_path", return_value=["image"])
+def test_ocr_only_pages_without_text(mock_convert, mock_tesseract, tmp_pdf):
+    processor = PDFProcessor(tmp_pdf, fields=[])
+    processor.page_numbers = [1, 2, 3]
+    processor.page_texts = ["", "Нормальный текстовый слой страницы " * 3, "���" * 10]
+    processor.extract(["ocr"])
+    assert processor.ocr_pages == [1, 3]
+    assert processor.ocr_text == "OCR page\nOCR page"
+    assert [call.kwargs["first_page"] for call in mock_convert.call_args_list] == [1, 3]
+
+# Тест на проверку качества текстового слоя
+def test_page_needs_ocr(tmp_pdf):
+    processor = PDFProcessor(tmp_pdf, fields=[])
+    assert processor._page_needs_ocr("") is True
+    assert processor._page_needs_ocr("коротко") is True
+    assert processor._page_needs_ocr("Достаточно длинный осмысленный текст страницы") is False
+    assert processor._page_needs_ocr("текст\x00\x01\x02\x03\x04\x05\x06\x07\x08\x0e\x0f\x10\x11\x12\x13\x14\x15") is True
+
+def fake_page_paths(path, first_page, last_page, output_folder, **kwargs):
+    """Мок convert_from_path: пути растеризованных страниц окна"""
+    assert kwargs["paths_only"] is True
+    return [os.path.join(output_folder, str(number)) for number in range(first_page, last_page + 1)]
+
+def page_text(image, lang):
+    return f"page {os.path.basename(image)}"
+
+# Тест на параллельный постраничный OCR с сохранением порядка
+@patch("parsers.parser_pdf.convert_from_path", side_effect=fake_page_paths)
+def test_parallel_ocr_keeps_page_order(mock_convert, tmp_pdf):
+    processor = PDFProcessor(tmp_pdf, fields=[], ocr_workers=4, ocr_window=1)
+    processor.page_numbers = list(range(1, 9))
+    processor.page_texts = [""] * 8
+    with patch("parsers.ocr.pytesseract.image_to_string", side_effect=page_text):
+        processor.extract(["ocr"])
+    assert processor.ocr_text == "\n".join(f"page {n}" for n in range(1, 9))
+    assert processor.ocr_pages == list(range(1, 9))
+
+# Тест на распознавание страниц одного окна разными потоками
+@patch("parsers.parser_pdf.convert_from_path", side_effect=fake_page_paths)
+def test_ocr_pages_of_window_in_parallel(mock_convert, tmp_pdf):
+    import threading
+    import time
+    lock = threading.Lock()
+    state = {"current": 0, "peak": 0}
+
+    def slow_ocr(image, lang):
+        with lock:
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+        time.sleep(0.05)
+        with lock:
+            state["current"] -= 1
+        return page_text(image, lang)
+
+    processor = PDFProcessor(tmp_pdf, fields=[], ocr_workers=8, ocr_window=8)
+    processor.page_numbers = list(range(1, 17))
+    processor.page_texts = [""] * 16
+    with patch("parsers.ocr.pytesseract.image_to_string", side_effect=slow_ocr):
+        processor.extract(["ocr"])
+    assert processor.ocr_pages == list(range(1, 17))
+    assert mock_convert.call_count == 2
+    # Окно из 8 страниц распознается 8 потоками, а не одним (раньше - не больше 2 окон сразу)
+    assert state["peak"] >= 4
+
+# Тест на растеризацию окнами подряд идущих страниц
+def test_page_windows(tmp_pdf):
+    processor = PDFProcessor(tmp_pdf, fields=[], ocr_window=3)
+    assert list(processor._iter_page_windows([1, 2, 3, 4, 5, 7, 8, 10])) == [[1, 2, 3], [4, 5], [7, 8], [10]]
+
+# Тест на ограничение числа растеризованных страниц в работе
+def test_ocr_pages_in_flight_bounded(tmp_pdf):
+    import threading
+    lock = threading.Lock()
+    state = {"current": 0, "peak": 0}
+
+    def fake_convert(path, first_page, last_page, output_folder, **kwargs):
+        paths = fake_page_paths(path, first_page, last_page, output_folder, **kwargs)
+        with lock:
+            state["current"] += len(paths)
+            state["peak"] = max(state["peak"], state["current"])
+        return paths
+
+    def fake_ocr(image, lang):
+        with lock:
+            state["current"] -= 1
+        return page_text(image, lang)
+
+    processor = PDFProcessor(tmp_pdf, fields=[], ocr_workers=4, ocr_window=2, ocr_max_pages_in_flight=4)
+    processor.page_numbers = list(range(1, 51))
+    processor.page_texts = [""] * 50
+    with patch("parsers.parser_pdf.convert_from_path", side_effect=fake_convert), \
+         patch("parsers.ocr.pytesseract.image_to_string", side_effect=fake_ocr):
+        processor.extract(["ocr"])
+    assert processor.ocr_pages == list(range(1, 51))
+    assert processor.ocr_text.splitlines()[-1] == "page 50"
+    assert state["peak"] <= 4
+
+# Тест на обработку подмножества страниц всеми этапами
+def test_pages_subset(tmp_path):
+    file = tmp_path / "pages.pdf"
+    writer = PdfWriter()
+    for _ in range(10):
+        writer.add_blank_page(width=72, height=72)
+    with open(file, "wb") as f:
+        writer.write(f)
+    with patch("parsers.tables.tabula.read_pdf", return_value=[]) as mock_tabula, \
+         patch("parsers.parser_pdf.convert_from_path", return_value=[]) as mock_convert:
+        processor = PDFProcessor(str(file), pages="2-4,9", max_pages=3, ocr_window=10)
+    assert processor.page_count == 10
+    assert processor.page_numbers == [2, 3, 4]
+    assert len(processor.page_texts) == 3
+    assert mock_tabula.call_args.kwargs["pages"] == [2, 3, 4]
+    assert mock_convert.call_args.kwargs["first_page"] == 2
+    assert mock_convert.call_args.kwargs["last_page"] == 4
@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+
+from parsers import registry
+from main import FileProcessor
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Тест на выбор обработчика по расширению
+def test_get_entry_known_extension():
+    entry = registry.get_entry(".DOCX")
+    assert entry.load().__name__ == "DOCXProcessor"
+
+def test_get_entry_unknown_extension():
+    assert registry.get_entry(".xyz") is None
+
+# Тест на регистрацию нового формата
+def test_register_extension(monkeypatch):
+    monkeypatch.setitem(registry.REGISTRY, ".htm", registry.REGISTRY[".html"])
+    registry.register(".HTM", "parsers.parser_html", "WebPageProcessor")
+    assert ".htm" in registry.supported_extensions()
+    assert registry.get_entry(".htm").class_name == "WebPageProcessor"
+
+# Тест на исключения, объявленные модулем обработчика
+def test_entry_errors():
+    from PyPDF2.errors import PdfReadError
+    assert registry.get_entry(".pdf").errors("FORMAT_ERRORS") == (PdfReadError,)
+    assert registry.get_entry(".pdf").errors("NETWORK_ERRORS") == ()
+
+# Тест на неподдерживаемый формат
+def test_unsupported_format(tmp_path):
+    file = tmp_path / "file.xyz"
+    file.write_text("data")
+    with pytest.raises(SystemExit):
+        FileProcessor(str(file))
+
+# Тест на то, что DOCX не загружает Aspose и pandas
+def test_docx_does_not_import_heavy_backends():
+    snippet = (
+        "import json, sys, main;"
+        "main.FileProcessor('test_files/test_file.docx');"
+        "print(json.dumps([m for m in ('aspose.words', 'pandas', 'tabula', 'bs4') if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+# Тест на передачу обработчику только поддерживаемых параметров
+def test_processor_options_filtered(tmp_path):
+    import shutil
+    file = tmp_path / "doc.docx"
+    shutil.copy(ROOT / "test_files" / "test_file.docx", file)
+    processor = FileProcessor(str(file), fields=["text"], options={"ocr_workers": 4, "unknown": 1})
+    assert processor.processor.extracted_fields == {"text"}
+    from parsers.parser_pdf import PDFProcessor
+    assert processor._processor_options(PDFProcessor) == {"ocr_workers": 4}
@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from parsers import tables
+from parsers.tables import TableExtractor, get_table_extractor
+
+# Тест на общий для процесса извлекатель
+def test_shared_extractor():
+    assert get_table_extractor() is get_table_extractor()
+
+# Тест на переиспользование JVM процесса
+@patch("parsers.tables.tabula.read_pdf", return_value=[pd.DataFrame({"a": [1]}), pd.DataFrame()])
+def test_read_persistent(mock_read):
+    extractor = TableExtractor(persistent=True)
+    result = extractor.read("a.pdf")
+    assert len(result) == 1
+    assert mock_read.call_args.kwargs["force_subprocess"] is False
+    assert extractor.documents == 1